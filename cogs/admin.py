@@ -1,9 +1,12 @@
 # cogs/admin.py
-import os, aiosqlite, json, time, math
+import os, math
 import discord
 from discord import app_commands
 
-DB_PATH = "economy.db"
+from core import animation, answer_cache, enhance_odds, guild_settings, market_catalog, names, ratelimit, tarot_engine
+from core.balance import credit, set_balance
+from core.db import read, write
+from core.ledger import write_ledger
 
 # ───────── 권한 유틸 ─────────
 def owner_only():
@@ -14,10 +17,12 @@ def owner_only():
     return app_commands.check(predicate)
 
 # ───────── 설정/DB 유틸 ─────────
-async def get_settings(db, gid: int):
+async def get_settings(db, gid: int, create: bool = True):
+    """create=False: 조회 전용(reader) — 행이 없어도 만들지 않고 기본값 반환"""
     cur = await db.execute(
         "SELECT min_bet, win_min_bps, win_max_bps, mode_name, "
-        "COALESCE(enh_cost_mult,1.0), COALESCE(force_mode,'off'), COALESCE(force_target_user_id,0) "
+        "COALESCE(enh_cost_mult,1.0), COALESCE(force_mode,'off'), COALESCE(force_target_user_id,0), "
+        "COALESCE(anim_mode,'full'), COALESCE(tarot_mode,'ai'), COALESCE(rate_limits,'') "
         "FROM guild_settings WHERE guild_id=?",
         (gid,)
     )
@@ -25,13 +30,15 @@ async def get_settings(db, gid: int):
     if row:
         return {
             "min_bet": row[0], "win_min_bps": row[1], "win_max_bps": row[2], "mode_name": row[3],
-            "enh_cost_mult": float(row[4]), "force_mode": row[5], "force_uid": int(row[6] or 0)
+            "enh_cost_mult": float(row[4]), "force_mode": row[5], "force_uid": int(row[6] or 0),
+            "anim_mode": row[7], "tarot_mode": row[8], "rate_limits": row[9]
         }
-    await db.execute("INSERT OR IGNORE INTO guild_settings(guild_id) VALUES(?)", (gid,))
-    await db.commit()
+    if create:
+        await db.execute("INSERT OR IGNORE INTO guild_settings(guild_id) VALUES(?)", (gid,))
+        await db.commit()
     return {
         "min_bet": 1000, "win_min_bps": 3000, "win_max_bps": 6000, "mode_name": "일반 모드",
-        "enh_cost_mult": 1.0, "force_mode":"off", "force_uid":0
+        "enh_cost_mult": 1.0, "force_mode":"off", "force_uid":0, "anim_mode": "full", "tarot_mode": "ai", "rate_limits": ""
     }
 
 async def set_setting_field(db, gid: int, key: str, value: str):
@@ -48,9 +55,22 @@ async def set_setting_field(db, gid: int, key: str, value: str):
     elif key == "enh_cost_mult":
         mult = float(value)
         await db.execute("UPDATE guild_settings SET enh_cost_mult=? WHERE guild_id=?", (mult, gid))
+    elif key == "anim_mode":
+        if value not in animation.MODES:
+            raise ValueError("anim_mode must be full/single/instant")
+        await db.execute("UPDATE guild_settings SET anim_mode=? WHERE guild_id=?", (value, gid))
+    elif key == "tarot_mode":
+        if value not in tarot_engine.MODES:
+            raise ValueError("tarot_mode must be ai/fast")
+        await db.execute("UPDATE guild_settings SET tarot_mode=? WHERE guild_id=?", (value, gid))
+    elif key == "rate_limits":
+        value = "" if value.strip() in ("", "-", "기본") else value.strip()
+        ratelimit.parse(value)   # 형식 검증(ValueError)
+        await db.execute("UPDATE guild_settings SET rate_limits=? WHERE guild_id=?", (value, gid))
     else:
         raise ValueError("unknown key")
     await db.commit()
+    guild_settings.invalidate(gid)
 
 async def set_force_settings(db, gid: int, mode: str, target_uid: int):
     if mode not in ("off","success","fail"):
@@ -58,32 +78,32 @@ async def set_force_settings(db, gid: int, mode: str, target_uid: int):
     await db.execute("INSERT OR IGNORE INTO guild_settings(guild_id) VALUES(?)", (gid,))
     await db.execute("UPDATE guild_settings SET force_mode=?, force_target_user_id=? WHERE guild_id=?", (mode, target_uid, gid))
     await db.commit()
+    guild_settings.invalidate(gid)
 
 async def apply_balance_change(gid: int, uid: int, op: str, amount: int, actor: int, reason: str | None):
-    async with aiosqlite.connect(DB_PATH) as db:
+    meta = {"by": actor, "reason": reason or ""}
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-        row = await cur.fetchone()
-        if row is None:
-            await db.execute("INSERT INTO users(guild_id,user_id,balance) VALUES(?,?,?)", (gid, uid, 0))
-            old_bal = 0
-        else:
-            old_bal = row[0]
-
         if op == "set":
-            new_bal = amount; delta = new_bal - old_bal; kind = "admin_set"
+            old_bal, new_bal = await set_balance(db, gid, uid, amount, "admin_set", meta)
         elif op == "add":
-            new_bal = old_bal + amount; delta = amount; kind = "admin_add"
+            new_bal = await credit(db, gid, uid, amount, "admin_add", meta); old_bal = new_bal - amount
         else:
-            new_bal = old_bal - amount; delta = -amount; kind = "admin_sub"
-
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await db.execute(
-            "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-            (gid, uid, kind, delta, new_bal, json.dumps({"by": actor, "reason": reason or ""}), int(time.time()))
-        )
+            new_bal = await credit(db, gid, uid, -amount, "admin_sub", meta); old_bal = new_bal + amount
         await db.commit()
-    return old_bal, new_bal, delta
+    return old_bal, new_bal, new_bal - old_bal
+
+ANIM_MODE_LABELS = {"full": "전체 애니메이션", "single": "단일 프레임", "instant": "즉시 결과"}
+TAROT_MODE_LABELS = {"ai": "Gemini(실패 시 빠른 해석)", "fast": "빠른 해석(오프라인)"}
+RATE_CLASS_LABELS = {"gamble": "도박", "enhance": "강화", "llm": "AI", "default": "기타"}
+
+def rate_limits_text(spec: str) -> str:
+    lines = []
+    for cls, label in RATE_CLASS_LABELS.items():
+        lim = ratelimit.limits_for(spec, cls)
+        (uc, up), (gc, gp) = lim["user"], lim["guild"]
+        lines.append(f"{label}: 1인 {uc}회/{up:g}초 · 서버 {gc}회/{gp:g}초")
+    return "\n".join(lines)
 
 def settings_embed(s: dict) -> discord.Embed:
     em = discord.Embed(title="도박 메뉴 — 현재 설정", color=0x3498db)
@@ -94,6 +114,9 @@ def settings_embed(s: dict) -> discord.Embed:
     em.add_field(name="강화 비용 배율", value=f"{s['enh_cost_mult']:.2f}x", inline=True)
     ftxt = "해제" if s["force_mode"]=="off" else (f"{'항상 성공' if s['force_mode']=='success' else '항상 실패'} · 대상: " + (("전체" if s['force_uid']==0 else f"<@{s['force_uid']}>")))
     em.add_field(name="결과 강제", value=ftxt, inline=True)
+    em.add_field(name="결과 연출", value=ANIM_MODE_LABELS.get(s["anim_mode"], s["anim_mode"]), inline=True)
+    em.add_field(name="타로 해석", value=TAROT_MODE_LABELS.get(s["tarot_mode"], s["tarot_mode"]), inline=True)
+    em.add_field(name="명령 한도", value=rate_limits_text(s["rate_limits"]), inline=False)
     return em
 
 # 쿨타임 초기화
@@ -101,7 +124,7 @@ async def reset_cooldown(gid: int, actor_id: int, which: str, target_uid: int |
     which = which.lower().strip()
     if which not in ("money", "attend", "both"):
         raise ValueError("which must be money/attend/both")
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
         if which in ("money", "both"):
             if target_uid is None:
@@ -115,10 +138,7 @@ async def reset_cooldown(gid: int, actor_id: int, which: str, target_uid: int |
                 await db.execute("UPDATE users SET last_daily_at=NULL WHERE guild_id=? AND user_id=?", (gid, target_uid))
         meta = {"by": actor_id, "which": which, "scope": ("all" if target_uid is None else "user"), "reason": reason or ""}
         log_uid = (target_uid if target_uid is not None else 0)
-        await db.execute(
-            "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-            (gid, log_uid, "admin_reset_cd", 0, 0, json.dumps(meta), int(time.time()))
-        )
+        await write_ledger(db, gid, log_uid, "admin_reset_cd", 0, 0, meta)
         await db.commit()
 
 # ───────── 도움말 임베드 ─────────
@@ -136,39 +156,12 @@ def admin_help_embed() -> discord.Embed:
 
 # ───────── 닉네임 안전화 ─────────
 async def safe_name(guild: discord.Guild, user_id: int) -> str:
-    m = guild.get_member(user_id)
-    if m:
-        return m.display_name
-    try:
-        m = await guild.fetch_member(user_id)
-        return m.display_name
-    except Exception:
-        return f"<@{user_id}>"
+    return await names.resolve(guild, None, user_id, default="<@{uid}>")
 
 # ---- 마켓 시드/보증 ----
-SEED_STOCKS = [
-    ("성현전자", -20.0,  20.0),
-    ("배달의 승기", -30.0, 30.0),
-    ("대이식스",  -10.0,  10.0),
-    ("재구식품",   -5.0,   5.0),
-]
-SEED_COINS = [
-    ("건영코인",  -60.0, 120.0),
-    ("면진코인", -120.0, 240.0),
-    ("승철코인", -200.0, 400.0),
-]
-
 async def ensure_seed_markets_admin(gid: int):
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT COUNT(*) FROM market_items WHERE guild_id=?", (gid,))
-        cnt = (await cur.fetchone())[0]
-        if cnt == 0:
-            await db.executemany(
-                "INSERT INTO market_items(guild_id,type,name,range_lo,range_hi,enabled) VALUES(?,?,?,?,?,1)",
-                [(gid,"stock",n,lo,hi) for (n,lo,hi) in SEED_STOCKS] +
-                [(gid,"coin", n,lo,hi) for (n,lo,hi) in SEED_COINS]
-            )
-            await db.commit()
+    # 기본 종목(SEED_*)은 core.market_catalog 에서 관리(거래 명령과 공용)
+    await market_catalog.ensure_seed(gid)
 
 # ───────── 모달 ─────────
 class ConfigValueModal(discord.ui.Modal, title="설정 값 입력"):
@@ -178,10 +171,13 @@ class ConfigValueModal(discord.ui.Modal, title="설정 값 입력"):
         self.key = key; self.key_label = key_label; self.gid = gid
         self.title = f"{self.key_label} 변경"
     async def on_submit(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await set_setting_field(db, self.gid, self.key, str(self.value))
             s = await get_settings(db, self.gid)
         em = settings_embed(s); em.title = f"{self.key_label} 변경 완료"
+        if self.key == "enh_cost_mult":
+            # 새 배율로 기대 비용 재계산(캐시) 후 강화 설정 화면으로
+            em = enhance_main_embed(s["enh_cost_mult"]); em.title = f"{self.key_label} 변경 완료"
         await interaction.response.send_message(embed=em, ephemeral=True)
 
 class BalanceAmountModal(discord.ui.Modal, title="잔액 입력"):
@@ -231,8 +227,8 @@ class SettingsView(discord.ui.View):
     @discord.ui.button(label="설정 보기", style=discord.ButtonStyle.primary, row=1)
     async def view_settings(self, interaction: discord.Interaction, _: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            s = await get_settings(db, self.gid)
+        async with read() as db:
+            s = await get_settings(db, self.gid, create=False)
         await interaction.edit_original_response(embed=settings_embed(s), view=self, content=None)
     @discord.ui.button(label="최소베팅 수정", style=discord.ButtonStyle.secondary, row=1)
     async def edit_min_bet(self, interaction, _):
@@ -246,6 +242,31 @@ class SettingsView(discord.ui.View):
     @discord.ui.button(label="모드명 수정", style=discord.ButtonStyle.secondary, row=1)
     async def edit_mode_name(self, interaction, _):
         await interaction.response.send_modal(ConfigValueModal("mode_name", "모드명", self.gid))
+    @discord.ui.button(label="결과 연출 변경", style=discord.ButtonStyle.secondary, row=2)
+    async def cycle_anim_mode(self, interaction: discord.Interaction, _: discord.ui.Button):
+        # full → single → instant → full
+        await interaction.response.defer(ephemeral=True)
+        async with write() as db:
+            s = await get_settings(db, self.gid)
+            nxt = animation.MODES[(animation.MODES.index(s["anim_mode"]) + 1) % len(animation.MODES)] if s["anim_mode"] in animation.MODES else "full"
+            await set_setting_field(db, self.gid, "anim_mode", nxt)
+            s = await get_settings(db, self.gid)
+        await interaction.edit_original_response(embed=settings_embed(s), view=self, content=None)
+    @discord.ui.button(label="타로 해석 변경", style=discord.ButtonStyle.secondary, row=2)
+    async def cycle_tarot_mode(self, interaction: discord.Interaction, _: discord.ui.Button):
+        # ai → fast → ai
+        await interaction.response.defer(ephemeral=True)
+        async with write() as db:
+            s = await get_settings(db, self.gid)
+            modes = tarot_engine.MODES
+            nxt = modes[(modes.index(s["tarot_mode"]) + 1) % len(modes)] if s["tarot_mode"] in modes else "ai"
+            await set_setting_field(db, self.gid, "tarot_mode", nxt)
+            s = await get_settings(db, self.gid)
+        await interaction.edit_original_response(embed=settings_embed(s), view=self, content=None)
+    @discord.ui.button(label="명령 한도 수정", style=discord.ButtonStyle.secondary, row=2)
+    async def edit_rate_limits(self, interaction, _):
+        # 예) gamble=3/10, llm=2/30, gamble.guild=40/10  (비우거나 "기본" → 기본값)
+        await interaction.response.send_modal(ConfigValueModal("rate_limits", "명령 한도", self.gid))
     @discord.ui.button(label="← 메인으로", style=discord.ButtonStyle.danger, row=4)
     async def back(self, interaction, _):
         await interaction.response.defer(ephemeral=True)
@@ -350,17 +371,18 @@ class UndoView(discord.ui.View):
     @discord.ui.button(label="실행 취소", style=discord.ButtonStyle.secondary)
     async def do_undo(self, interaction: discord.Interaction, _):
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with write() as db:
                 await db.execute("BEGIN IMMEDIATE")
                 for sql, args in reversed(self.sql_ops):
                     await db.execute(sql, args)
                 await db.commit()
+            market_catalog.invalidate()
             await interaction.response.edit_message(content=f"↩️ Undo 완료: {self.title}", view=None)
         except Exception as e:
             await interaction.response.edit_message(content=f"Undo 중 오류: {type(e).__name__}: {e}", view=None)
 
 async def count_items(gid: int, typ: str, keyword: str) -> int:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with read() as db:
         like = f"%{keyword.strip()}%" if keyword else "%"
         cur = await db.execute(
             "SELECT COUNT(*) FROM market_items WHERE guild_id=? AND type=? AND name LIKE ?",
@@ -369,7 +391,7 @@ async def count_items(gid: int, typ: str, keyword: str) -> int:
         return (await cur.fetchone())[0]
 
 async def list_items(gid: int, typ: str, keyword: str, page: int, limit: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with read() as db:
         like = f"%{keyword.strip()}%" if keyword else "%"
         offset = page * limit
         cur = await db.execute(
@@ -412,7 +434,7 @@ class EditConfirmView(discord.ui.View):
     @discord.ui.button(label="저장", style=discord.ButtonStyle.success, row=0)
     async def save(self, interaction: discord.Interaction, _):
         sql_ops: list[tuple[str, tuple]] = []
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
             cur = await db.execute(
                 "SELECT name,range_lo,range_hi,enabled FROM market_items "
@@ -441,6 +463,7 @@ class EditConfirmView(discord.ui.View):
                     (self.gid, self.typ, self.name, self.lo, self.hi, self.en)
                 )
             await db.commit()
+        market_catalog.invalidate(self.gid)
 
         em = discord.Embed(title="마켓 저장 완료", color=0x2ecc71)
         em.add_field(name="종류", value=self.typ)
@@ -515,7 +538,7 @@ class PresetQuickView(discord.ui.View):
         self.mv = mv; self.names = names
     async def _apply(self, interaction: discord.Interaction, kind: str):
         sql_ops: list[tuple[str, tuple]] = []; count = 0
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
             for name in self.names:
                 cur = await db.execute(
@@ -535,6 +558,7 @@ class PresetQuickView(discord.ui.View):
                 )
                 count += 1
             await db.commit()
+        market_catalog.invalidate(self.mv.gid)
         await interaction.response.edit_message(content=f"프리셋 적용({kind}) 완료: {count}개", view=UndoView(sql_ops, f"{self.mv.tab} 프리셋"))
     @discord.ui.button(label="폭 +10%", style=discord.ButtonStyle.secondary, row=0)
     async def widen(self, i, _): await self._apply(i, "widen10")
@@ -626,7 +650,7 @@ class MarketViewV2(discord.ui.View):
         sel = await self._require_selection(interaction, single=True); 
         if not sel: return
         name = sel[0]
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with read() as db:
             cur = await db.execute("SELECT range_lo,range_hi,enabled FROM market_items WHERE guild_id=? AND type=? AND name=?",
                                    (self.gid, self.tab, name))
             row = await cur.fetchone()
@@ -638,7 +662,7 @@ class MarketViewV2(discord.ui.View):
         sel = await self._require_selection(interaction); 
         if not sel: return
         sql_ops: list[tuple[str, tuple]] = []; changed = 0
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
             for name in sel:
                 cur = await db.execute("SELECT enabled FROM market_items WHERE guild_id=? AND type=? AND name=?",
@@ -652,6 +676,7 @@ class MarketViewV2(discord.ui.View):
                                  (new_en, self.gid, self.tab, name))
                 changed += 1
             await db.commit()
+        market_catalog.invalidate(self.gid)
         await interaction.response.edit_message(content=f"활성 토글 완료: {changed}개", view=UndoView(sql_ops, "활성 토글"))
 
     @discord.ui.button(label="삭제(일괄)", style=discord.ButtonStyle.danger, row=2)
@@ -659,7 +684,7 @@ class MarketViewV2(discord.ui.View):
         sel = await self._require_selection(interaction); 
         if not sel: return
         sql_ops: list[tuple[str, tuple]] = []; deleted = 0
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
             for name in sel:
                 cur = await db.execute("SELECT name,range_lo,range_hi,enabled FROM market_items WHERE guild_id=? AND type=? AND name=?",
@@ -672,6 +697,7 @@ class MarketViewV2(discord.ui.View):
                                  (self.gid, self.tab, name))
                 deleted += 1
             await db.commit()
+        market_catalog.invalidate(self.gid)
         await interaction.response.edit_message(content=f"삭제 완료: {deleted}개", view=UndoView(sql_ops, "삭제"))
 
     @discord.ui.button(label="복제", style=discord.ButtonStyle.success, row=2)
@@ -679,7 +705,7 @@ class MarketViewV2(discord.ui.View):
         sel = await self._require_selection(interaction, single=True); 
         if not sel: return
         name = sel[0]
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             cur = await db.execute("SELECT range_lo,range_hi,enabled FROM market_items WHERE guild_id=? AND type=? AND name=?",
                                    (self.gid, self.tab, name))
             row = await cur.fetchone()
@@ -697,6 +723,7 @@ class MarketViewV2(discord.ui.View):
                 (self.gid, self.tab, new_name, row[0], row[1], row[2])
             )
             await db.commit()
+        market_catalog.invalidate(self.gid)
         undo = UndoView([("DELETE FROM market_items WHERE guild_id=? AND type=? AND name=?",
                           (self.gid, self.tab, new_name))], "복제")
         await interaction.response.edit_message(content=f"복제 완료 → **{new_name}**", view=undo)
@@ -739,7 +766,7 @@ class ForceView(discord.ui.View):
         self.add_item(TargetUserSelect())
     async def _set(self, interaction: discord.Interaction, mode: str):
         target = self.target_user_id or 0
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await set_force_settings(db, self.gid, mode, target)
             s = await get_settings(db, self.gid)
         txt = "해제" if mode=="off" else ("항상 성공" if mode=="success" else "항상 실패")
@@ -770,8 +797,23 @@ def balance_main_embed() -> discord.Embed:
 def cooldown_main_embed() -> discord.Embed:
     return discord.Embed(title="쿨타임 관리", description="대상 선택 후 돈줘/출첵 쿨타임을 초기화하세요.", color=0x9b59b6)
 
-def enhance_main_embed() -> discord.Embed:
-    return discord.Embed(title="강화 설정", description="강화 비용 배율 등을 변경할 수 있습니다.", color=0xe67e22)
+def enhance_main_embed(mult: float = 1.0) -> discord.Embed:
+    em = discord.Embed(title="강화 설정", description="강화 비용 배율 등을 변경할 수 있습니다.", color=0xe67e22)
+    em.add_field(name="강화 비용 배율", value=f"{mult:.2f}x", inline=False)
+    a = enhance_odds.analyze(mult)
+    if a is None:
+        return em
+    # 레벨별 기대값(하락/파괴 복구 포함): 직전 레벨에서 1단계 / 맨손에서 누적
+    ap = enhance_odds.approx
+    lines = ["LV  1단계 시도   1단계 비용   0→LV 비용"]
+    for lv in range(1, enhance_odds.MAX_LV + 1):
+        step, total = a.reach(lv - 1, lv), a.reach(0, lv)
+        tries = f"{step.attempts:,.1f}" if step.attempts < 1e4 else ap(step.attempts)
+        lines.append(f"{lv:>2}  {tries:>9}  {ap(step.cost):>10}  {ap(total.cost):>10}")
+    # 필드 값 1024자 제한 → 표는 본문(4096자)에
+    em.description += "\n**기대값(흡수 마르코프 체인)**\n```\n" + "\n".join(lines) + "\n```"
+    em.set_footer(text="1단계 = 직전 레벨에서 해당 레벨 도달까지, 비용은 배율 적용(₩)")
+    return em
 
 def force_main_embed(s: dict) -> discord.Embed:
     mode = s.get("force_mode", "off"); tgt = s.get("force_uid", 0)
@@ -780,6 +822,18 @@ def force_main_embed(s: dict) -> discord.Embed:
     em.add_field(name="현재 설정", value=f"mode={mode}, 대상={who}", inline=False)
     return em
 
+def answer_cache_embed():
+    st = answer_cache.stats()
+    em = discord.Embed(title="지니 응답 캐시", color=0x1abc9c)
+    em.add_field(name="적중률", value=f"{st['hit_rate'] * 100:.1f}% ({st['total'] - st['miss']}/{st['total']})", inline=False)
+    em.add_field(name="메모리", value=str(st["memory"]), inline=True)
+    em.add_field(name="DB", value=str(st["db"]), inline=True)
+    em.add_field(name="동시 요청 공유", value=str(st["shared"]), inline=True)
+    em.add_field(name="미스(LLM 호출)", value=str(st["miss"]), inline=True)
+    em.add_field(name="메모리 항목", value=f"{st['size']}/{answer_cache.CACHE_MAX}", inline=True)
+    em.set_footer(text=f"TTL {answer_cache.TTL // 3600}시간 · 봇 재시작 시 카운터 초기화")
+    return em
+
 
 class AdminMainView(discord.ui.View):
     def __init__(self, gid: int):
@@ -788,14 +842,12 @@ class AdminMainView(discord.ui.View):
     @discord.ui.button(label="도박 메뉴", style=discord.ButtonStyle.primary, row=0)
     async def to_settings(self, interaction, _):
         await interaction.response.defer(ephemeral=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            s = await get_settings(db, self.gid)
+        async with read() as db:
+            s = await get_settings(db, self.gid, create=False)
         await interaction.edit_original_response(embed=settings_embed(s), view=SettingsView(self.gid), content=None)
     @discord.ui.button(label="잔액", style=discord.ButtonStyle.secondary, row=0)
     async def to_balance(self, interaction, _):
         await interaction.response.defer(ephemeral=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            s = await get_settings(db, self.gid)
         await interaction.edit_original_response(embed=balance_main_embed(), view=BalanceView(self.gid), content=None)
     @discord.ui.button(label="쿨타임", style=discord.ButtonStyle.secondary, row=0)
     async def to_cooldown(self, interaction, _):
@@ -816,15 +868,19 @@ class AdminMainView(discord.ui.View):
     @discord.ui.button(label="강화 설정", style=discord.ButtonStyle.primary, row=1)
     async def to_enh(self, interaction, _):
         await interaction.response.defer(ephemeral=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            s = await get_settings(db, self.gid)
-        await interaction.edit_original_response(embed=enhance_main_embed(), view=EnhanceSettingsView(self.gid), content=None)
+        async with read() as db:
+            s = await get_settings(db, self.gid, create=False)
+        await interaction.edit_original_response(embed=enhance_main_embed(s["enh_cost_mult"]), view=EnhanceSettingsView(self.gid), content=None)
     @discord.ui.button(label="결과 강제", style=discord.ButtonStyle.danger, row=1)
     async def to_force(self, interaction, _):
         await interaction.response.defer(ephemeral=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            s = await get_settings(db, self.gid)
+        async with read() as db:
+            s = await get_settings(db, self.gid, create=False)
         await interaction.edit_original_response(embed=force_main_embed(s), view=ForceView(self.gid), content=None)
+    @discord.ui.button(label="지니 캐시", style=discord.ButtonStyle.secondary, row=1)
+    async def to_answer_cache(self, interaction, _):
+        await interaction.response.defer(ephemeral=True)
+        await interaction.edit_original_response(embed=answer_cache_embed(), view=self, content=None)
 
 # ───────── 슬래시 명령 ─────────
 @app_commands.command(name="mz_admin", description="Open admin menu (owner only)")
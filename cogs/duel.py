@@ -1,10 +1,15 @@
-import aiosqlite, asyncio, secrets, time, math
+import asyncio, secrets, time, math
+import random
 import discord
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 
-DB_PATH = "economy.db"
+from core.balance import credit, get_balance
+from core import animation, duel_stats, guild_settings, names
+from core.db import snapshot, write
+from core.ledger import write_ledger
+from core.escrow import place_hold, settle_hold, refund_hold
 
 # ===== 시간/표시 유틸 =====
 KST = timezone(timedelta(hours=9))
@@ -12,38 +17,14 @@ def now_kst() -> datetime: return datetime.now(KST)
 def won(n: int) -> str: return f"{n:,}₩"
 
 # ===== 공용 DB 유틸 =====
-async def get_user(db, gid: int, uid: int):
-    cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-    row = await cur.fetchone()
-    if row:
-        return {"balance": row[0]}
-    await db.execute("INSERT INTO users(guild_id,user_id,balance) VALUES(?,?,?)", (gid, uid, 0))
-    await db.commit()
-    return {"balance": 0}
-
-async def write_ledger(db, gid, uid, kind, amount, bal_after, meta=None):
-    await db.execute(
-        "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-        (gid, uid, kind, amount, bal_after, (meta and str(meta)) or "{}", int(time.time()))
-    )
-
-async def ensure_weapon_row(db, gid: int, uid: int):
-    await db.execute(
-        "INSERT OR IGNORE INTO user_weapons(guild_id,user_id,level,updated_at) VALUES(?,?,0,?)",
-        (gid, uid, int(time.time()))
-    )
-
 async def get_level(db, gid: int, uid: int) -> int:
-    await ensure_weapon_row(db, gid, uid)
+    """조회 전용(행이 없으면 0) — reader/snapshot 에서도 사용"""
     cur = await db.execute("SELECT level FROM user_weapons WHERE guild_id=? AND user_id=?", (gid, uid))
     row = await cur.fetchone()
     return row[0] if row else 0
 
 async def get_min_bet(gid: int) -> int:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT min_bet FROM guild_settings WHERE guild_id=?", (gid,))
-        row = await cur.fetchone()
-        return row[0] if row and row[0] else 1000
+    return (await guild_settings.get(gid)).min_bet or 1000
 
 # ===== 승률 모델(로지스틱) =====
 def duel_win_prob(att_lv: int, def_lv: int) -> float:
@@ -68,16 +49,7 @@ async def resolve_userish(guild: discord.Guild, bot: discord.Client, uid: int):
     m = guild.get_member(uid)
     if m:
         return m
-    try:
-        u = await bot.fetch_user(uid)
-        dn = getattr(u, "global_name", None) or u.name or f"유저 {uid}"
-        return _UserStub(uid, dn)
-    except Exception:
-        return _UserStub(uid, f"유저 {uid}")
-
-def member_label_cached(guild: discord.Guild, uid: int) -> str:
-    m = guild.get_member(uid)
-    return m.display_name if m else f"유저 {uid}"
+    return _UserStub(uid, await names.resolve(guild, bot, uid))
 
 # ===== 임베드/프로그레스 =====
 def progress_bar(p: float, width: int = 12) -> str:
@@ -158,82 +130,92 @@ class DuelChallengeView(AutoCancelView):
         uid_b = self.opponent_id
         stake = self.stake
 
-        new_bal_w = new_bal_l = 0
-
-        async with aiosqlite.connect(DB_PATH) as db:
+        # 1) 예약: 양측 베팅액을 한 트랜잭션에서 hold로 이동
+        holds = None
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
-            ua = await get_user(db, gid, uid_a)
-            ub = await get_user(db, gid, uid_b)
-            bal_a, bal_b = ua["balance"], ub["balance"]
-            if bal_a < stake or bal_b < stake:
+            held_a = await place_hold(db, gid, uid_a, stake, "duel")
+            held_b = await place_hold(db, gid, uid_b, stake, "duel") if held_a else None
+            if held_a is None or held_b is None:
                 await db.execute("ROLLBACK")
-                for c in self.children: c.disabled = True
-                em = discord.Embed(title="맞짱 취소", description="한쪽 잔액이 부족해 대결이 취소되었습니다.", color=0xE67E22)
-                if self.message: await self.message.edit(embed=em, view=None)
-                else: await interaction.edit_original_response(embed=em, view=None)
-                self.finalized = True; self.stop(); return
-
-            lv_a = await get_level(db, gid, uid_a)
-            lv_b = await get_level(db, gid, uid_b)
-            p_a = duel_win_prob(lv_a, lv_b)
-
-            # 5%: 면진파파 난입 → 양측 모두 베팅액만큼 손실
-            if secrets.randbelow(100) < 10:
-                # 현재 잔액 조회
-                cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid_a))
-                bal_a2 = (await cur.fetchone())[0]
-                cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid_b))
-                bal_b2 = (await cur.fetchone())[0]
-                new_a2 = bal_a2 - stake
-                new_b2 = bal_b2 - stake
-                await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_a2, gid, uid_a))
-                await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_b2, gid, uid_b))
-                await write_ledger(db, gid, uid_a, "duel_papa", -stake, new_a2, {"opponent": uid_b, "stake": stake})
-                await write_ledger(db, gid, uid_b, "duel_papa", -stake, new_b2, {"opponent": uid_a, "stake": stake})
+            else:
+                lv_a = await get_level(db, gid, uid_a)
+                lv_b = await get_level(db, gid, uid_b)
                 await db.commit()
-
-                em = discord.Embed(title="면진파파 강림!", color=0xe74c3c,
-                                   description=f"아저씨가 예전에 성격이 더러워서 엄청 잘 나갔었어! 두 플레이어 모두 {won(stake)}를 잃었습니다.")
-                if self.message: await self.message.edit(embed=em, view=None)
-                else: await interaction.edit_original_response(embed=em, view=None)
-                self.finalized = True; self.stop(); return
-            roll = secrets.randbelow(10_000) / 10_000.0
-            a_wins = (roll < p_a)
-            uid_w, uid_l = (uid_a, uid_b) if a_wins else (uid_b, uid_a)
-            lv_w, lv_l   = (lv_a, lv_b) if a_wins else (lv_b, lv_a)
-
-            # 애니메이션
-            name_a = member_label_cached(interaction.guild, uid_a)
-            name_b = member_label_cached(interaction.guild, uid_b)
-            if "유저 " in name_a or "유저 " in name_b:
-                ua_name = await resolve_userish(interaction.guild, interaction.client, uid_a)
-                ub_name = await resolve_userish(interaction.guild, interaction.client, uid_b)
-                name_a = ua_name.display_name; name_b = ub_name.display_name
-            for t in range(0, 101, 20):
-                em = fight_embed(name_a, name_b, lv_a, lv_b, t)
-                if self.message: await self.message.edit(embed=em, view=None)
-                else: await interaction.edit_original_response(embed=em, view=None)
-                await asyncio.sleep(0.4)
-
-            # 정산
-            cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid_w))
-            bal_w = (await cur.fetchone())[0]
-            cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid_l))
-            bal_l = (await cur.fetchone())[0]
-            if bal_l < stake:
+                holds = {uid_a: held_a[0], uid_b: held_b[0]}
+        if holds is None:
+            for c in self.children: c.disabled = True
+            em = discord.Embed(title="맞짱 취소", description="한쪽 잔액이 부족해 대결이 취소되었습니다.", color=0xE67E22)
+            if self.message: await self.message.edit(embed=em, view=None)
+            else: await interaction.edit_original_response(embed=em, view=None)
+            self.finalized = True; self.stop(); return
+
+        # 2) 결과 추첨 + 애니메이션(트랜잭션 밖)
+        p_a = duel_win_prob(lv_a, lv_b)
+        # 5%: 면진파파 난입 → 양측 모두 베팅액만큼 손실
+        papa = secrets.randbelow(100) < 10
+        roll = secrets.randbelow(10_000) / 10_000.0
+        a_wins = (roll < p_a)
+        uid_w, uid_l = (uid_a, uid_b) if a_wins else (uid_b, uid_a)
+        lv_w, lv_l   = (lv_a, lv_b) if a_wins else (lv_b, lv_a)
+
+        if not papa:
+            try:
+                label = await names.resolve_many(interaction.guild, interaction.client, (uid_a, uid_b))
+                name_a, name_b = label[uid_a], label[uid_b]
+                frames = [fight_embed(name_a, name_b, lv_a, lv_b, t) for t in range(0, 101, 20)]
+
+                async def show(em: discord.Embed):
+                    if self.message: await self.message.edit(embed=em, view=None)
+                    else: await interaction.edit_original_response(embed=em, view=None)
+
+                await animation.play(self.message.id if self.message else interaction.token, show, frames, 2.4,
+                                     (await guild_settings.get(gid)).anim_mode)
+            except Exception:
+                for hold_id in holds.values():
+                    await refund_hold(hold_id, "duel_aborted")
+                raise
+
+        # 3) 정산: hold 해제 + 지급을 한 번의 짧은 커밋으로
+        # 한쪽 hold 가 이미 정산/환불됐으면(재시작 복구 등) 전체 롤백 후 남은 hold 환불
+        async with write() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            ok = True
+            if papa:
+                for uid, other in ((uid_a, uid_b), (uid_b, uid_a)):
+                    settled = await settle_hold(db, holds[uid], payout=0)
+                    if settled is None:
+                        ok = False; break
+                    await write_ledger(db, gid, uid, "duel_papa", -stake, settled[3], {"opponent": other, "stake": stake})
+                    await duel_stats.record(db, gid, uid, "papa", stake)
+            else:
+                settled_w = await settle_hold(db, holds[uid_w], payout=stake * 2)
+                settled_l = await settle_hold(db, holds[uid_l], payout=0)
+                ok = settled_w is not None and settled_l is not None
+                if ok:
+                    new_bal_w, new_bal_l = settled_w[3], settled_l[3]
+                    await write_ledger(db, gid, uid_w, "duel_win", +stake, new_bal_w, {"opponent": uid_l, "stake": stake, "p": p_a})
+                    await write_ledger(db, gid, uid_l, "duel_lose", -stake, new_bal_l, {"opponent": uid_w, "stake": stake, "p": p_a})
+                    await duel_stats.record(db, gid, uid_w, "win", stake)
+                    await duel_stats.record(db, gid, uid_l, "lose", stake)
+            if ok:
+                await db.commit()
+            else:
                 await db.execute("ROLLBACK")
-                em = discord.Embed(title="맞짱 취소", description="정산 중 조건 불일치로 취소되었습니다.", color=0xE67E22)
-                if self.message: await self.message.edit(embed=em, view=None)
-                else: await interaction.edit_original_response(embed=em, view=None)
-                self.finalized = True; self.stop(); return
-
-            new_bal_w = bal_w + stake
-            new_bal_l = bal_l - stake
-            await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal_w, gid, uid_w))
-            await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal_l, gid, uid_l))
-            await write_ledger(db, gid, uid_w, "duel_win", +stake, new_bal_w, {"opponent": uid_l, "stake": stake, "p": p_a})
-            await write_ledger(db, gid, uid_l, "duel_lose", -stake, new_bal_l, {"opponent": uid_w, "stake": stake, "p": p_a})
-            await db.commit()
+        if not ok:
+            for hold_id in holds.values():
+                await refund_hold(hold_id, "duel_aborted")
+            em = discord.Embed(title="맞짱 취소", description=f"정산할 수 없어 대결이 취소되었습니다. 양측 베팅금 {won(stake)}은 환불되었습니다.", color=0xE67E22)
+            if self.message: await self.message.edit(embed=em, view=None)
+            else: await interaction.edit_original_response(embed=em, view=None)
+            self.finalized = True; self.stop(); return
+
+        if papa:
+            em = discord.Embed(title="면진파파 강림!", color=0xe74c3c,
+                               description=f"아저씨가 예전에 성격이 더러워서 엄청 잘 나갔었어! 두 플레이어 모두 {won(stake)}를 잃었습니다.")
+            if self.message: await self.message.edit(embed=em, view=None)
+            else: await interaction.edit_original_response(embed=em, view=None)
+            self.finalized = True; self.stop(); return
 
         winner = await resolve_userish(interaction.guild, interaction.client, uid_w)
         loser  = await resolve_userish(interaction.guild, interaction.client, uid_l)
@@ -265,14 +247,11 @@ async def mz_duel(interaction: discord.Interaction, opponent: discord.Member, am
         return await interaction.response.send_message("봇과는 대결할 수 없습니다.", ephemeral=True)
 
     min_bet = await get_min_bet(gid)
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("BEGIN IMMEDIATE")
-        ua = await get_user(db, gid, uid_a)
-        ub = await get_user(db, gid, uid_b)
-        bal_a, bal_b = ua["balance"], ub["balance"]
+    async with snapshot() as db:
+        bal_a = await get_balance(db, gid, uid_a)
+        bal_b = await get_balance(db, gid, uid_b)
         lv_a = await get_level(db, gid, uid_a)
         lv_b = await get_level(db, gid, uid_b)
-        await db.commit()
 
     stake = min(bal_a, bal_b) if amount == 0 else amount
     if stake < min_bet:
@@ -287,5 +266,253 @@ async def mz_duel(interaction: discord.Interaction, opponent: discord.Member, am
     await interaction.response.send_message(embed=challenge_embed(interaction.user, opponent, stake, lv_a, lv_b, p_a), view=view)
     view.message = await interaction.original_response()
 
+# ===== 토너먼트 =====
+# 참가 신청은 메모리에서만 받고, 시작 시 1트랜잭션으로 전원 참가비를 hold,
+# 라운드마다 전 경기를 한 번에 추첨 → 정산(패자 hold 몰수, 승자 +참가비, 전적)을 1트랜잭션,
+# 대진표 임베드 1회 수정. 우승자의 hold 는 마지막 라운드 트랜잭션에서 반환.
+TOURNEY_MAX = 64
+SIGNUP_MIN, SIGNUP_MAX = 15, 600
+ROUND_DELAY = 3.0       # 라운드 공개 간격(초)
+DESC_LIMIT = 4000
+
+class Match(NamedTuple):
+    a: int
+    b: Optional[int]    # None = 부전승
+    p_a: float
+    winner: int
+
+    @property
+    def loser(self) -> Optional[int]:
+        if self.b is None: return None
+        return self.b if self.winner == self.a else self.a
+
+def draw_round(players: list[int], levels: dict[int, int]) -> list[Match]:
+    """인접한 두 명씩 대진, 전 경기 승패를 한 번에 추첨(홀수면 마지막 1명 부전승)"""
+    pairs = list(zip(players[0::2], players[1::2]))
+    probs = [duel_win_prob(levels.get(a, 0), levels.get(b, 0)) for a, b in pairs]
+    rolls = [secrets.randbelow(10_000) / 10_000.0 for _ in pairs]
+    out = [Match(a, b, p, a if r < p else b) for (a, b), p, r in zip(pairs, probs, rolls)]
+    if len(players) % 2:
+        out.append(Match(players[-1], None, 1.0, players[-1]))
+    return out
+
+def round_title(n_players: int) -> str:
+    return "결승" if n_players == 2 else ("준결승" if n_players <= 4 else f"{n_players}강")
+
+def bracket_embed(title: str, entry: int, label: dict[int, str], levels: dict[int, int],
+                  rounds: list[tuple[str, list[Match]]], footer: str, color: int = 0x9b59b6) -> discord.Embed:
+    def mark(u: int, winner: int) -> str:
+        return f"**{label[u]}**" if u == winner else label[u]
+
+    blocks = []
+    for name, matches in rounds:
+        lines = [f"**{name}**"]
+        for m in matches:
+            if m.b is None:
+                lines.append(f"{label[m.a]} (+{levels.get(m.a, 0)}) — 부전승")
+                continue
+            lines.append(f"{mark(m.a, m.winner)} (+{levels.get(m.a, 0)}) ⚔ {mark(m.b, m.winner)} (+{levels.get(m.b, 0)}) · {m.p_a*100:.0f}%")
+        blocks.append("\n".join(lines))
+    # 설명 길이 제한 → 오래된 라운드부터 요약
+    for i in range(len(blocks)):
+        if len("\n\n".join(blocks)) <= DESC_LIMIT:
+            break
+        blocks[i] = f"**{rounds[i][0]}** — {len(rounds[i][1])}경기 (생략)"
+    em = discord.Embed(title=title, description="\n\n".join(blocks)[:DESC_LIMIT] or None, color=color)
+    em.add_field(name="판당 베팅", value=won(entry), inline=True)
+    em.set_footer(text=footer)
+    return em
+
+_tourneys: dict[int, "TournamentView"] = {}   # gid → 진행 중 토너먼트(길드당 1개)
+
+class TournamentView(discord.ui.View):
+    # View timeout 은 버튼을 누를 때마다 다시 시작되므로 쓰지 않음 → 고정 마감(deadline) 타이머로 시작
+    def __init__(self, gid: int, host_id: int, entry: int, signup: int):
+        super().__init__(timeout=None)
+        self.gid, self.host_id, self.entry = gid, host_id, entry
+        self.deadline = int(time.time()) + signup
+        self.timer: Optional[asyncio.Task] = None
+        self.entrants: list[int] = [host_id]
+        self.message: Optional[discord.Message] = None
+        self.guild: Optional[discord.Guild] = None
+        self.client: Optional[discord.Client] = None
+        self.started = False
+
+    def signup_embed(self) -> discord.Embed:
+        em = discord.Embed(title="맞짱 토너먼트 참가 모집", color=0x9b59b6,
+                           description=f"<t:{self.deadline}:R> 시작 · 참가 버튼을 누르세요 (최대 {TOURNEY_MAX}명)")
+        em.add_field(name="판당 베팅", value=f"{won(self.entry)} (경기마다 승자가 패자의 베팅을 가져감)", inline=False)
+        em.add_field(name=f"참가자 {len(self.entrants)}명", value=" ".join(f"<@{u}>" for u in self.entrants)[:1024], inline=False)
+        return em
+
+    @discord.ui.button(label="참가", style=discord.ButtonStyle.success, row=0)
+    async def join(self, interaction: discord.Interaction, _):
+        uid = interaction.user.id
+        if self.started:
+            return await interaction.response.send_message("이미 시작했습니다.", ephemeral=True)
+        if uid in self.entrants:
+            return await interaction.response.send_message("이미 참가했습니다.", ephemeral=True)
+        if len(self.entrants) >= TOURNEY_MAX:
+            return await interaction.response.send_message("참가 인원이 가득 찼습니다.", ephemeral=True)
+        async with snapshot() as db:
+            bal = await get_balance(db, self.gid, uid)
+        if bal < self.entry:
+            return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=True)
+        self.entrants.append(uid)
+        await interaction.response.edit_message(embed=self.signup_embed(), view=self)
+
+    @discord.ui.button(label="참가 취소", style=discord.ButtonStyle.secondary, row=0)
+    async def leave(self, interaction: discord.Interaction, _):
+        uid = interaction.user.id
+        if self.started or uid not in self.entrants or uid == self.host_id:
+            return await interaction.response.send_message("참가 취소할 수 없습니다.", ephemeral=True)
+        self.entrants.remove(uid)
+        await interaction.response.edit_message(embed=self.signup_embed(), view=self)
+
+    @discord.ui.button(label="바로 시작", style=discord.ButtonStyle.primary, row=0)
+    async def start_now(self, interaction: discord.Interaction, _):
+        if interaction.user.id != self.host_id:
+            return await interaction.response.send_message("개최자만 시작할 수 있습니다.", ephemeral=True)
+        if self.started:
+            return await interaction.response.send_message("이미 시작했습니다.", ephemeral=True)
+        await interaction.response.defer()
+        if self.timer is not None:
+            self.timer.cancel()
+        self.stop()
+        await self.run()
+
+    def arm(self):
+        """마감 시각에 자동 시작(모집 메시지 전송 후 1회)"""
+        self.timer = asyncio.create_task(self._start_at_deadline())
+
+    async def _start_at_deadline(self):
+        await asyncio.sleep(max(0.0, self.deadline - time.time()))
+        self.stop()
+        await self.run()
+
+    async def _show(self, em: discord.Embed):
+        if self.message:
+            try: await self.message.edit(embed=em, view=None)
+            except Exception: pass
+
+    async def run(self):
+        if self.started:
+            return
+        self.started = True
+        try:
+            await self._run()
+        finally:
+            _tourneys.pop(self.gid, None)
+
+    async def _run(self):
+        gid, stake = self.gid, self.entry
+        tid = self.message.id if self.message else int(time.time())
+        players = list(self.entrants)
+        if len(players) < 2:
+            return await self._show(discord.Embed(title="토너먼트 취소", description="참가자가 2명 미만입니다.", color=0x95a5a6))
+
+        # 1) 전원 참가비 hold + 레벨 조회(1트랜잭션, 잔액 부족자는 제외)
+        holds: dict[int, int] = {}
+        async with write() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            for uid in players:
+                held = await place_hold(db, gid, uid, stake, "tournament")
+                if held is not None:
+                    holds[uid] = held[0]
+            levels: dict[int, int] = {}
+            if holds:
+                marks = ",".join("?" * len(holds))
+                cur = await db.execute(f"SELECT user_id, level FROM user_weapons WHERE guild_id=? AND user_id IN ({marks})", (gid, *holds))
+                levels = {u: lv for u, lv in await cur.fetchall()}
+            await db.commit()
+        players = [u for u in players if u in holds]
+        dropped = len(self.entrants) - len(players)
+        if len(players) < 2:
+            for hold_id in holds.values():
+                await refund_hold(hold_id, "tournament_cancel")
+            return await self._show(discord.Embed(title="토너먼트 취소", description="잔액이 충분한 참가자가 2명 미만입니다.", color=0x95a5a6))
+
+        random.shuffle(players)
+        label = await names.resolve_many(self.guild, self.client, players)
+        anim_mode = (await guild_settings.get(gid)).anim_mode
+        rounds: list[tuple[str, list[Match]]] = []
+        note = f" · 잔액 부족 {dropped}명 제외" if dropped else ""
+        try:
+            while len(players) > 1:
+                name = round_title(len(players))
+                matches = draw_round(players, levels)
+                players = [m.winner for m in matches]
+                # 2) 라운드 정산(1트랜잭션): 패자 hold 몰수, 승자 +베팅, 전적 / 결승이면 우승자 hold 반환
+                #    hold 가 이미 정산/환불됐으면(재시작 복구 등) 라운드 전체 롤백 후 남은 hold 환불·중단
+                async with write() as db:
+                    await db.execute("BEGIN IMMEDIATE")
+                    ok = True
+                    for m in matches:
+                        if m.b is None:
+                            continue
+                        meta = {"stake": stake, "p": m.p_a, "tournament": tid, "round": name}
+                        settled = await settle_hold(db, holds[m.loser], payout=0)
+                        if settled is None:
+                            ok = False; break
+                        await write_ledger(db, gid, m.loser, "duel_lose", -stake, settled[3], {"opponent": m.winner, **meta})
+                        await credit(db, gid, m.winner, stake, "duel_win", {"opponent": m.loser, **meta})
+                        await duel_stats.record(db, gid, m.winner, "win", stake)
+                        await duel_stats.record(db, gid, m.loser, "lose", stake)
+                    if ok and len(players) == 1:
+                        ok = await settle_hold(db, holds[players[0]], payout=stake) is not None
+                    if ok:
+                        await db.commit()
+                    else:
+                        await db.execute("ROLLBACK")
+                if not ok:
+                    for hold_id in holds.values():
+                        await refund_hold(hold_id, "tournament_aborted")
+                    return await self._show(bracket_embed("토너먼트 중단", stake, label, levels, rounds,
+                                                          f"{name} 정산 실패 · 남은 참가비는 환불되었습니다{note}", color=0xe67e22))
+                # 커밋된 hold 만 목록에서 제거(예외 시 남은 hold 는 환불)
+                for m in matches:
+                    if m.b is not None:
+                        holds.pop(m.loser)
+                if len(players) == 1:
+                    holds.pop(players[0])
+                rounds.append((name, matches))
+                if len(players) > 1:
+                    await self._show(bracket_embed("맞짱 토너먼트 진행 중…", stake, label, levels, rounds,
+                                                   f"참가 {len(label)}명 · 남은 인원 {len(players)}명{note}"))
+                    if anim_mode != "instant":
+                        await asyncio.sleep(ROUND_DELAY)
+        except Exception:
+            for hold_id in holds.values():
+                await refund_hold(hold_id, "tournament_aborted")
+            raise
+
+        champ = players[0]
+        wins = sum(1 for _, ms in rounds for m in ms if m.winner == champ and m.b is not None)
+        em = bracket_embed(f"🏆 우승: {label[champ]}", stake, label, levels, rounds,
+                           f"참가 {len(label)}명 · 우승자 {wins}승 · +{won(stake * wins)}{note}", color=0x2ecc71)
+        await self._show(em)
+
+@app_commands.command(name="mz_tournament", description="맞짱 토너먼트: 모집 후 대진표로 한 번에 진행")
+@app_commands.describe(amount="경기당 베팅 금액(정수, 최소 베팅 적용)", signup=f"모집 시간(초, {SIGNUP_MIN}~{SIGNUP_MAX})")
+async def mz_tournament(interaction: discord.Interaction, amount: int, signup: int = 60):
+    gid, uid = interaction.guild.id, interaction.user.id
+    if gid in _tourneys:
+        return await interaction.response.send_message("이미 진행 중인 토너먼트가 있습니다.", ephemeral=True)
+    min_bet = await get_min_bet(gid)
+    if amount < min_bet:
+        return await interaction.response.send_message(f"최소 베팅은 {won(min_bet)} 입니다.", ephemeral=True)
+    async with snapshot() as db:
+        bal = await get_balance(db, gid, uid)
+    if bal < amount:
+        return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=True)
+
+    view = TournamentView(gid, uid, amount, max(SIGNUP_MIN, min(SIGNUP_MAX, signup)))
+    view.guild, view.client = interaction.guild, interaction.client
+    _tourneys[gid] = view
+    await interaction.response.send_message(embed=view.signup_embed(), view=view)
+    view.message = await interaction.original_response()
+    view.arm()
+
 async def setup(bot: discord.Client):
     bot.tree.add_command(mz_duel)
+    bot.tree.add_command(mz_tournament)
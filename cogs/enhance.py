@@ -1,62 +1,26 @@
-import os, aiosqlite, asyncio, secrets, time, random
+import secrets, time
+from collections import Counter
 import discord
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 
-DB_PATH = "economy.db"
+from core.balance import debit_if_sufficient, get_balance
+from core import animation, enhance_odds, guild_settings, leaderboard, ratelimit
+from core.enhance_odds import ENH_TABLE, MAX_LV
+from core.db import snapshot, write
+from core.ledger import log_event, write_ledger
 
 # ───────── 시간/표시 유틸 ─────────
 KST = timezone(timedelta(hours=9))
 def now_kst() -> datetime: return datetime.now(KST)
 def won(n: int) -> str: return f"{n:,}₩"
 
-# ───────── 강화 테이블: 1~30 ─────────
-ENH_TABLE = [
-    None,
-    {"name":"샤프심","s":100,"f":0,"d":0,"b":0,"cost":2000},
-    {"name":"연필","s":98,"f":2,"d":0,"b":0,"cost":2200},
-    {"name":"페트병","s":96,"f":4,"d":0,"b":0,"cost":2500},
-    {"name":"파리채","s":94,"f":6,"d":0,"b":0,"cost":2900},
-    {"name":"우산","s":90,"f":10,"d":0,"b":0,"cost":3400},
-    {"name":"노트북","s":87,"f":13,"d":0,"b":0,"cost":4000},
-    {"name":"낡은 단검","s":84,"f":16,"d":0,"b":0,"cost":5000},
-    {"name":"쓸만한 단검","s":80,"f":20,"d":0,"b":0,"cost":6500},
-    {"name":"견고한 단검","s":76,"f":24,"d":0,"b":0,"cost":8500},
-    {"name":"빠따","s":73,"f":27,"d":0,"b":0,"cost":11000},
-    {"name":"전기톱","s":65,"f":25,"d":10,"b":0,"cost":15000},
-    {"name":"롱소드","s":62,"f":24,"d":12,"b":2,"cost":20000},
-    {"name":"화염의 검","s":59,"f":24,"d":14,"b":3,"cost":28000},
-    {"name":"냉기의 검","s":56,"f":23,"d":16,"b":5,"cost":40000},
-    {"name":"듀얼블레이드","s":53,"f":22,"d":18,"b":7,"cost":60000},
-    {"name":"심판자의 검","s":50,"f":21,"d":20,"b":9,"cost":85000},
-    {"name":"엑스칼리버","s":47,"f":20,"d":22,"b":11,"cost":120000},
-    {"name":"플라즈마 소드","s":44,"f":19,"d":24,"b":13,"cost":170000},
-    {"name":"천총운검","s":41,"f":18,"d":26,"b":15,"cost":240000},
-    {"name":"사인참사검","s":38,"f":17,"d":28,"b":17,"cost":330000},
-    {"name":"뒤랑칼","s":35,"f":17,"d":30,"b":18,"cost":450000},
-    {"name":"파멸의 대검","s":32,"f":16,"d":33,"b":19,"cost":600000},
-    {"name":"여명의 검","s":29,"f":15,"d":35,"b":21,"cost":800000},
-    {"name":"키샨","s":26,"f":14,"d":38,"b":22,"cost":1100000},
-    {"name":"영원의 창","s":23,"f":14,"d":40,"b":23,"cost":1500000},
-    {"name":"정의의 저울","s":21,"f":13,"d":42,"b":24,"cost":2000000},
-    {"name":"사신의 낫","s":19,"f":12,"d":43,"b":26,"cost":2700000},
-    {"name":"아스트라페","s":17,"f":11,"d":45,"b":27,"cost":3600000},
-    {"name":"롱기누스의 창","s":16,"f":10,"d":46,"b":28,"cost":4800000},
-    {"name":"면진검","s":15,"f":10,"d":47,"b":28,"cost":6500000},
-]
-MAX_LV = 30
+# ───────── 강화 테이블: core.enhance_odds(ENH_TABLE, 기대 비용/시도 분석) ─────────
 
-# ───────── DB 유틸 ─────────
-async def get_user(db, gid: int, uid: int):
-    cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-    row = await cur.fetchone()
-    if row:
-        return {"balance": row[0]}
-    await db.execute("INSERT INTO users(guild_id,user_id,balance) VALUES(?,?,?)", (gid, uid, 0))
-    await db.commit()
-    return {"balance": 0}
+AUTO_MAX_TRIES = 1000     # 자동 강화 1회 실행의 시도 상한
 
+# ───────── DB 유틸 ─────────
 async def ensure_weapon_row(db, gid: int, uid: int):
     await db.execute(
         "INSERT OR IGNORE INTO user_weapons(guild_id,user_id,level,updated_at) VALUES(?,?,0,?)",
@@ -70,26 +34,35 @@ async def get_level(db, gid: int, uid: int) -> int:
     return row[0] if row else 0
 
 async def set_level(db, gid: int, uid: int, lv: int):
-    await db.execute("UPDATE user_weapons SET level=?, updated_at=? WHERE guild_id=? AND user_id=?",
-                     (lv, int(time.time()), gid, uid))
-
-async def write_ledger(db, gid, uid, kind, amount, bal_after, meta=None):
+    # 초기 화면은 조회 전용이라 행이 없을 수 있음 → UPSERT
     await db.execute(
-        "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-        (gid, uid, kind, amount, bal_after, (meta and str(meta)) or "{}", int(time.time()))
+        "INSERT INTO user_weapons(guild_id,user_id,level,updated_at) VALUES(?,?,?,?) "
+        "ON CONFLICT(guild_id,user_id) DO UPDATE SET level=excluded.level, updated_at=excluded.updated_at",
+        (gid, uid, lv, int(time.time()))
     )
+    leaderboard.mark(gid, uid)
 
 async def get_enh_cost_mult(gid: int) -> float:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT COALESCE(enh_cost_mult,1.0) FROM guild_settings WHERE guild_id=?", (gid,))
-        row = await cur.fetchone()
-        return float(row[0] if row else 1.0)
+    return (await guild_settings.get(gid)).enh_cost_mult
 
 async def get_force_mode(gid: int) -> tuple[str, int]:
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT COALESCE(force_mode,'off'), COALESCE(force_target_user_id,0) FROM guild_settings WHERE guild_id=?", (gid,))
-        row = await cur.fetchone()
-        return (row[0], int(row[1] or 0)) if row else ("off", 0)
+    s = await guild_settings.get(gid)
+    return s.force_mode, s.force_uid
+
+# ───────── 판정 ─────────
+def roll_outcome(row: dict, roll: float) -> str:
+    """roll(0~100) → success/fail/down/break"""
+    s, f, d = row["s"], row["f"], row["d"]
+    if roll < s: return "success"
+    if roll < s + f: return "fail"
+    if roll < s + f + d: return "down"
+    return "break"
+
+def apply_outcome(lv: int, outcome: str) -> int:
+    if outcome == "success": return min(lv + 1, MAX_LV)
+    if outcome == "down": return max(0, lv - 1)
+    if outcome == "break": return 0
+    return lv   # fail
 
 # ───────── 진행바/임베드 ─────────
 def _progress_bar(p: float, width: int = 12) -> str:
@@ -115,7 +88,14 @@ def _progress_embed(user: discord.Member, curr_lv: int, next_name: str, pct: int
     em.add_field(name="진행", value=f"{_progress_bar(pct/100)} **{pct}%**", inline=False)
     return em
 
-def enhance_embed(user: discord.Member, gid: int, curr_lv: int, bal: int):
+def odds_text(r: enhance_odds.Reach) -> str:
+    ap = enhance_odds.approx
+    p50, p90, _ = r.quantiles
+    tries = f"{r.attempts:,.1f}" if r.attempts < 1e4 else ap(r.attempts)
+    spread = f" · 절반은 {ap(p50)}회, 90%는 {ap(p90)}회 이내" if p90 is not None else ""
+    return f"평균 {tries}회{spread}\n기대 비용 {ap(r.cost)}₩ (±{ap(r.cost_sd)}₩)"
+
+def enhance_embed(user: discord.Member, gid: int, curr_lv: int, bal: int, mult: float = 1.0):
     row, nxt = next_row(curr_lv)
     title = f"당신이 보유한 무기는\nLV{curr_lv}『{lv_name(curr_lv)}』" if curr_lv>0 else "당신은 아직 무기가 없습니다"
     em = discord.Embed(title=title, color=0x3498db)
@@ -128,25 +108,98 @@ def enhance_embed(user: discord.Member, gid: int, curr_lv: int, bal: int):
         em.add_field(name="다음 단계", value=f"LV{nxt} 『{row['name']}』", inline=False)
         em.add_field(name="강화비용(기본)", value=won(row["cost"]), inline=True)
         em.add_field(name="성공/실패/하락/파괴", value=f"{row['s']}% / {row['f']}% / {row['d']}% / {row['b']}%", inline=True)
+        # 하락/파괴 후 다시 올라오는 비용까지 포함한 기대값(흡수 마르코프 체인)
+        a = enhance_odds.analyze(mult)
+        if a is not None:
+            em.add_field(name=f"LV{nxt} 도달까지(기대)", value=odds_text(a.reach(curr_lv, nxt)), inline=False)
+            if nxt < MAX_LV:
+                em.add_field(name=f"LV{MAX_LV}까지(기대)", value=odds_text(a.reach(curr_lv, MAX_LV)), inline=False)
     em.add_field(name="잔액", value=won(bal), inline=False)
     em.set_footer(text=f"오늘 {now_kst().strftime('%H:%M')}")
     return em
 
 
 async def enhance_embed_effective(user: discord.Member, gid: int, curr_lv: int, bal: int) -> discord.Embed:
-    em = enhance_embed(user, gid, curr_lv, bal)
+    mult = await get_enh_cost_mult(gid)
+    em = enhance_embed(user, gid, curr_lv, bal, mult)
     # 배율 적용 비용 표시 추가
     if curr_lv < MAX_LV:
         try:
-            row, nxt = next_row(curr_lv)
-            mult = await get_enh_cost_mult(gid)
-            eff = int(round(row["cost"] * float(mult)))
-            em.add_field(name=f"강화비용(배율적용 x{mult:.2f})", value=won(eff), inline=True)
+            eff = enhance_odds.attempt_cost(curr_lv, mult)
+            em.insert_field_at(3, name=f"강화비용(배율적용 x{mult:.2f})", value=won(eff), inline=True)
         except Exception:
             pass
     return em
 
 
+# ───────── 자동 강화 ─────────
+STOP_LABELS = {
+    "target": "목표 레벨 도달", "budget": "예산 소진", "tries": "시도 횟수 도달",
+    "balance": "잔액 부족",
+}
+
+class AutoResult(NamedTuple):
+    start: int
+    end: int
+    peak: int
+    tries: int
+    spent: int
+    bal: int
+    counts: Counter
+    stop: str       # STOP_LABELS 키
+
+async def auto_enhance(gid: int, uid: int, target: int, budget: int, tries: int) -> AutoResult:
+    """
+    목표 레벨 / 예산 / 시도 횟수 중 먼저 닿는 조건까지 연속 강화(0 = 제한 없음, 시도는 AUTO_MAX_TRIES 상한)
+    판정은 미리 뽑아 두고, 비용 합계 차감·레벨 저장·집계 원장을 트랜잭션 1개로 기록
+    """
+    s = await guild_settings.get(gid)
+    forced = s.force_mode in ("success", "fail") and (s.force_uid == 0 or s.force_uid == uid)
+    target = min(target or MAX_LV, MAX_LV)
+    tries = min(tries or AUTO_MAX_TRIES, AUTO_MAX_TRIES)
+    rolls = [secrets.randbelow(10000) / 100.0 for _ in range(tries)]
+
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        bal = await get_balance(db, gid, uid)
+        lv = start = await get_level(db, gid, uid)
+        limit = min(bal, budget) if budget else bal
+        spent, n, peak, counts = 0, 0, lv, Counter()
+        while True:
+            if lv >= target: stop = "target"; break     # target <= MAX_LV
+            if n >= tries: stop = "tries"; break
+            cost = enhance_odds.attempt_cost(lv, s.enh_cost_mult)
+            if spent + cost > limit:
+                stop = "budget" if budget and spent + cost > budget else "balance"
+                break
+            if forced:
+                outcome = "success" if s.force_mode == "success" else "fail"
+            else:
+                outcome = roll_outcome(ENH_TABLE[lv + 1], rolls[n])
+            spent += cost; n += 1; counts[outcome] += 1
+            lv = apply_outcome(lv, outcome)
+            peak = max(peak, lv)
+        if n == 0:
+            await db.execute("ROLLBACK")
+            return AutoResult(start, lv, peak, 0, 0, bal, counts, stop)
+        new_bal = await debit_if_sufficient(db, gid, uid, spent, "enhance_cost",
+                                            {"to": target, "auto": True, "tries": n})
+        await set_level(db, gid, uid, lv)
+        await write_ledger(db, gid, uid, "enhance_result", 0, new_bal, {
+            "from": start, "to": lv, "peak": peak, "tries": n, "outcomes": dict(counts),
+            "forced": forced, "auto": True, "stop": stop,
+        })
+        await db.commit()
+    return AutoResult(start, lv, peak, n, spent, new_bal, counts, stop)
+
+def auto_result_text(r: AutoResult) -> str:
+    c = r.counts
+    return (
+        f"LV{r.start} → **LV{r.end}** 『{lv_name(r.end)}』 (최고 LV{r.peak})\n"
+        f"시도 {r.tries:,}회 · 성공 {c['success']} / 실패 {c['fail']} / 하락 {c['down']} / 파괴 {c['break']}\n"
+        f"사용 {won(r.spent)} · 중단: {STOP_LABELS[r.stop]}"
+    )
+
 # ───────── UI View(자동 취소) ─────────
 class AutoCancelView(discord.ui.View):
     def __init__(self, timeout_seconds: int = 60):
@@ -188,28 +241,28 @@ class EnhanceView(AutoCancelView):
         self.gid, self.uid = gid, uid
         self.curr_lv, self.bal = curr_lv, bal
         self.btn_enh = discord.ui.Button(label="강화하기", style=discord.ButtonStyle.primary, row=0, disabled=(curr_lv>=MAX_LV))
+        self.btn_auto = discord.ui.Button(label="자동 강화", style=discord.ButtonStyle.success, row=0, disabled=(curr_lv>=MAX_LV))
         self.btn_cancel = discord.ui.Button(label="취소", style=discord.ButtonStyle.secondary, row=0)
         self.btn_enh.callback = self._do_enhance
+        self.btn_auto.callback = self._do_auto
         self.btn_cancel.callback = self._do_cancel
-        self.add_item(self.btn_enh); self.add_item(self.btn_cancel)
+        self.add_item(self.btn_enh); self.add_item(self.btn_auto); self.add_item(self.btn_cancel)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != self.uid:
             await interaction.response.send_message("이 메뉴는 생성한 사용자만 조작할 수 있습니다.", ephemeral=True)
             return False
-        return True
+        return await ratelimit.interaction_check(interaction, "enhance")
 
     async def _refresh(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("BEGIN IMMEDIATE")
+        async with snapshot() as db:
             cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (self.gid, self.uid))
             row = await cur.fetchone()
             self.bal = row[0] if row else 0
             cur = await db.execute("SELECT level FROM user_weapons WHERE guild_id=? AND user_id=?", (self.gid, self.uid))
             row = await cur.fetchone()
             self.curr_lv = row[0] if row else 0
-            await db.commit()
-        self.btn_enh.disabled = (self.curr_lv >= MAX_LV)
+        self.btn_enh.disabled = self.btn_auto.disabled = (self.curr_lv >= MAX_LV)
         if self.message:
             await self.message.edit(embed=(await enhance_embed_effective(interaction.user, self.gid, self.curr_lv, self.bal)), view=self)
 
@@ -219,6 +272,27 @@ class EnhanceView(AutoCancelView):
         await interaction.response.edit_message(embed=discord.Embed(title="취소되었습니다", color=0x95a5a6), view=None)
         self.stop()
 
+    async def _do_auto(self, interaction: discord.Interaction):
+        if self.curr_lv >= MAX_LV:
+            return await interaction.response.send_message("이미 최대 레벨입니다.", ephemeral=True)
+        await interaction.response.send_modal(AutoEnhanceModal(self))
+
+    async def run_auto(self, interaction: discord.Interaction, target: int, budget: int, tries: int):
+        """애니메이션 없이 결과 요약 임베드 1회"""
+        await interaction.response.defer()
+        r = await auto_enhance(self.gid, self.uid, target, budget, tries)
+        self.curr_lv, self.bal = r.end, r.bal
+        em = await enhance_embed_effective(interaction.user, self.gid, self.curr_lv, self.bal)
+        em.insert_field_at(0, name="자동 강화 결과", value=auto_result_text(r), inline=False)
+        self.finalized = True
+        self.stop()
+        view = ResultAutoRemoveView(timeout=300)
+        if self.message:
+            msg = await self.message.edit(embed=em, view=view)
+        else:
+            msg = await interaction.edit_original_response(embed=em, view=view)
+        view.message = msg
+
     async def _do_enhance(self, interaction: discord.Interaction):
         if self.curr_lv >= MAX_LV:
         # 애니메이션 동안 버튼 비활성화
@@ -229,27 +303,29 @@ class EnhanceView(AutoCancelView):
 
         row, nxt = next_row(self.curr_lv)
         mult = await get_enh_cost_mult(self.gid)
-        cost = int(round(row["cost"] * float(mult)))
+        cost = enhance_odds.attempt_cost(self.curr_lv, mult)
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
-            cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (self.gid, self.uid))
-            r = await cur.fetchone()
-            bal = r[0] if r else 0
-            if bal < cost:
+            new_bal = await debit_if_sufficient(db, self.gid, self.uid, cost, "enhance_cost", {"to": nxt})
+            if new_bal is None:
+                bal = await get_balance(db, self.gid, self.uid)
                 await db.execute("ROLLBACK")
-                return await interaction.response.send_message(f"잔액 부족: 필요 {won(cost)} / 현재 {won(bal)}", ephemeral=True)
-            new_bal = bal - cost
-            await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, self.gid, self.uid))
-            await write_ledger(db, self.gid, self.uid, "enhance_cost", -cost, new_bal, {"to": nxt})
-            await db.commit()
+            else:
+                await db.commit()
+        if new_bal is None:
+            return await interaction.response.send_message(f"잔액 부족: 필요 {won(cost)} / 현재 {won(bal)}", ephemeral=True)
 
         await interaction.response.defer()
-        for pct in (0, 20, 40, 60, 80, 100):
-            em_prog = _progress_embed(interaction.user, self.curr_lv, f"LV{nxt} 『{row['name']}』", pct)
+        frames = [_progress_embed(interaction.user, self.curr_lv, f"LV{nxt} 『{row['name']}』", pct)
+                  for pct in (0, 20, 40, 60, 80, 100)]
+
+        async def show(em_prog: discord.Embed):
             if self.message: await self.message.edit(embed=em_prog, view=self)
             else: await interaction.edit_original_response(embed=em_prog, view=self)
-            await asyncio.sleep(0.5)
+
+        await animation.play(self.message.id if self.message else interaction.token, show, frames, 3.0,
+                             (await guild_settings.get(self.gid)).anim_mode)
 
         # 결과 계산(강제 모드 반영)
         force_mode, force_uid = await get_force_mode(self.gid)
@@ -257,30 +333,18 @@ class EnhanceView(AutoCancelView):
         if forced:
             outcome = "success" if force_mode == "success" else "fail"
         else:
-            roll = secrets.randbelow(10000) / 100.0
-            s, f, d, b = row["s"], row["f"], row["d"], row["b"]
-            if roll < s: outcome = "success"
-            elif roll < s + f: outcome = "fail"
-            elif roll < s + f + d: outcome = "down"
-            else: outcome = "break"
-
-        if outcome == "success":
-            new_lv = min(self.curr_lv + 1, MAX_LV)
-        elif outcome == "down":
-            new_lv = max(0, self.curr_lv - 1)
-        elif outcome == "break":
-            new_lv = 0
-        else:  # fail
-            new_lv = self.curr_lv
-
-        async with aiosqlite.connect(DB_PATH) as db:
+            outcome = roll_outcome(row, secrets.randbelow(10000) / 100.0)
+        new_lv = apply_outcome(self.curr_lv, outcome)
+
+        async with write() as db:
             await db.execute("BEGIN IMMEDIATE")
             await set_level(db, self.gid, self.uid, new_lv)
-            await write_ledger(
-                db, self.gid, self.uid, "enhance_result", 0, new_bal,
-                {"from": self.curr_lv, "to": new_lv, "nxt": nxt, "outcome": outcome, "forced": forced}
-            )
             await db.commit()
+        # 비금전 기록 → 그룹 커밋 큐
+        await log_event(
+            self.gid, self.uid, "enhance_result", 0, new_bal,
+            {"from": self.curr_lv, "to": new_lv, "nxt": nxt, "outcome": outcome, "forced": forced}
+        )
 
         self.curr_lv, self.bal = new_lv, new_bal
         result_txt = {
@@ -301,24 +365,40 @@ class EnhanceView(AutoCancelView):
             msg = await interaction.edit_original_response(embed=em, view=view)
         view.message = msg
 
+class AutoEnhanceModal(discord.ui.Modal, title="자동 강화"):
+    target = discord.ui.TextInput(label="목표 레벨(선택)", placeholder="예) 15", required=False, max_length=2)
+    budget = discord.ui.TextInput(label="예산(선택, ₩)", placeholder="예) 1000000", required=False)
+    tries = discord.ui.TextInput(label=f"최대 시도 횟수(선택, 최대 {AUTO_MAX_TRIES:,})", placeholder="예) 100", required=False)
+    def __init__(self, parent: EnhanceView):
+        super().__init__(timeout=180)
+        self.parent = parent
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            target, budget, tries = (int(str(v).replace(",", "").strip() or 0) for v in (self.target, self.budget, self.tries))
+        except ValueError:
+            return await interaction.response.send_message("숫자만 입력해 주세요.", ephemeral=True)
+        if min(target, budget, tries) < 0 or not (target or budget or tries):
+            return await interaction.response.send_message("목표 레벨/예산/시도 횟수 중 하나 이상을 입력해 주세요.", ephemeral=True)
+        if target and target <= self.parent.curr_lv:
+            return await interaction.response.send_message(f"목표 레벨은 현재 레벨(LV{self.parent.curr_lv})보다 높아야 합니다.", ephemeral=True)
+        await self.parent.run_auto(interaction, target, budget, tries)
+
 # ───────── Slash 명령 ─────────
 @app_commands.command(name="mz_enhance", description="무기 강화 메뉴를 엽니다")
 async def mz_enhance(interaction: discord.Interaction):
     gid, uid = interaction.guild.id, interaction.user.id
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("BEGIN IMMEDIATE")
-        await ensure_weapon_row(db, gid, uid)
+    async with snapshot() as db:
         cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
         r = await cur.fetchone()
         bal = r[0] if r else 0
         cur = await db.execute("SELECT level FROM user_weapons WHERE guild_id=? AND user_id=?", (gid, uid))
         r = await cur.fetchone()
         lv = r[0] if r else 0
-        await db.commit()
 
     view = EnhanceView(gid, uid, lv, bal)
     await interaction.response.send_message(embed=(await enhance_embed_effective(interaction.user, gid, lv, bal)), view=view)
     view.message = await interaction.original_response()
 
 async def setup(bot: discord.Client):
+    enhance_odds.analyze(1.0)   # 기본 배율 분석을 로드 시 미리 계산
     bot.tree.add_command(mz_enhance)
@@ -1,13 +1,21 @@
 
-import aiosqlite, secrets, time, asyncio, random
+import random
+from itertools import accumulate
 import discord
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
 
-DB_PATH = "economy.db"
+from core import animation, guild_settings
+from core.balance import credit, get_balance
+from core.db import write
+from core.ledger import write_ledger
+from core.escrow import place_hold, settle_hold, refund_hold
 
 REVEAL_DELAY = 3
 PROGRESS_TICKS = 6
+MAX_ROUNDS = 1000       # 연속 도박 1회 최대 판 수
+SPARK = "▁▂▃▄▅▆▇█"
+STOP_LABELS = {"done": "완료", "stop_loss": "손절", "take_profit": "익절", "balance": "잔액 부족"}
 SPINNER = ["◐","◓","◑","◒","◐","◓"]
 
 KST = timezone(timedelta(hours=9))
@@ -23,31 +31,6 @@ def footer_text(balance: int, mode_name: str) -> str:
     t = now_kst().strftime("%H:%M")
     return f"현재 잔액 {balance:,}₩ · 모드 {mode_name} · {t}"
 
-async def get_settings(db, gid: int):
-    cur = await db.execute("SELECT min_bet, win_min_bps, win_max_bps, mode_name, force_mode, force_target_user_id FROM guild_settings WHERE guild_id=?", (gid,))
-    row = await cur.fetchone()
-    if not row:
-        # defaults
-        return {"min_bet": 1000, "win_min_bps": 3000, "win_max_bps": 6000, "mode_name": "일반 모드", "force_mode":"off", "force_uid":0}
-    return {
-        "min_bet": row[0], "win_min_bps": row[1], "win_max_bps": row[2],
-        "mode_name": row[3], "force_mode": row[4], "force_uid": row[5],
-    }
-
-async def get_user(db, gid: int, uid: int):
-    cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-    r = await cur.fetchone()
-    if not r:
-        await db.execute("INSERT INTO users(guild_id,user_id,balance,last_claim_at,last_daily_at) VALUES(?,?,?,?,?)", (gid, uid, 0, None, None))
-        return {"balance": 0}
-    return {"balance": r[0]}
-
-async def write_ledger(db, gid:int, uid:int, kind:str, amount:int, bal_after:int, meta=None):
-    await db.execute(
-        "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-        (gid, uid, kind, amount, bal_after, (meta and str(meta)) or "{}", int(time.time()))
-    )
-
 class _DisabledView(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
@@ -63,51 +46,80 @@ async def mz_bet(interaction: discord.Interaction, amount: int):
     em.add_field(name="진행", value=progress_bar(0.0, 16), inline=False)
     await interaction.response.send_message(embed=em, view=_DisabledView())
 
-    async with aiosqlite.connect(DB_PATH) as db:
+    # 1) 예약: 짧은 트랜잭션에서 베팅액을 hold로 이동
+    s = await guild_settings.get(gid)
+    if amount < s.min_bet:
+        return await interaction.edit_original_response(embed=discord.Embed(description=f"최소 베팅은 {won(s.min_bet)} 입니다.", color=0xe67e22), view=None)
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        s = await get_settings(db, gid)
-        min_bet = s["min_bet"]
-        if amount < min_bet:
-            await db.execute("ROLLBACK")
-            return await interaction.edit_original_response(embed=discord.Embed(description=f"최소 베팅은 {won(min_bet)} 입니다.", color=0xe67e22), view=None)
-
-        u = await get_user(db, gid, uid)
-        bal = u["balance"]
-        if amount > bal:
+        held = await place_hold(db, gid, uid, amount, "bet")
+        if held is None:
             await db.execute("ROLLBACK")
-            return await interaction.edit_original_response(embed=discord.Embed(description="잔액이 부족합니다.", color=0xe67e22), view=None)
+        else:
+            await db.commit()
+    if held is None:
+        return await interaction.edit_original_response(embed=discord.Embed(description="잔액이 부족합니다.", color=0xe67e22), view=None)
+    hold_id, held_bal = held
+    bal = held_bal + amount
 
-        # 애니메이션 표시
-        for i in range(PROGRESS_TICKS):
-            p = (i+1) / PROGRESS_TICKS
-            em = discord.Embed(title="도박 준비 중...", color=0x95a5a6)
+    # 2) 애니메이션(트랜잭션 밖 — 쓰기 락 미보유)
+    try:
+        frames = []
+        if s.anim_mode == "single":
+            # 단일 프레임 모드: 진행 막대 대신 정지 프레임 1장
+            em = discord.Embed(title="굴리는 중…", color=0x95a5a6)
             em.add_field(name="현재", value=won(bal), inline=True)
             em.add_field(name="베팅", value=won(amount), inline=True)
-            em.add_field(name="진행", value=progress_bar(p, 16), inline=False)
+            frames.append(em)
+        else:
+            for i in range(PROGRESS_TICKS):
+                p = (i+1) / PROGRESS_TICKS
+                em = discord.Embed(title="도박 준비 중...", color=0x95a5a6)
+                em.add_field(name="현재", value=won(bal), inline=True)
+                em.add_field(name="베팅", value=won(amount), inline=True)
+                em.add_field(name="진행", value=progress_bar(p, 16), inline=False)
+                frames.append(em)
+
+        async def show(em: discord.Embed):
             try:
                 await interaction.edit_original_response(embed=em, view=_DisabledView())
             except discord.NotFound:
                 pass
-            await asyncio.sleep(REVEAL_DELAY / PROGRESS_TICKS)
 
-        # 강제 결과 적용
-        forced = s.get("force_mode","off")
-        if forced == "success":   win = True
-        elif forced == "fail":    win = False
+        await animation.play(interaction.token, show, frames, REVEAL_DELAY, s.anim_mode)
+    except Exception:
+        await refund_hold(hold_id, "bet_aborted")
+        raise
+
+    # 강제 결과 적용
+    forced = s.forced_for(uid)
+    if forced == "success":   win = True
+    elif forced == "fail":    win = False
+    else:
+        # 확률 범위 내에서 랜덤
+        lo = max(0, min(10000, int(s.win_min_bps)))
+        hi = max(lo, min(10000, int(s.win_max_bps)))
+        p_win = random.randint(lo, hi) / 10000.0
+        win = (random.random() < p_win)
+
+    delta = amount if win else -amount
+
+    # 3) 정산: hold 해제 + 지급을 짧은 트랜잭션으로
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        settled = await settle_hold(db, hold_id, payout=(amount * 2 if win else 0))
+        if settled is None:     # 그 사이 환불됨(재시작 복구 등)
+            await db.execute("ROLLBACK")
         else:
-            # 확률 범위 내에서 랜덤
-            lo = max(0, min(10000, int(s["win_min_bps"])))
-            hi = max(lo, min(10000, int(s["win_max_bps"])))
-            p_win = random.randint(lo, hi) / 10000.0
-            win = (random.random() < p_win)
-
-        delta = amount if win else -amount
-        new_bal = bal + delta
-
-        # 정산
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, ("bet_win" if win else "bet_lose"), delta, new_bal, {"bet": amount, "p_forced": forced})
-        await db.commit()
+            new_bal = settled[3]
+            await write_ledger(db, gid, uid, ("bet_win" if win else "bet_lose"), delta, new_bal, {"bet": amount, "p_forced": forced})
+            await db.commit()
+    if settled is None:
+        em = discord.Embed(title="도박 취소", description=f"베팅금 {won(amount)}은 환불되었습니다.", color=0xe67e22)
+        try:
+            return await interaction.edit_original_response(embed=em, view=None)
+        except discord.NotFound:
+            return await interaction.followup.send(embed=em)
 
     color = 0x2ecc71 if win else 0xe74c3c
     em = discord.Embed(title="도박 결과", color=color)
@@ -116,8 +128,100 @@ async def mz_bet(interaction: discord.Interaction, amount: int):
     em.add_field(name="결과", value=("승리" if win else "패배"), inline=True)
     em.add_field(name="손익", value=f"{'+' if delta>=0 else ''}{won(delta)}", inline=True)
     em.add_field(name="현재 잔액", value=won(new_bal), inline=False)
-    em.set_footer(text=footer_text(new_bal, s["mode_name"]))
+    em.set_footer(text=footer_text(new_bal, s.mode_name))
     try:
         await interaction.edit_original_response(embed=em, view=None)
     except discord.NotFound:
         await interaction.followup.send(embed=em)
+
+# ───────── 연속 도박 ─────────
+def draw_wins(n: int, lo_bps: int, hi_bps: int) -> list[bool]:
+    """n판의 승패를 한 번에 추첨 — 판마다 승률 U[lo, hi](bps) 후 베르누이 (mz_bet 과 같은 모델)"""
+    try:
+        import numpy as np
+    except ImportError:
+        return [random.random() < random.randint(lo_bps, hi_bps) / 10000.0 for _ in range(n)]
+    rng = np.random.default_rng()
+    p = rng.integers(lo_bps, hi_bps, size=n, endpoint=True) / 10000.0
+    return (rng.random(n) < p).tolist()
+
+def play_rounds(wins: list[bool], amount: int, bal: int, stop_loss: int, take_profit: int) -> tuple[list[int], str]:
+    """누적 손익 목록과 중단 사유(STOP_LABELS 키) — 잔액이 베팅액보다 적어지면/손절/익절 시 그 판에서 멈춤"""
+    cum = list(accumulate(amount if w else -amount for w in wins))
+    for i, c in enumerate(cum):
+        if stop_loss and c <= -stop_loss:
+            return cum[:i + 1], "stop_loss"
+        if take_profit and c >= take_profit:
+            return cum[:i + 1], "take_profit"
+        if i + 1 < len(cum) and bal + c < amount:
+            return cum[:i + 1], "balance"
+    return cum, "done"
+
+def sparkline(cum: list[int], width: int = 24) -> str:
+    pts = [0] + [cum[min(len(cum) - 1, (i + 1) * len(cum) // width - 1)] for i in range(min(width, len(cum)))]
+    lo, hi = min(pts), max(pts)
+    if hi == lo:
+        return SPARK[0] * len(pts)
+    return "".join(SPARK[int((v - lo) / (hi - lo) * (len(SPARK) - 1))] for v in pts)
+
+@app_commands.command(name="mz_bet_batch", description="면진연속도박 — 같은 금액으로 여러 판을 한 번에(손절/익절 설정)")
+@app_commands.describe(
+    amount="판당 베팅 금액(정수, 최소 베팅 이상)",
+    rounds=f"판 수(1~{MAX_ROUNDS:,})",
+    stop_loss="누적 손실이 이 금액 이상이면 중단(0=없음)",
+    take_profit="누적 이익이 이 금액 이상이면 중단(0=없음)",
+)
+async def mz_bet_batch(interaction: discord.Interaction, amount: int, rounds: int, stop_loss: int = 0, take_profit: int = 0):
+    gid, uid = interaction.guild.id, interaction.user.id
+    s = await guild_settings.get(gid)
+    if amount < s.min_bet:
+        return await interaction.response.send_message(f"최소 베팅은 {won(s.min_bet)} 입니다.", ephemeral=True)
+    if not (1 <= rounds <= MAX_ROUNDS):
+        return await interaction.response.send_message(f"판 수는 1~{MAX_ROUNDS:,} 사이여야 합니다.", ephemeral=True)
+    if stop_loss < 0 or take_profit < 0:
+        return await interaction.response.send_message("손절/익절 금액은 음수가 될 수 없습니다.", ephemeral=True)
+
+    forced = s.forced_for(uid)
+    if forced:
+        wins = [forced == "success"] * rounds
+    else:
+        lo = max(0, min(10000, int(s.win_min_bps)))
+        hi = max(lo, min(10000, int(s.win_max_bps)))
+        wins = draw_wins(rounds, lo, hi)
+
+    # 잔액 확인·판별 적용·정산·원장 요약 1행을 트랜잭션 1개로
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        bal = await get_balance(db, gid, uid)
+        short = bal < amount
+        if short:
+            await db.execute("ROLLBACK")
+        else:
+            cum, reason = play_rounds(wins, amount, bal, stop_loss, take_profit)
+            played, net = len(cum), cum[-1]
+            won_n = sum(wins[:played])
+            new_bal = await credit(db, gid, uid, net, "bet_batch", {
+                "bet": amount, "rounds": played, "requested": rounds, "wins": won_n,
+                "stop": reason, "p_forced": forced,
+            })
+            await db.commit()
+    if short:
+        return await interaction.response.send_message(f"잔액이 부족합니다: {won(bal)}", ephemeral=True)
+
+    color = 0x2ecc71 if net > 0 else (0xe74c3c if net < 0 else 0x95a5a6)
+    em = discord.Embed(title="연속 도박 결과", color=color)
+    try: em.set_author(name=interaction.user.display_name, icon_url=interaction.user.display_avatar.url)
+    except Exception: em.set_author(name=interaction.user.display_name)
+    em.add_field(name="판 수", value=f"{played:,} / {rounds:,}판 · {STOP_LABELS[reason]}", inline=True)
+    em.add_field(name="승/패", value=f"{won_n:,}승 {played - won_n:,}패 ({won_n / played * 100:.1f}%)", inline=True)
+    em.add_field(name="판당 베팅", value=won(amount), inline=True)
+    em.add_field(name="순손익", value=f"{'+' if net >= 0 else ''}{won(net)}", inline=True)
+    em.add_field(name="최고/최저", value=f"{'+' if max(cum) >= 0 else ''}{won(max(cum))} / {won(min(cum))}", inline=True)
+    em.add_field(name="흐름", value=f"`{sparkline(cum)}`", inline=False)
+    em.add_field(name="현재 잔액", value=won(new_bal), inline=False)
+    em.set_footer(text=footer_text(new_bal, s.mode_name))
+    await interaction.response.send_message(embed=em)
+
+async def setup(bot: discord.Client):
+    bot.tree.add_command(mz_bet)
+    bot.tree.add_command(mz_bet_batch)
@@ -4,47 +4,30 @@
 # - model  : gemini-1.5-flash | gemini-1.5-pro (선택, 기본 flash)
 # - public : 채널에 공개할지 여부(기본 False=비공개)
 #
-# 필요 패키지:
-#   pip install google-generativeai
-#
+# 호출은 core.llm 게이트웨이(스레드 풀/동시성 제한/재시도)를 거친다.
+# 응답은 스트리밍으로 받아 core.streaming 으로 점진 편집(2000자 초과분은 새 메시지).
 # 환경변수:
 #   GOOGLE_API_KEY=콘솔에서 발급한 키
 
 from __future__ import annotations
-import os
 import traceback
-from typing import Optional, Iterable
+from typing import Optional
 
 import discord
 from discord import app_commands
-import google.generativeai as genai
+
+from core import llm, streaming
 
 # ─────────────────────────────────────────────────────────
 # 설정
-API_KEY = os.getenv("GOOGLE_API_KEY", "")
 DEFAULT_MODEL = "gemini-1.5-flash"  # 속도 우선; 정확도는 pro
 MODEL_CHOICES = ["gemini-1.5-flash", "gemini-1.5-pro"]
 
-# GenAI 클라이언트 초기화(키가 없으면 명령 실행 시 안내)
-if API_KEY:
-    genai.configure(api_key=API_KEY)
-
 # ─────────────────────────────────────────────────────────
 # 유틸
-def _chunks(s: str, limit: int = 1900) -> Iterable[str]:
-    """디스코드 2000자 제한 대비 분할."""
-    s = s or ""
-    for i in range(0, len(s), limit):
-        yield s[i:i + limit]
-
 def _ensure_client_ready() -> Optional[str]:
-    """키 미설정 시 에러 메시지 반환."""
-    if not API_KEY:
-        return (
-            "Gemini API 키가 설정되어 있지 않습니다.\n"
-            "서버 환경변수 `GOOGLE_API_KEY`를 설정한 뒤 다시 시도해 주세요."
-        )
-    return None
+    """키/패키지 미설정 시 에러 메시지 반환."""
+    return llm.unavailable_reason()
 
 # ─────────────────────────────────────────────────────────
 # 슬래시 명령
@@ -57,7 +40,6 @@ def _ensure_client_ready() -> Optional[str]:
 @app_commands.choices(
     model=[app_commands.Choice(name=m, value=m) for m in MODEL_CHOICES]
 )
-@app_commands.checks.cooldown(1, 6.0)  # 유저당 6초 쿨다운
 async def mz_gemini(
     interaction: discord.Interaction,
     prompt: str,
@@ -75,14 +57,13 @@ async def mz_gemini(
     model_name = model.value if isinstance(model, app_commands.Choice) else DEFAULT_MODEL
 
     try:
-        gm = genai.GenerativeModel(model_name)
         # 필요 시 system 지침을 앞에 붙여도 됨
-        resp = gm.generate_content(prompt)
-        text = (resp.text or "").strip() or "(응답이 비어 있습니다.)"
-
-        # 길이 분할 전송
-        for part in _chunks(text):
-            await interaction.followup.send(part, ephemeral=not public)
+        pieces = llm.stream(prompt, model=model_name, gid=interaction.guild_id)
+        text = await streaming.relay(
+            pieces, lambda content: interaction.followup.send(content, ephemeral=not public, wait=True)
+        )
+        if not text.strip():
+            await interaction.followup.send("(응답이 비어 있습니다.)", ephemeral=not public)
 
     except Exception as e:
         # 간단한 오류 보고
@@ -91,14 +72,9 @@ async def mz_gemini(
         # 서버 로그용(필요 시 로깅 시스템으로 교체)
         traceback.print_exc()
 
-# 공통 에러 처리(쿨다운 등)
+# 공통 에러 처리(호출 한도는 core.ratelimit 전역 검사에서 처리)
 @mz_gemini.error
 async def _gemini_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
-    if isinstance(error, app_commands.CommandOnCooldown):
-        return await interaction.response.send_message(
-            f"잠시 후 다시 시도해 주세요. 남은 시간: {error.retry_after:.1f}s",
-            ephemeral=True,
-        )
     # 이미 응답되었는지에 따라 분기
     try:
         await interaction.response.send_message("명령 실행 중 문제가 발생했습니다.", ephemeral=True)
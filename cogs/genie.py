@@ -3,17 +3,15 @@
 면진지니(/mz_genie): Gemini 기반 짧은 Q&A
 - 항상 공개 메시지로 응답
 - 퍼포먼스 안정화를 위한 타임아웃/예외 처리 포함
-- gemini.py가 있으면 그 설정을 재사용, 없으면 flash 모델로 바로 구동
+- 호출은 core.llm 게이트웨이(스레드 풀/동시성 제한/재시도/모델 재사용)를 거친다
+- 같은 질문(정규화 기준)은 core.answer_cache 에서 재사용(TTL/LRU, 동시 요청 1회 호출)
 """
 
-import os
-import asyncio
-import aiosqlite
 import discord
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
 
-DB_PATH = "economy.db"
+from core import answer_cache, guild_settings, llm
 
 # ── 시간/표시 유틸 ──────────────────────────────────────
 KST = timezone(timedelta(hours=9))
@@ -24,39 +22,15 @@ def footer_text(mode_name: str) -> str:
 # ── 모드명 조회(푸터용) ─────────────────────────────────
 async def get_mode_name(gid: int) -> str:
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            cur = await db.execute("SELECT mode_name FROM guild_settings WHERE guild_id=?", (gid,))
-            row = await cur.fetchone()
-            return (row[0] if row and row[0] else "일반 모드")
+        return (await guild_settings.get(gid)).mode_name
     except Exception:
         return "일반 모드"
 
-# ── Gemini 클라이언트 준비 ─────────────────────────────
-def _get_gemini_model():
-    """
-    1) 프로젝트의 gemini.py에 정의된 get_model()을 우선 사용
-    2) 없으면 로컬에서 바로 flash 모델 생성
-    """
-    try:
-        # 프로젝트 내 gemini.py 재사용
-        from gemini import get_model  # type: ignore
-        return get_model()  # 기본 모델은 gemini.py에서 flash로 설정되어 있음
-    except Exception:
-        # 직접 초기화
-        import google.generativeai as genai  # type: ignore
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or ""
-        if not api_key:
-            raise RuntimeError("GEMINI_API_KEY 환경변수가 필요합니다.")
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel("gemini-1.5-flash")
-
-# 전역 모델(프로세스 당 1회 초기화)
-_MODEL = None
-def _model():
-    global _MODEL
-    if _MODEL is None:
-        _MODEL = _get_gemini_model()
-    return _MODEL
+GENIE_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "max_output_tokens": 300,
+}
 
 # ── 슬래시 명령: 면진지니 ───────────────────────────────
 @app_commands.command(name="mz_genie", description="면진지니: Gemini로 짧은 답변 생성(항상 공개)")
@@ -83,20 +57,9 @@ async def mz_genie(interaction: discord.Interaction, question: str):
     instr = f"질문: {q}"
 
     try:
-        model = _model()
-        # 라이브러리 호환: generate_content는 동기 함수(google-generativeai)
-        # 블로킹을 줄이기 위해 스레드 실행
-        def _infer():
-            return model.generate_content(
-                [system, instr],
-                generation_config={
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "max_output_tokens": 300,
-                },
-            )
-        resp = await asyncio.to_thread(_infer)
-        text = (resp.text or "").strip()
+        text, source = await answer_cache.get_or_compute(
+            "genie", q, lambda: llm.generate([system, instr], gid=gid, config=GENIE_CONFIG)
+        )
         if not text:
             text = "응답을 구성하지 못했어요. 문장을 조금 더 구체적으로 적어 주세요."
 
@@ -107,7 +70,7 @@ async def mz_genie(interaction: discord.Interaction, question: str):
         if len(text) > 1024:
             text = text[:1010] + "…"
         em.add_field(name="답변", value=text, inline=False)
-        em.set_footer(text=footer_text(mode_name))
+        em.set_footer(text=footer_text(mode_name) + (" · 캐시" if source in ("memory", "db") else ""))
         await interaction.followup.send(embed=em)
 
     except Exception as e:
@@ -26,8 +26,11 @@ class HelpCog(commands.Cog):
             name="투자/게임",
             value=(
                 "• **/면진도박** — 승률 30~60%, 결과는 ±베팅액\n"
+                "• **/면진연속도박** — 여러 판을 한 번에, 손절/익절 설정\n"
                 "• **/면진주식** — 3초 후 결과, 0=전액\n"
                 "• **/면진코인** — 3초 후 결과, 0=전액\n"
+                "• **/면진매수** / **/면진매도** — 현재가로 사고팔아 보유, 매도 0=전량\n"
+                "• **/면진포트폴리오** — 보유 종목 평가액/손익\n"
                 "• **/면진파산** — 부채 복구 시도"
             ),
             inline=False
@@ -37,7 +40,8 @@ class HelpCog(commands.Cog):
             name="강화/전투",
             value=(
                 "• **/면진강화** — 무기 강화 **+30**(1분 무응답 자동 취소)\n"
-                "• **/면진맞짱** — 강화 무기로 PvP"
+                "• **/면진맞짱** — 강화 무기로 PvP\n"
+                "• **/면진토너먼트** — 참가자 모집 후 대진표로 한 번에 진행"
             ),
             inline=False
         )
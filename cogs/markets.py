@@ -1,10 +1,13 @@
 # cogs/markets.py
-import aiosqlite, secrets, json, time, asyncio, random
+# 등락률은 core.price_engine 의 공유 시세(주문 시점부터 HORIZON 틱 경로)로 정산, 엔진이 꺼져 있으면 범위 내 1회 추첨
+import secrets, random
 import discord
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
 
-DB_PATH = "economy.db"
+from core.balance import credit, debit_if_sufficient, get_balance
+from core import animation, guild_settings, market_catalog, price_engine
+from core.db import write
 
 REVEAL_DELAY = 3
 PROGRESS_TICKS = 6
@@ -16,43 +19,20 @@ KST = timezone(timedelta(hours=9))
 def now_kst() -> datetime: return datetime.now(KST)
 def won(n: int) -> str: return f"{n:,}₩"
 
-STOCKS = {
-    "성현전자": (-20.0, 20.0),
-    "배달의 승기": (-30.0, 30.0),
-    "대이식스": (-10.0, 10.0),
-    "재구식품": (-5.0, 5.0),
-}
-COINS = {
-    "건영코인": (-60.0, 120.0),
-    "면진코인": (-120.0, 240.0),
-    "승철코인": (-200.0, 400.0),
-}
-STOCK_CHOICES = [app_commands.Choice(name=k, value=k) for k in STOCKS.keys()]
-COIN_CHOICES  = [app_commands.Choice(name=k, value=k) for k in COINS.keys()]
+# 종목/코인 목록은 관리자 마켓 편집(market_items)을 core.market_catalog 캐시로 조회
+async def _choices(interaction: discord.Interaction, typ: str, current: str) -> list[app_commands.Choice[str]]:
+    found = await market_catalog.autocomplete(interaction.guild_id, typ, current)
+    return [app_commands.Choice(name=f"{it.name} ({it.lo:+g}% ~ {it.hi:+g}%)"[:100], value=it.name) for it in found]
+
+async def stock_autocomplete(interaction: discord.Interaction, current: str):
+    return await _choices(interaction, "stock", current)
+
+async def coin_autocomplete(interaction: discord.Interaction, current: str):
+    return await _choices(interaction, "coin", current)
 
 async def get_mode_and_force(gid: int):
-    async with aiosqlite.connect(DB_PATH) as db:
-        cur = await db.execute("SELECT COALESCE(mode_name,'일반 모드'), COALESCE(force_mode,'off'), COALESCE(force_target_user_id,0) FROM guild_settings WHERE guild_id=?", (gid,))
-        row = await cur.fetchone()
-        if row: return row[0], row[1], int(row[2] or 0)
-        await db.execute("INSERT OR IGNORE INTO guild_settings(guild_id) VALUES(?)", (gid,))
-        await db.commit()
-        return "일반 모드", "off", 0
-
-async def get_user(db, gid: int, uid: int):
-    cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-    row = await cur.fetchone()
-    if row:
-        return {"balance": row[0]}
-    await db.execute("INSERT INTO users(guild_id,user_id,balance) VALUES(?,?,?)", (gid, uid, 0))
-    await db.commit()
-    return {"balance": 0}
-
-async def write_ledger(db, gid, uid, kind, amount, bal_after, meta=None):
-    await db.execute(
-        "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)",
-        (gid, uid, kind, amount, bal_after, json.dumps(meta or {}), int(time.time()))
-    )
+    s = await guild_settings.get(gid)
+    return s.mode_name, s.force_mode, s.force_uid
 
 def footer_text(bal: int, mode_name: str) -> str:
     return f"현재 잔액 {won(bal)} · 모드 {mode_name} · {now_kst().strftime('%H:%M')}"
@@ -73,9 +53,29 @@ def make_previews(lo: float, hi: float, final_value: float, ticks: int) -> list[
     seq[-1] = round(final_value, 1)
     return seq
 
+def path_previews(path: tuple, final: float, ticks: int) -> list[float]:
+    """가격 엔진 경로(진입 후 틱별 누적 변화)를 연출 프레임 수에 맞춰 보간, 마지막 프레임은 정산값"""
+    pts = (0.0,) + tuple(path)
+    seq = []
+    for i in range(1, ticks + 1):
+        x = i / ticks * (len(pts) - 1)
+        k = min(int(x), len(pts) - 2)
+        seq.append(round(pts[k] + (pts[k + 1] - pts[k]) * (x - k), 1))
+    seq[-1] = round(final, 1)
+    return seq
+
+def draw_change(gid: int, typ: str, symbol: str, lo: float, hi: float) -> tuple[float, list[float]]:
+    """(정산 등락률, 연출 프레임) — 가격 엔진 시세 기준, 엔진이 없으면 종목 범위에서 1회 추첨"""
+    q = price_engine.quote(gid, typ, symbol)
+    if q is not None:
+        return q.final, path_previews(q.path, q.final, PROGRESS_TICKS)
+    final = round(random.uniform(lo, hi), 1)
+    return final, make_previews(lo, hi, final, PROGRESS_TICKS)
+
 async def animate_preview_embed(interaction: discord.Interaction, title: str,
                                 header_fields: list[tuple[str, str]],
                                 preview_label: str, previews: list[float]):
+    frames = []
     for i, v in enumerate(previews, start=1):
         p = i / len(previews)
         em = discord.Embed(title=title, color=0xF1C40F)
@@ -87,11 +87,16 @@ async def animate_preview_embed(interaction: discord.Interaction, title: str,
             em.add_field(name=name, value=value, inline=True)
         em.add_field(name=preview_label, value=f"{v:+.1f}%", inline=True)
         em.set_footer(text=f"오늘 {now_kst().strftime('%H:%M')} · {int(p*100)}%")
+        frames.append(em)
+
+    async def show(em: discord.Embed):
         try:
             await interaction.edit_original_response(embed=em)
         except discord.NotFound:
             await interaction.followup.send(embed=em)
-        await asyncio.sleep(REVEAL_DELAY / PROGRESS_TICKS)
+
+    mode = (await guild_settings.get(interaction.guild.id)).anim_mode
+    await animation.play(interaction.token, show, frames, REVEAL_DELAY, mode)
 
 async def get_mode_name(gid: int) -> str:
     name, _, _ = await get_mode_and_force(gid)
@@ -115,54 +120,51 @@ def forced_final_change(lo: float, hi: float, force_to_win: bool) -> float:
 # ── /면진주식 ────────────────────────────────────────────
 @app_commands.command(name="mz_stock", description="가상 주식 투자(0=전액, 애니메이션 공개)")
 @app_commands.describe(symbol="종목", amount=f"베팅 금액(정수, 0=전액, 최소 {MIN_STOCK_BET:,}₩)")
-@app_commands.choices(symbol=STOCK_CHOICES)
+@app_commands.autocomplete(symbol=stock_autocomplete)
 async def mz_stock(interaction: discord.Interaction, symbol: str, amount: int):
     gid, uid = interaction.guild.id, interaction.user.id
-    if symbol not in STOCKS:
+    item = await market_catalog.lookup(gid, "stock", symbol)
+    if item is None:
         return await interaction.response.send_message("알 수 없는 종목입니다.", ephemeral=False)
     if amount < 0:
         return await interaction.response.send_message("베팅 금액은 음수가 될 수 없습니다.", ephemeral=False)
 
-    lo, hi = STOCKS[symbol]
+    symbol, lo, hi = item
     min_bet = MIN_STOCK_BET
 
-    async with aiosqlite.connect(DB_PATH) as db:
+    all_in = (amount == 0)
+    new_bal = None
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        u = await get_user(db, gid, uid)
-        bal = u["balance"]
-        all_in = False
-        if amount == 0:
-            amount = bal
-            all_in = True
-        if amount < min_bet:
-            await db.execute("ROLLBACK")
-            return await send_min_bet_violation(interaction, "주식", min_bet, amount)
-        if amount > bal:
+        if all_in:
+            amount = await get_balance(db, gid, uid)
+        if amount >= min_bet:
+            new_bal = await debit_if_sufficient(db, gid, uid, amount, "stock_place", {"symbol": symbol, "amount": amount, "all_in": all_in})
+        if new_bal is None:
+            bal = await get_balance(db, gid, uid)
             await db.execute("ROLLBACK")
-            return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=False)
-        new_bal = bal - amount
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, "stock_place", -amount, new_bal, {"symbol": symbol, "amount": amount, "all_in": all_in})
-        await db.commit()
+        else:
+            await db.commit()
+    if amount < min_bet:
+        return await send_min_bet_violation(interaction, "주식", min_bet, amount)
+    if new_bal is None:
+        return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=False)
 
     mode_name, force_mode, force_uid = await get_mode_and_force(gid)
     if force_mode in ("success","fail") and (force_uid == 0 or force_uid == uid):
         final = forced_final_change(lo, hi, force_to_win=(force_mode=="success"))
+        previews = make_previews(lo, hi, final, PROGRESS_TICKS)
     else:
-        final = round(random.uniform(lo, hi), 1)
+        final, previews = draw_change(gid, "stock", symbol, lo, hi)
 
-    previews = make_previews(lo, hi, final, PROGRESS_TICKS)
     header = [("종목", symbol), ("베팅", won(amount))]
     await interaction.response.send_message(embed=discord.Embed(title="주문 접수 — 주식", color=0x95a5a6))
     await animate_preview_embed(interaction, "주식 체결 중…", header, "예상 등락", previews)
 
     delta = int(round(amount * (final / 100.0)))
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        u = await get_user(db, gid, uid)
-        new_bal = u["balance"] + delta
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, "stock_settle", delta, new_bal, {"symbol": symbol, "pct": final, "amount": amount})
+        new_bal = await credit(db, gid, uid, delta, "stock_settle", {"symbol": symbol, "pct": final, "amount": amount})
         await db.commit()
 
     title = "주식 결과"
@@ -181,54 +183,51 @@ async def mz_stock(interaction: discord.Interaction, symbol: str, amount: int):
 # ── /면진코인 ────────────────────────────────────────────
 @app_commands.command(name="mz_coin", description="가상 코인 러시(0=전액, 애니메이션 공개)")
 @app_commands.describe(symbol="코인", amount=f"베팅 금액(정수, 0=전액, 최소 {MIN_COIN_BET:,}₩)")
-@app_commands.choices(symbol=COIN_CHOICES)
+@app_commands.autocomplete(symbol=coin_autocomplete)
 async def mz_coin(interaction: discord.Interaction, symbol: str, amount: int):
     gid, uid = interaction.guild.id, interaction.user.id
-    if symbol not in COINS:
+    item = await market_catalog.lookup(gid, "coin", symbol)
+    if item is None:
         return await interaction.response.send_message("알 수 없는 코인입니다.", ephemeral=False)
     if amount < 0:
         return await interaction.response.send_message("베팅 금액은 음수가 될 수 없습니다.", ephemeral=False)
 
-    lo, hi = COINS[symbol]
+    symbol, lo, hi = item
     min_bet = MIN_COIN_BET
 
-    async with aiosqlite.connect(DB_PATH) as db:
+    all_in = (amount == 0)
+    new_bal = None
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        u = await get_user(db, gid, uid)
-        bal = u["balance"]
-        all_in = False
-        if amount == 0:
-            amount = bal
-            all_in = True
-        if amount < min_bet:
-            await db.execute("ROLLBACK")
-            return await send_min_bet_violation(interaction, "코인", min_bet, amount)
-        if amount > bal:
+        if all_in:
+            amount = await get_balance(db, gid, uid)
+        if amount >= min_bet:
+            new_bal = await debit_if_sufficient(db, gid, uid, amount, "coin_place", {"symbol": symbol, "amount": amount, "all_in": all_in})
+        if new_bal is None:
+            bal = await get_balance(db, gid, uid)
             await db.execute("ROLLBACK")
-            return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=False)
-        new_bal = bal - amount
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, "coin_place", -amount, new_bal, {"symbol": symbol, "amount": amount, "all_in": all_in})
-        await db.commit()
+        else:
+            await db.commit()
+    if amount < min_bet:
+        return await send_min_bet_violation(interaction, "코인", min_bet, amount)
+    if new_bal is None:
+        return await interaction.response.send_message(f"잔액 부족: {won(bal)}", ephemeral=False)
 
     mode_name, force_mode, force_uid = await get_mode_and_force(gid)
     if force_mode in ("success","fail") and (force_uid == 0 or force_uid == uid):
         final = forced_final_change(lo, hi, force_to_win=(force_mode=="success"))
+        previews = make_previews(lo, hi, final, PROGRESS_TICKS)
     else:
-        final = round(random.uniform(lo, hi), 1)
+        final, previews = draw_change(gid, "coin", symbol, lo, hi)
 
-    previews = make_previews(lo, hi, final, PROGRESS_TICKS)
     header = [("코인", symbol), ("베팅", won(amount))]
     await interaction.response.send_message(embed=discord.Embed(title="주문 접수 — 코인", color=0x95a5a6))
     await animate_preview_embed(interaction, "코인 체결 중…", header, "예상 등락", previews)
 
     delta = int(round(amount * (final / 100.0)))
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        u = await get_user(db, gid, uid)
-        new_bal = u["balance"] + delta
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, "coin_settle", delta, new_bal, {"symbol": symbol, "pct": final, "amount": amount})
+        new_bal = await credit(db, gid, uid, delta, "coin_settle", {"symbol": symbol, "pct": final, "amount": amount})
         await db.commit()
 
     title = "코인 결과"
@@ -249,11 +248,9 @@ async def mz_coin(interaction: discord.Interaction, symbol: str, amount: int):
 async def mz_bankruptcy(interaction: discord.Interaction):
     gid, uid = interaction.guild.id, interaction.user.id
     mode_name, _, _ = await get_mode_and_force(gid)
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         await db.execute("BEGIN IMMEDIATE")
-        cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
-        r = await cur.fetchone()
-        bal = r[0] if r else 0
+        bal = await get_balance(db, gid, uid)
         if bal >= 0:
             await db.execute("ROLLBACK")
             em = discord.Embed(title="면진파산 조건 불충족", description="잔액이 음수일 때만 신청할 수 있습니다.", color=0xf1c40f)
@@ -267,9 +264,7 @@ async def mz_bankruptcy(interaction: discord.Interaction):
         else:               recover_ratio = 0.5
 
         recovered = int(round(abs(bal) * recover_ratio))
-        new_bal = bal + recovered
-        await db.execute("UPDATE users SET balance=? WHERE guild_id=? AND user_id=?", (new_bal, gid, uid))
-        await write_ledger(db, gid, uid, "bankruptcy", recovered, new_bal, {"ratio": recover_ratio})
+        new_bal = await credit(db, gid, uid, recovered, "bankruptcy", {"ratio": recover_ratio})
         await db.commit()
 
     result = "전액 복구" if recover_ratio == 1.0 else ("부분 복구" if recover_ratio == 0.5 else "복구 실패")
@@ -0,0 +1,183 @@
+# cogs/portfolio.py
+# Slash commands:
+#   /면진매수 (mz_buy)        : 주식/코인을 현재가로 매수해 보유(포지션 유지)
+#   /면진매도 (mz_sell)       : 보유 종목을 현재가로 매도(0=전량)
+#   /면진포트폴리오 (mz_portfolio): 보유 종목 평가액/손익
+# 현재가는 core.price_engine 공유 시세 — 엔진이 꺼져 있으면 매수/매도 불가
+# 삭제/비활성 종목은 매도 시 마지막 기록 시세(없으면 원가)로 청산
+from datetime import datetime, timezone, timedelta
+
+import discord
+from discord import app_commands
+
+from core import market_catalog, portfolio, price_engine
+from core.db import write
+
+MIN_BUY = 1_000
+TYPE_LABELS = {"stock": "주식", "coin": "코인"}
+DELIST_NOTES = {
+    portfolio.DELIST_LAST: "상장 폐지 종목 — 마지막 기록 시세로 청산했습니다.",
+    portfolio.DELIST_COST: "상장 폐지 종목 — 시세 기록이 없어 남은 원가로 청산했습니다.",
+}
+
+KST = timezone(timedelta(hours=9))
+def won(n: int) -> str: return f"{n:,}₩"
+
+def signed(n: int) -> str:
+    return f"{'+' if n >= 0 else ''}{won(n)}"
+
+def parse_symbol(value: str) -> tuple[str, str]:
+    """자동완성 값 "stock:이름" → ("stock", "이름") / 접두어가 없으면 ("", 원문)"""
+    typ, sep, name = (value or "").partition(":")
+    if sep and typ in market_catalog.TYPES:
+        return typ, name
+    return "", value or ""
+
+async def resolve(gid: int, value: str):
+    """(type, Item) / 없거나 주식·코인 양쪽에 같은 이름이 있으면 None"""
+    typ, name = parse_symbol(value)
+    if typ:
+        item = await market_catalog.lookup(gid, typ, name)
+        return (typ, item) if item else None
+    found = [(t, it) for t in market_catalog.TYPES if (it := await market_catalog.lookup(gid, t, name))]
+    return found[0] if len(found) == 1 else None
+
+def choice(typ: str, name: str, extra: str = "") -> app_commands.Choice[str]:
+    return app_commands.Choice(name=f"[{TYPE_LABELS[typ]}] {name}{extra}"[:100], value=f"{typ}:{name}")
+
+async def buy_autocomplete(interaction: discord.Interaction, current: str):
+    gid = interaction.guild_id
+    out = []
+    for typ in market_catalog.TYPES:
+        for it in await market_catalog.autocomplete(gid, typ, current):
+            px = price_engine.price(gid, typ, it.name)
+            out.append(choice(typ, it.name, f" · {won(int(px))}" if px else ""))
+    return out[:market_catalog.MAX_CHOICES]
+
+async def sell_autocomplete(interaction: discord.Interaction, current: str):
+    key = "".join((current or "").split()).casefold()
+    rows = await portfolio.holdings(interaction.guild_id, interaction.user.id)
+    return [
+        choice(h.type, h.name, f" · {won(h.value)}" if h.value is not None else "")
+        for h in rows if key in "".join(h.name.split()).casefold()
+    ][:market_catalog.MAX_CHOICES]
+
+def footer(em: discord.Embed, bal: int):
+    em.set_footer(text=f"현재 잔액 {won(bal)} · {datetime.now(KST).strftime('%H:%M')}")
+
+# ── /면진매수 ────────────────────────────────────────────
+@app_commands.command(name="mz_buy", description="주식/코인을 현재가로 매수해 보유")
+@app_commands.describe(symbol="종목(주식/코인)", amount=f"매수 금액(정수, 최소 {MIN_BUY:,}₩)")
+@app_commands.autocomplete(symbol=buy_autocomplete)
+async def mz_buy(interaction: discord.Interaction, symbol: str, amount: int):
+    gid, uid = interaction.guild.id, interaction.user.id
+    hit = await resolve(gid, symbol)
+    if hit is None:
+        return await interaction.response.send_message("알 수 없는 종목입니다.", ephemeral=True)
+    if amount < MIN_BUY:
+        return await interaction.response.send_message(f"최소 매수 금액은 {won(MIN_BUY)}입니다.", ephemeral=True)
+    typ, item = hit
+    px = price_engine.price(gid, typ, item.name)
+    if px is None:
+        return await interaction.response.send_message("시세를 불러올 수 없습니다. 잠시 후 다시 시도해 주세요.", ephemeral=True)
+
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        res = await portfolio.open_position(db, gid, uid, typ, item.name, amount, px)
+        if res is None:
+            await db.execute("ROLLBACK")
+        else:
+            await db.commit()
+    if res is None:
+        return await interaction.response.send_message("잔액이 부족합니다.", ephemeral=True)
+
+    qty, bal = res
+    em = discord.Embed(title=f"매수 체결 — {TYPE_LABELS[typ]}", color=0x3498db)
+    em.add_field(name="종목", value=item.name, inline=True)
+    em.add_field(name="체결가", value=won(int(px)), inline=True)
+    em.add_field(name="수량", value=f"{qty:,.4f}", inline=True)
+    em.add_field(name="매수 금액", value=won(amount), inline=True)
+    footer(em, bal)
+    await interaction.response.send_message(embed=em)
+
+# ── /면진매도 ────────────────────────────────────────────
+@app_commands.command(name="mz_sell", description="보유 종목을 현재가로 매도(0=전량)")
+@app_commands.describe(symbol="보유 종목", amount="매도 금액(정수, 0=전량)")
+@app_commands.autocomplete(symbol=sell_autocomplete)
+async def mz_sell(interaction: discord.Interaction, symbol: str, amount: int = 0):
+    gid, uid = interaction.guild.id, interaction.user.id
+    if amount < 0:
+        return await interaction.response.send_message("매도 금액은 음수가 될 수 없습니다.", ephemeral=True)
+    typ, name = parse_symbol(symbol)
+    if not typ:
+        hit = await resolve(gid, symbol)
+        if hit is not None:
+            typ, name = hit[0], hit[1].name
+        else:
+            # 카탈로그에서 빠진 종목은 보유 목록에서 찾음
+            held = [(h.type, h.name) for h in await portfolio.holdings(gid, uid) if h.name == symbol]
+            if len(held) != 1:
+                return await interaction.response.send_message("알 수 없는 종목입니다.", ephemeral=True)
+            typ, name = held[0]
+    px, delisted = price_engine.price(gid, typ, name), None
+    if px is None and price_engine.running() and await market_catalog.lookup(gid, typ, name) is None:
+        hit = await portfolio.delisted_price(gid, uid, typ, name)
+        if hit is None:
+            return await interaction.response.send_message("보유하지 않은 종목입니다.", ephemeral=True)
+        px, delisted = hit
+    if px is None:
+        return await interaction.response.send_message("시세를 불러올 수 없습니다. 잠시 후 다시 시도해 주세요.", ephemeral=True)
+
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        res = await portfolio.close_position(db, gid, uid, typ, name, amount, px)
+        if res is None:
+            await db.execute("ROLLBACK")
+        else:
+            await db.commit()
+    if res is None:
+        return await interaction.response.send_message("보유하지 않은 종목입니다.", ephemeral=True)
+
+    qty, proceeds, pnl, bal = res
+    em = discord.Embed(title=f"매도 체결 — {TYPE_LABELS[typ]}", color=0x2ecc71 if pnl >= 0 else 0xe74c3c)
+    em.add_field(name="종목", value=name, inline=True)
+    em.add_field(name="체결가", value=won(int(px)), inline=True)
+    em.add_field(name="수량", value=f"{qty:,.4f}", inline=True)
+    em.add_field(name="매도 대금", value=won(proceeds), inline=True)
+    em.add_field(name="실현 손익", value=signed(pnl), inline=True)
+    if delisted:
+        em.description = DELIST_NOTES[delisted]
+    footer(em, bal)
+    await interaction.response.send_message(embed=em)
+
+# ── /면진포트폴리오 ──────────────────────────────────────
+@app_commands.command(name="mz_portfolio", description="보유 종목 평가액/손익")
+@app_commands.describe(user="대상(미선택 시 본인)")
+async def mz_portfolio(interaction: discord.Interaction, user: discord.Member | None = None):
+    member = user or interaction.user
+    rows = await portfolio.holdings(interaction.guild.id, member.id)
+
+    em = discord.Embed(title=f"{member.display_name}님의 포트폴리오", color=0x3498db if rows else 0x95a5a6)
+    if not rows:
+        em.description = "보유 종목이 없습니다."
+        return await interaction.response.send_message(embed=em)
+
+    lines, total, cost = [], 0, 0
+    for h in rows:
+        if h.value is None:
+            lines.append(f"[{TYPE_LABELS[h.type]}] {h.name} · {h.qty:,.4f}주 · 시세 없음 (원가 {won(h.cost)})")
+            continue
+        total, cost = total + h.value, cost + h.cost
+        pct = (h.value / h.cost - 1) * 100 if h.cost else 0.0
+        lines.append(f"[{TYPE_LABELS[h.type]}] {h.name} · {h.qty:,.4f}주 × {won(int(h.price))}\n"
+                     f"평가 {won(h.value)} ({signed(h.value - h.cost)}, {pct:+.1f}%)")
+    em.description = "\n".join(lines)[:4000]
+    em.add_field(name="평가액 합계", value=won(total), inline=True)
+    em.add_field(name="평가 손익", value=signed(total - cost), inline=True)
+    em.set_footer(text=f"시세 기준 {datetime.now(KST).strftime('%H:%M:%S')}")
+    await interaction.response.send_message(embed=em)
+
+async def setup(bot: discord.Client):
+    bot.tree.add_command(mz_buy)
+    bot.tree.add_command(mz_sell)
+    bot.tree.add_command(mz_portfolio)
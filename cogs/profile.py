@@ -1,8 +1,13 @@
-import aiosqlite
+import os
+
 import discord
 from discord import app_commands
 
-DB_PATH = "economy.db"
+from core import duel_stats, leaderboard
+from core.db import snapshot
+
+# 1이면 순위표 등수를 SQL(get_rank)로 교차 검증 — 불일치 시 로그 후 재적재
+VERIFY_RANK = os.getenv("VERIFY_RANK", "0") == "1"
 
 async def get_user_balance(db, gid: int, uid: int) -> int:
     cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
@@ -10,6 +15,7 @@ async def get_user_balance(db, gid: int, uid: int) -> int:
     return row[0] if row else 0
 
 async def get_rank(db, gid: int, uid: int) -> tuple[int, int]:
+    """SQL 기준 등수(검증용)"""
     bal = await get_user_balance(db, gid, uid)
     cur = await db.execute("SELECT COUNT(*) FROM users WHERE guild_id=? AND balance>?", (gid, bal))
     higher = (await cur.fetchone())[0]
@@ -22,12 +28,10 @@ async def get_weapon(db, gid: int, uid: int) -> int:
     row = await cur.fetchone()
     return row[0] if row else 0
 
-async def get_duel_record(db, gid: int, uid: int) -> tuple[int, int]:
-    cur = await db.execute("SELECT COUNT(*) FROM ledger WHERE guild_id=? AND user_id=? AND kind='duel_win'", (gid, uid))
-    wins = (await cur.fetchone())[0]
-    cur = await db.execute("SELECT COUNT(*) FROM ledger WHERE guild_id=? AND user_id=? AND kind='duel_lose'", (gid, uid))
-    loses = (await cur.fetchone())[0]
-    return wins, loses
+def streak_text(streak: int) -> str:
+    if streak > 0: return f"{streak}연승 중"
+    if streak < 0: return f"{-streak}연패 중"
+    return "-"
 
 def weapon_name(lv: int) -> str:
     if lv <= 0: return "맨손"
@@ -45,13 +49,19 @@ async def mz_profile(interaction: discord.Interaction, user: discord.Member | No
     member = user or interaction.user
     gid, uid = interaction.guild.id, member.id
 
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("BEGIN IMMEDIATE")
-        bal = await get_user_balance(db, gid, uid)
-        rank, total = await get_rank(db, gid, uid)
-        lv = await get_weapon(db, gid, uid)
-        w, l = await get_duel_record(db, gid, uid)
-        await db.commit()
+    board = await leaderboard.get_board(gid)
+    bal, lv = board.bal.get(uid, 0), board.lv.get(uid, 0)
+    rank, total = board.rank(bal), len(board)
+
+    async with snapshot() as db:
+        if uid not in board.bal:
+            lv = await get_weapon(db, gid, uid)
+        st = await duel_stats.get(db, gid, uid)
+        if VERIFY_RANK and (rank, total) != (sql := await get_rank(db, gid, uid)):
+            print(f"[leaderboard] rank mismatch g={gid} u={uid}: {(rank, total)} != {sql}")
+            leaderboard.invalidate(gid)
+            rank, total = sql
+            bal = await get_user_balance(db, gid, uid)
 
     em = discord.Embed(title="프로필", color=0x3498db)
     try:
@@ -61,7 +71,9 @@ async def mz_profile(interaction: discord.Interaction, user: discord.Member | No
     em.add_field(name="잔액", value=f"{bal:,}₩", inline=True)
     em.add_field(name="서버 등수", value=f"{rank}위 / {total}명", inline=True)
     em.add_field(name="무기", value=f"LV{lv} 「{weapon_name(lv)}」", inline=False)
-    em.add_field(name="맞짱 전적", value=f"{w}승 {l}패", inline=True)
+    em.add_field(name="맞짱 전적", value=f"{st['wins']}승 {st['losses']}패", inline=True)
+    em.add_field(name="연승/연패", value=f"{streak_text(st['streak'])} (최고 {st['best_streak']}연승)", inline=True)
+    em.add_field(name="누적 베팅", value=f"{st['total_staked']:,}₩", inline=True)
     await interaction.response.send_message(embed=em, ephemeral=False)
 
 async def setup(bot: discord.Client):
@@ -3,19 +3,19 @@
 # - spread: 1장(조언) 또는 3장(과거/현재/미래)
 # - question: 질문(선택)
 # - public: 채널 공개 여부 (기본 공개=True)
+# - 해석: 길드 설정 tarot_mode=ai 이면 Gemini 스트리밍(실패 시 core.tarot_engine 오프라인 해석으로 대체),
+#         fast 이면 처음부터 오프라인 해석(네트워크 없음, 즉시)
 
-import os, secrets, asyncio
+import secrets
 from typing import List, Tuple, Optional
 
 import discord
 from discord import app_commands
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted, GoogleAPIError
 
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+from core import guild_settings, llm, streaming, tarot_engine
+
 # 안정성/속도 우선
 PRIMARY_MODEL = "gemini-1.5-flash"
-FALLBACK_MODEL = "gemini-1.5-flash"  # 필요 시 pro↔flash 폴백 구조 유지
 
 # ── 덱 구성 ──────────────────────────────────────────────
 MAJOR = [
@@ -42,17 +42,6 @@ def draw_cards(n: int) -> List[Tuple[str, bool]]:
     picks = deck[:n]
     return [(c, rng.choice([False, True])) for c in picks]
 
-def chunks(s: str, limit: int = 1900):
-    for i in range(0, len(s), limit):
-        yield s[i:i+limit]
-
-SEM = asyncio.Semaphore(2)  # API 동시 호출 2개로 제한(폭주 완화)
-
-async def _gemini_call(prompt: str, model_name: str) -> str:
-    model = genai.GenerativeModel(model_name)
-    resp = model.generate_content(prompt)
-    return (resp.text or "").strip()
-
 def _error_embed(title: str, desc: str) -> discord.Embed:
     em = discord.Embed(title=title, description=desc, color=0xe67e22)
     em.set_footer(text="참고: Gemini API rate limits / troubleshooting")
@@ -72,7 +61,6 @@ SpreadChoice = app_commands.Choice[str]
         app_commands.Choice(name="3장: 과거/현재/미래", value="3"),
     ]
 )
-@app_commands.checks.cooldown(1, 8.0)  # 유저당 8초 쿨다운
 async def mz_tarot(
     interaction: discord.Interaction,
     spread: SpreadChoice,
@@ -112,6 +100,9 @@ async def mz_tarot(
         )
     prompt = f"{system}\n\n{instr}"
 
+    tarot_mode = (await guild_settings.get(interaction.guild_id)).tarot_mode
+    fast = tarot_mode == "fast" or llm.unavailable_reason() is not None
+
     # 카드 정보 임베드
     em = discord.Embed(title="타로 리딩 결과", color=0x9b59b6)
     em.add_field(name="스프레드", value=("1장 조언" if n == 1 else "3장(과거/현재/미래)"), inline=True)
@@ -121,45 +112,43 @@ async def mz_tarot(
         em.set_author(name=interaction.user.display_name, icon_url=interaction.user.display_avatar.url)
     except Exception:
         pass
+    if fast:
+        em.set_footer(text="빠른 해석(오프라인)")
 
-    # 호출부: 429 처리, 재시도, 폴백
-    async with SEM:
-        try:
-            text = await _gemini_call(prompt, PRIMARY_MODEL)
-        except ResourceExhausted as e:
-            retry_seconds = getattr(getattr(e, "retry_delay", None), "seconds", None)
-            wait = min(int(retry_seconds or 20), 60)  # 상호작용 제한 내에서만 대기
-            note = f"사용량 한도에 도달하여 {wait}초 대기 후 재시도합니다."
-            await interaction.followup.send(embed=_error_embed("잠시 대기 중", note), ephemeral=not public)
-            await asyncio.sleep(wait)
-            try:
-                text = await _gemini_call(prompt, PRIMARY_MODEL)
-            except ResourceExhausted:
-                if FALLBACK_MODEL != PRIMARY_MODEL:
-                    try:
-                        text = await _gemini_call(prompt, FALLBACK_MODEL)
-                    except Exception:
-                        msg = "현재 Gemini 쿼터가 가득 찼습니다. 잠시 후 다시 시도해 주세요."
-                        await interaction.followup.send(embed=_error_embed("요청 한도 초과(429)", msg), ephemeral=not public)
-                        return
-                else:
-                    msg = "현재 Gemini 쿼터가 가득 찼습니다. 잠시 후 다시 시도해 주세요."
-                    await interaction.followup.send(embed=_error_embed("요청 한도 초과(429)", msg), ephemeral=not public)
-                    return
-        except GoogleAPIError:
-            msg = "외부 서비스 응답이 원활하지 않습니다. 잠시 후 다시 시도해 주세요."
-            await interaction.followup.send(embed=_error_embed("서비스 지연", msg), ephemeral=not public)
-            return
-        except Exception:
-            msg = "처리 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요."
-            await interaction.followup.send(embed=_error_embed("처리 실패", msg), ephemeral=not public)
+    # 카드 임베드는 생성 전에 먼저 공개 → 해석은 스트리밍으로 이어 붙임
+    await interaction.followup.send(embed=em, ephemeral=not public)
+    if fast:
+        await interaction.followup.send(tarot_engine.interpret(picks, positions, question), ephemeral=not public)
+        return
+
+    # 호출부: 동시성 제한은 게이트웨이 담당, 여기서는 폴백만(오프라인 해석이 있으므로 백오프 재시도는 생략)
+    # 조각 사이 지연(LLMTimeout)은 일부가 이미 전송된 뒤 발생 → 그때는 오프라인 해석 대신 중단 안내만
+    gid = interaction.guild_id
+    sent: list[discord.WebhookMessage] = []
+
+    async def send(content: str):
+        msg = await interaction.followup.send(content, ephemeral=not public, wait=True)
+        sent.append(msg)
+        return msg
+
+    try:
+        text = await streaming.relay(llm.stream(prompt, model=PRIMARY_MODEL, gid=gid, max_retry=0), send)
+    except llm.LLMError as e:
+        # 429/지연/서비스 오류 → 오프라인 해석으로 대체(실패 응답 대신 즉시 결과)
+        why = "요청 한도 초과로" if isinstance(e, llm.LLMRateLimited) else "응답 지연으로"
+        if sent:
+            await interaction.followup.send(f"-# Gemini {why} 해석이 중간에 끊겼습니다.", ephemeral=not public)
             return
+        text = tarot_engine.interpret(picks, positions, question)
+        await interaction.followup.send(f"-# Gemini {why} 빠른 해석을 제공합니다.\n{text}", ephemeral=not public)
+        return
+    except Exception:
+        msg = "처리 중 문제가 발생했습니다. 잠시 후 다시 시도해 주세요."
+        await interaction.followup.send(embed=_error_embed("처리 실패", msg), ephemeral=not public)
+        return
 
-    await interaction.followup.send(embed=em, ephemeral=not public)
-    if not text:
-        text = "결과가 없습니다."
-    for part in chunks(text):
-        await interaction.followup.send(part, ephemeral=not public)
+    if not text.strip():
+        await interaction.followup.send(tarot_engine.interpret(picks, positions, question), ephemeral=not public)
 
 # 에러 핸들러: 무한로딩 방지
 @mz_tarot.error
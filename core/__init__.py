@@ -0,0 +1 @@
+# core: 코그들이 공유하는 서비스(DB 풀 등)
@@ -0,0 +1,86 @@
+# core/animation.py
+"""
+진행 애니메이션(임베드 편집) 스케줄러
+- 프레임 i 는 t0 + i·(duration/n) 에 표시, play()는 t0 + duration(공개 시각)에 반환
+  → 호출자가 곧바로 보내는 결과 임베드(최종 프레임)는 지연 없이 목표 시각에 도착
+- 메시지(키)별 최소 편집 간격 + 전체 편집 토큰 버킷으로 Discord 편집 버킷을 넘지 않게 조절
+- 일정보다 늦었거나 버킷이 비어 다음 슬롯 전에 보낼 수 없는 진행 프레임은 건너뜀
+- 결과 편집 몫의 토큰은 공개 시각에 미리 차감(진행 프레임이 결과 편집을 밀어내지 않도록)
+- 편집 지연이 길면(라이브러리 내부 429 대기 등) 그만큼 해당 메시지의 다음 편집을 늦춤
+- mode(길드 설정 anim_mode): full=전체 프레임 / single="굴리는 중…" 1프레임 후 SINGLE_HOLD 초 / instant=연출 없음
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Sequence
+
+MIN_EDIT_INTERVAL = 0.35    # 같은 메시지 편집 최소 간격(초)
+GLOBAL_RATE = 40.0          # 전체 편집 허용량(회/초) — Discord 전역 한도(50/s)보다 여유 있게
+GLOBAL_BURST = 40
+_PRUNE_AFTER = 60.0
+SINGLE_HOLD = 0.8           # single 모드에서 한 프레임을 보여 주는 시간(초)
+
+MODES = ("full", "single", "instant")
+
+_next_ok: dict[Hashable, float] = {}    # 메시지 키 → 다음 편집 가능 시각(loop.time)
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate, self.burst = rate, burst
+        self.tokens = float(burst)
+        self.stamp = 0.0
+
+    def _refill(self, now: float):
+        if self.stamp:
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, now: float) -> float:
+        """토큰 1개를 얻기까지 남은 시간(0이면 즉시 가능)"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+_global = _TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+
+def _prune(now: float):
+    if len(_next_ok) > 1024:
+        for k in [k for k, t in _next_ok.items() if now - t > _PRUNE_AFTER]:
+            _next_ok.pop(k, None)
+
+async def play(key: Hashable, edit: Callable[[Any], Awaitable[Any]], frames: Sequence[Any], duration: float,
+               mode: str = "full"):
+    """
+    frames 를 duration 동안 균등 간격으로 edit(frame) 한다.
+    key: 편집 대상 메시지 식별자(interaction.token / message.id 등)
+    """
+    if mode == "instant" or not frames:
+        return
+    if mode == "single":
+        frames, duration = frames[:1], min(duration, SINGLE_HOLD)
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    n = len(frames)
+    step = duration / n if n else 0.0
+
+    for i, frame in enumerate(frames):
+        slot, next_slot = t0 + i * step, t0 + (i + 1) * step
+        now = loop.time()
+        ready = max(slot, _next_ok.get(key, 0.0), now + _global.wait_time(now))
+        if ready >= next_slot:
+            continue    # 다음 슬롯(또는 공개 시각) 전에 보낼 수 없음 → 이 프레임은 건너뜀
+        if ready > now:
+            await asyncio.sleep(ready - now)
+        start = loop.time()
+        _global.take(start)
+        await edit(frame)
+        end = loop.time()
+        _next_ok[key] = end + max(MIN_EDIT_INTERVAL, end - start)
+        _prune(end)
+
+    remain = t0 + duration - loop.time()
+    if remain > 0:
+        await asyncio.sleep(remain)
+    _global.take(loop.time())
@@ -0,0 +1,125 @@
+# core/answer_cache.py
+"""
+LLM 응답 캐시(면진지니용)
+- 질문 정규화(NFKC·소문자·공백 압축·한/영 문장부호 제거) → 같은 뜻의 짧은 질문은 같은 키
+- 메모리 LRU(CACHE_MAX) + TTL, SQLite(answer_cache)에 영속 → 재시작 후에도 재사용
+- singleflight: 같은 키를 동시에 요청하면 업스트림 호출 1회를 공유
+- 적중률(stats)은 관리자 메뉴에서 확인
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from core.db import read, write
+
+TTL = 6 * 3600          # 초
+CACHE_MAX = 512
+DB_MAX_ROWS = 5000
+
+_PUNCT = re.compile(r"[\s\.,!?~…·'\"`()\[\]{}<>:;\-_/\\|。、！？「」『』“”‘’]+")
+
+_mem: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+_inflight: dict[str, asyncio.Future] = {}
+_stats = {"memory": 0, "db": 0, "shared": 0, "miss": 0}
+
+def normalize(text: str) -> str:
+    t = unicodedata.normalize("NFKC", text or "").lower()
+    return " ".join(_PUNCT.sub(" ", t).split())
+
+def make_key(namespace: str, text: str) -> str:
+    return hashlib.sha1(f"{namespace}\x00{normalize(text)}".encode("utf-8")).hexdigest()
+
+def stats() -> dict:
+    total = sum(_stats.values())
+    hits = total - _stats["miss"]
+    return {**_stats, "total": total, "hit_rate": (hits / total if total else 0.0), "size": len(_mem)}
+
+def _mem_get(key: str) -> Optional[str]:
+    hit = _mem.get(key)
+    if hit is None:
+        return None
+    answer, created = hit
+    if time.time() - created > TTL:
+        _mem.pop(key, None)
+        return None
+    _mem.move_to_end(key)
+    return answer
+
+def _mem_put(key: str, answer: str, created: float):
+    _mem[key] = (answer, created)
+    _mem.move_to_end(key)
+    while len(_mem) > CACHE_MAX:
+        _mem.popitem(last=False)
+
+async def _db_get(key: str) -> Optional[str]:
+    async with read() as db:
+        cur = await db.execute("SELECT answer, created_at FROM answer_cache WHERE key=? AND created_at>=?",
+                               (key, int(time.time() - TTL)))
+        row = await cur.fetchone()
+    if row is None:
+        return None
+    _mem_put(key, row[0], row[1])
+    return row[0]
+
+async def _db_put(key: str, namespace: str, question: str, answer: str):
+    now = int(time.time())
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute(
+            "INSERT OR REPLACE INTO answer_cache(key,namespace,question,answer,created_at) VALUES(?,?,?,?,?)",
+            (key, namespace, question, answer, now)
+        )
+        await db.execute("DELETE FROM answer_cache WHERE created_at<?", (int(now - TTL),))
+        await db.execute(
+            "DELETE FROM answer_cache WHERE key IN (SELECT key FROM answer_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (DB_MAX_ROWS,)
+        )
+        await db.commit()
+
+async def get_or_compute(namespace: str, question: str, compute: Callable[[], Awaitable[str]]) -> tuple[str, str]:
+    """
+    (응답, 출처) — 출처: memory / db / shared(동시 요청 공유) / miss(업스트림 호출)
+    compute() 예외는 그대로 전파(캐시하지 않음). 빈 응답도 캐시하지 않음.
+    """
+    key = make_key(namespace, question)
+    answer = _mem_get(key)
+    if answer is not None:
+        _stats["memory"] += 1
+        return answer, "memory"
+
+    fut = _inflight.get(key)
+    if fut is not None:
+        _stats["shared"] += 1
+        return await asyncio.shield(fut), "shared"
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        answer = await _db_get(key)
+        source = "db"
+        if answer is None:
+            source = "miss"
+            answer = await compute()
+            if answer:
+                _mem_put(key, answer, time.time())
+                try:
+                    await _db_put(key, namespace, question, answer)
+                except Exception as e:
+                    print(f"[answer_cache] persist failed: {e!r}")
+        _stats[source] += 1
+        fut.set_result(answer)
+        return answer, source
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            fut.cancel()
+        else:
+            fut.set_exception(e)
+            fut.exception()   # 대기자가 없을 때 "never retrieved" 경고 방지
+        raise
+    finally:
+        _inflight.pop(key, None)
@@ -0,0 +1,97 @@
+# core/balance.py
+"""
+잔액 서비스 — 모든 금액 변경은 여기를 거친다.
+- 조건부 단일 UPDATE/UPSERT ... RETURNING 으로 조회→계산→저장 왕복을 없앰
+- 원장(ledger) 행은 같은 트랜잭션에서 함께 기록
+- 모든 함수는 호출자의 write() 블록(트랜잭션) 안에서 사용한다
+- 잔액이 바뀌면 leaderboard.mark → 블록 종료 시 인메모리 순위표에 반영
+"""
+
+from typing import Optional
+
+from core import leaderboard
+from core.ledger import write_ledger
+
+_DUE_COLUMNS = ("last_claim_at", "last_daily_at")
+
+# ───────── 원시 연산(원장 없음) ─────────
+async def get_balance(db, gid: int, uid: int) -> int:
+    cur = await db.execute("SELECT balance FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
+    row = await cur.fetchone()
+    return row[0] if row else 0
+
+async def adjust(db, gid: int, uid: int, delta: int) -> int:
+    """무조건 delta 반영(음수 허용, 행이 없으면 생성). 반영 후 잔액"""
+    cur = await db.execute(
+        "INSERT INTO users(guild_id,user_id,balance) VALUES(?,?,?) "
+        "ON CONFLICT(guild_id,user_id) DO UPDATE SET balance=balance+excluded.balance "
+        "RETURNING balance",
+        (gid, uid, delta)
+    )
+    leaderboard.mark(gid, uid)
+    return (await cur.fetchone())[0]
+
+async def try_debit(db, gid: int, uid: int, amount: int) -> Optional[int]:
+    """잔액 >= amount 일 때만 차감. 차감 후 잔액 / 부족하면 None"""
+    cur = await db.execute(
+        "UPDATE users SET balance=balance-? WHERE guild_id=? AND user_id=? AND balance>=? RETURNING balance",
+        (amount, gid, uid, amount)
+    )
+    row = await cur.fetchone()
+    if row is None:
+        return None
+    leaderboard.mark(gid, uid)
+    return row[0]
+
+# ───────── 원장 포함 연산 ─────────
+async def credit(db, gid: int, uid: int, amount: int, kind: str, meta: Optional[dict] = None) -> int:
+    """amount 지급(음수면 무조건 차감 — 결과 정산/관리자 감소용). 반영 후 잔액"""
+    bal = await adjust(db, gid, uid, amount)
+    await write_ledger(db, gid, uid, kind, amount, bal, meta)
+    return bal
+
+async def debit_if_sufficient(db, gid: int, uid: int, amount: int, kind: str, meta: Optional[dict] = None) -> Optional[int]:
+    """잔액이 충분할 때만 amount 차감 + 원장(-amount). 차감 후 잔액 / 부족하면 None"""
+    bal = await try_debit(db, gid, uid, amount)
+    if bal is None:
+        return None
+    await write_ledger(db, gid, uid, kind, -amount, bal, meta)
+    return bal
+
+async def transfer(db, gid: int, src: int, dst: int, amount: int, fee: int = 0) -> Optional[tuple[int, int]]:
+    """src → dst 송금(수수료 fee는 src 부담, dst는 amount-fee 수령). (보낸 측 잔액, 받은 측 잔액) / 부족하면 None"""
+    src_bal = await debit_if_sufficient(db, gid, src, amount, "transfer_out", {"to": dst, "fee": fee})
+    if src_bal is None:
+        return None
+    dst_bal = await credit(db, gid, dst, amount - fee, "transfer_in", {"from": src, "fee": fee})
+    return src_bal, dst_bal
+
+async def set_balance(db, gid: int, uid: int, value: int, kind: str, meta: Optional[dict] = None) -> tuple[int, int]:
+    """잔액을 value로 설정. (이전 잔액, 새 잔액)"""
+    old = await get_balance(db, gid, uid)
+    bal = await adjust(db, gid, uid, value - old)
+    await write_ledger(db, gid, uid, kind, bal - old, bal, meta)
+    return old, bal
+
+async def credit_if_due(db, gid: int, uid: int, amount: int, column: str, now: int, due_before: int,
+                        kind: str, meta: Optional[dict] = None) -> tuple[bool, int, Optional[int]]:
+    """
+    쿨타임 컬럼(column)이 NULL이거나 due_before 이하일 때만 지급하고 column=now 로 갱신.
+    반환: (지급 여부, 잔액, 거절 시 column 값)
+    """
+    if column not in _DUE_COLUMNS:
+        raise ValueError(f"unknown column: {column}")
+    await db.execute("INSERT OR IGNORE INTO users(guild_id,user_id,balance) VALUES(?,?,0)", (gid, uid))
+    cur = await db.execute(
+        f"UPDATE users SET balance=balance+?, {column}=? "
+        f"WHERE guild_id=? AND user_id=? AND ({column} IS NULL OR {column}<=?) RETURNING balance",
+        (amount, now, gid, uid, due_before)
+    )
+    row = await cur.fetchone()
+    if row:
+        leaderboard.mark(gid, uid)
+        await write_ledger(db, gid, uid, kind, amount, row[0], meta)
+        return True, row[0], None
+    cur = await db.execute(f"SELECT balance, {column} FROM users WHERE guild_id=? AND user_id=?", (gid, uid))
+    bal, last = await cur.fetchone()
+    return False, bal, last
@@ -0,0 +1,150 @@
+# core/db.py
+"""
+공용 SQLite 커넥션 풀
+- 프로세스 당 writer 1개 + reader N개를 상시 유지(명령마다 connect/close 하지 않음)
+- PRAGMA(WAL, foreign_keys, busy_timeout, synchronous)는 연결 생성 시 1회만 적용
+- sqlite3 문장 캐시(cached_statements)로 반복 쿼리 파싱 비용 절감
+- reader 는 query_only 연결 — 조회 전용 명령은 read()/snapshot()으로 writer 락과 무관하게 실행
+- main.py의 setup_hook에서 open_pool(), 종료 시 close_pool()
+- add_write_hook(fn, pending): write() 블록 종료 시(락 보유 중, 커밋/롤백 확정 후) fn(writer) 호출
+  pending() 이 False 면(할 일 없음) 호출 생략
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import aiosqlite
+
+DB_PATH = "economy.db"
+
+READER_COUNT = 3
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE = 256
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA foreign_keys=ON",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous=NORMAL",
+)
+
+_WRITE_HOOKS: list[tuple[Callable[[aiosqlite.Connection], Awaitable[None]], Optional[Callable[[], bool]]]] = []
+
+def add_write_hook(fn: Callable[[aiosqlite.Connection], Awaitable[None]],
+                   pending: Optional[Callable[[], bool]] = None):
+    if all(f is not fn for f, _ in _WRITE_HOOKS):
+        _WRITE_HOOKS.append((fn, pending))
+
+async def _connect(path: str, query_only: bool = False) -> aiosqlite.Connection:
+    conn = await aiosqlite.connect(path, cached_statements=STATEMENT_CACHE)
+    for pragma in _PRAGMAS:
+        await conn.execute(pragma)
+    if query_only:
+        await conn.execute("PRAGMA query_only=ON")
+    return conn
+
+class Pool:
+    def __init__(self, path: str, readers: int = READER_COUNT):
+        self.path = path
+        self.reader_count = max(1, readers)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._write_owner: Optional[asyncio.Task] = None
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+
+    async def open(self):
+        self._writer = await _connect(self.path)
+        for _ in range(self.reader_count):
+            conn = await _connect(self.path, query_only=True)
+            self._all_readers.append(conn)
+            self._readers.put_nowait(conn)
+
+    async def close(self):
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        for conn in self._all_readers:
+            await conn.close()
+        self._all_readers.clear()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        writer 커넥션 독점 사용.
+        블록 종료 시 커밋되지 않은 트랜잭션은 롤백한다(공유 커넥션 오염 방지).
+        """
+        me = asyncio.current_task()
+        if me is not None and self._write_owner is me:
+            raise RuntimeError("writer 커넥션은 재진입할 수 없습니다.")
+        async with self._write_lock:
+            if self._writer is None:
+                raise RuntimeError("DB 풀이 열려 있지 않습니다.")
+            self._write_owner = me
+            try:
+                yield self._writer
+            finally:
+                self._write_owner = None
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                for hook, pending in _WRITE_HOOKS:
+                    if pending is not None and not pending():
+                        continue
+                    try:
+                        await hook(self._writer)
+                    except Exception as e:
+                        print(f"[db] write hook failed: {e!r}")
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """reader 커넥션 대여(조회 전용 명령용)."""
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                await conn.rollback()
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def snapshot(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        reader + DEFERRED 트랜잭션: 블록 안의 여러 SELECT가 같은 WAL 스냅샷을 본다.
+        쓰기 예약(BEGIN IMMEDIATE)을 잡지 않으므로 writer와 서로 기다리지 않음.
+        """
+        async with self.read() as conn:
+            await conn.execute("BEGIN")
+            yield conn
+
+# ───────── 전역 풀 ─────────
+_POOL: Optional[Pool] = None
+
+async def open_pool(path: str = DB_PATH, readers: int = READER_COUNT) -> Pool:
+    global _POOL
+    if _POOL is None:
+        pool = Pool(path, readers)
+        await pool.open()
+        _POOL = pool
+    return _POOL
+
+async def close_pool():
+    global _POOL
+    if _POOL is not None:
+        await _POOL.close()
+        _POOL = None
+
+def pool() -> Pool:
+    if _POOL is None:
+        raise RuntimeError("DB 풀이 열려 있지 않습니다. open_pool()을 먼저 호출하세요.")
+    return _POOL
+
+def write():
+    return pool().write()
+
+def read():
+    return pool().read()
+
+def snapshot():
+    return pool().snapshot()
@@ -0,0 +1,65 @@
+# core/duel_stats.py
+"""
+맞짱 전적 집계(duel_stats)
+- record: 맞짱 정산 트랜잭션 안에서 결과 1건 반영(단일 UPSERT)
+- get   : 프로필용 PK 조회 1회
+- backfill_from_ledger: 테이블이 비어 있을 때 1회, 기존 ledger(duel_win/lose/papa)로 채움
+"""
+
+import json
+import time
+from typing import Optional
+
+from core.db import write
+
+_KINDS = {"duel_win": "win", "duel_lose": "lose", "duel_papa": "papa"}
+
+async def record(db, gid: int, uid: int, outcome: str, stake: int, now: Optional[int] = None):
+    """outcome: win / lose / papa (papa는 연승/연패에 영향 없음)"""
+    if outcome not in ("win", "lose", "papa"):
+        raise ValueError(f"unknown outcome: {outcome}")
+    w, l, p = int(outcome == "win"), int(outcome == "lose"), int(outcome == "papa")
+    # streak: 승리 → 연승 중이면 +1, 아니면 1 / 패배 → 연패 중이면 -1, 아니면 -1 / papa → 유지
+    await db.execute(
+        "INSERT INTO duel_stats(guild_id,user_id,wins,losses,papa,total_staked,streak,best_streak,updated_at) "
+        "VALUES(?,?,?,?,?,?,?,?,?) "
+        "ON CONFLICT(guild_id,user_id) DO UPDATE SET "
+        "  wins=wins+excluded.wins, losses=losses+excluded.losses, papa=papa+excluded.papa, "
+        "  total_staked=total_staked+excluded.total_staked, "
+        "  streak=CASE WHEN excluded.wins=1 THEN (CASE WHEN streak>0 THEN streak+1 ELSE 1 END) "
+        "              WHEN excluded.losses=1 THEN (CASE WHEN streak<0 THEN streak-1 ELSE -1 END) "
+        "              ELSE streak END, "
+        "  best_streak=MAX(best_streak, CASE WHEN excluded.wins=1 THEN (CASE WHEN streak>0 THEN streak+1 ELSE 1 END) ELSE 0 END), "
+        "  updated_at=excluded.updated_at",
+        (gid, uid, w, l, p, stake, w - l, w, now or int(time.time()))
+    )
+
+async def get(db, gid: int, uid: int) -> dict:
+    cur = await db.execute(
+        "SELECT wins, losses, papa, total_staked, streak, best_streak FROM duel_stats WHERE guild_id=? AND user_id=?",
+        (gid, uid)
+    )
+    row = await cur.fetchone() or (0, 0, 0, 0, 0, 0)
+    return dict(zip(("wins", "losses", "papa", "total_staked", "streak", "best_streak"), row))
+
+async def backfill_from_ledger() -> int:
+    """duel_stats가 비어 있고 ledger에 맞짱 기록이 있으면 재집계. 반영한 ledger 행 수"""
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        cur = await db.execute("SELECT 1 FROM duel_stats LIMIT 1")
+        if await cur.fetchone():
+            await db.execute("ROLLBACK")
+            return 0
+        cur = await db.execute(
+            "SELECT guild_id, user_id, kind, amount, meta, ts FROM ledger "
+            "WHERE kind IN ('duel_win','duel_lose','duel_papa') ORDER BY ts, rowid"
+        )
+        rows = await cur.fetchall()
+        for gid, uid, kind, amount, meta, ts in rows:
+            try:
+                stake = int(json.loads(meta or "{}").get("stake", abs(amount)))
+            except (ValueError, TypeError, AttributeError):
+                stake = abs(amount)
+            await record(db, gid, uid, _KINDS[kind], stake, now=ts)
+        await db.commit()
+    return len(rows)
@@ -0,0 +1,159 @@
+# core/enhance_odds.py
+"""
+강화 테이블(ENH_TABLE)과 기대 비용/시도 분석 — 흡수 마르코프 체인
+- 상태 = 현재 레벨 0..MAX_LV-1, 목표 레벨 T 에 닿으면 흡수. 시도 1회: 성공 +1 / 실패 유지 / 하락 -1 / 파괴 0
+- 목표 T(1..MAX_LV) 전부를 (T, 상태, 상태) 배치로 쌓아 numpy.linalg.solve 한 번에 풂
+  → 모든 (시작, 목표) 쌍의 기대 시도 수/비용과 표준편차(2차 모멘트 방정식)
+- 시도 횟수 분포(분위수 QUANTILES): Q^(2^k) 거듭제곱을 미리 만들고 비트 단위로 생존 확률을 좁혀 감
+- 시도 분포는 배율과 무관 → 1회 계산, 비용은 배율별로 계산해 캐시(analyze(mult))
+  강화 로드 시 analyze(1.0), 관리자 배율 변경 시 analyze(새 배율)
+필요 패키지: numpy (없으면 analyze() 가 None → 분석 표시 생략)
+"""
+
+from typing import NamedTuple, Optional
+
+ENH_TABLE = [
+    None,
+    {"name":"샤프심","s":100,"f":0,"d":0,"b":0,"cost":2000},
+    {"name":"연필","s":98,"f":2,"d":0,"b":0,"cost":2200},
+    {"name":"페트병","s":96,"f":4,"d":0,"b":0,"cost":2500},
+    {"name":"파리채","s":94,"f":6,"d":0,"b":0,"cost":2900},
+    {"name":"우산","s":90,"f":10,"d":0,"b":0,"cost":3400},
+    {"name":"노트북","s":87,"f":13,"d":0,"b":0,"cost":4000},
+    {"name":"낡은 단검","s":84,"f":16,"d":0,"b":0,"cost":5000},
+    {"name":"쓸만한 단검","s":80,"f":20,"d":0,"b":0,"cost":6500},
+    {"name":"견고한 단검","s":76,"f":24,"d":0,"b":0,"cost":8500},
+    {"name":"빠따","s":73,"f":27,"d":0,"b":0,"cost":11000},
+    {"name":"전기톱","s":65,"f":25,"d":10,"b":0,"cost":15000},
+    {"name":"롱소드","s":62,"f":24,"d":12,"b":2,"cost":20000},
+    {"name":"화염의 검","s":59,"f":24,"d":14,"b":3,"cost":28000},
+    {"name":"냉기의 검","s":56,"f":23,"d":16,"b":5,"cost":40000},
+    {"name":"듀얼블레이드","s":53,"f":22,"d":18,"b":7,"cost":60000},
+    {"name":"심판자의 검","s":50,"f":21,"d":20,"b":9,"cost":85000},
+    {"name":"엑스칼리버","s":47,"f":20,"d":22,"b":11,"cost":120000},
+    {"name":"플라즈마 소드","s":44,"f":19,"d":24,"b":13,"cost":170000},
+    {"name":"천총운검","s":41,"f":18,"d":26,"b":15,"cost":240000},
+    {"name":"사인참사검","s":38,"f":17,"d":28,"b":17,"cost":330000},
+    {"name":"뒤랑칼","s":35,"f":17,"d":30,"b":18,"cost":450000},
+    {"name":"파멸의 대검","s":32,"f":16,"d":33,"b":19,"cost":600000},
+    {"name":"여명의 검","s":29,"f":15,"d":35,"b":21,"cost":800000},
+    {"name":"키샨","s":26,"f":14,"d":38,"b":22,"cost":1100000},
+    {"name":"영원의 창","s":23,"f":14,"d":40,"b":23,"cost":1500000},
+    {"name":"정의의 저울","s":21,"f":13,"d":42,"b":24,"cost":2000000},
+    {"name":"사신의 낫","s":19,"f":12,"d":43,"b":26,"cost":2700000},
+    {"name":"아스트라페","s":17,"f":11,"d":45,"b":27,"cost":3600000},
+    {"name":"롱기누스의 창","s":16,"f":10,"d":46,"b":28,"cost":4800000},
+    {"name":"면진검","s":15,"f":10,"d":47,"b":28,"cost":6500000},
+]
+MAX_LV = 30
+
+QUANTILES = (0.5, 0.9, 0.99)
+MAX_BITS = 40       # 분위수 탐색 상한 2^40 회
+CACHE_MAX = 16      # 배율별 분석 보관 개수
+
+class Reach(NamedTuple):
+    attempts: float         # 기대 시도 수
+    attempts_sd: float
+    cost: float             # 기대 비용(₩, 배율 적용)
+    cost_sd: float
+    quantiles: tuple        # QUANTILES 별 시도 수(상한 초과면 None)
+
+class Analysis:
+    """(목표, 시작) 배열 묶음 — reach(start, target) 으로 조회"""
+    def __init__(self, mult: float, base: tuple, cost: tuple):
+        self.mult = mult
+        self._att, self._att_sd, self._q = base
+        self._cost, self._cost_sd = cost
+
+    def reach(self, start: int, target: int) -> Optional[Reach]:
+        if not (0 <= start < target <= MAX_LV):
+            return None
+        t = target - 1
+        qs = tuple(None if v != v else int(v) for v in self._q[:, t, start].tolist())
+        return Reach(float(self._att[t, start]), float(self._att_sd[t, start]),
+                     float(self._cost[t, start]), float(self._cost_sd[t, start]), qs)
+
+_np = None
+_chain = None       # (Q, A, mask)
+_base = None        # 시도 수 (평균, 표준편차, 분위수) — 배율 무관
+_by_mult: dict[float, Analysis] = {}
+
+def attempt_cost(lv: int, mult: float) -> int:
+    """lv → lv+1 시도 1회 비용(강화 실행과 같은 반올림)"""
+    return int(round(ENH_TABLE[lv + 1]["cost"] * float(mult)))
+
+def _build(np):
+    n = MAX_LV
+    P = np.zeros((n, n))
+    for lv in range(n):
+        r = ENH_TABLE[lv + 1]
+        if lv + 1 < n:
+            P[lv, lv + 1] += r["s"] / 100
+        P[lv, lv] += r["f"] / 100
+        P[lv, max(0, lv - 1)] += r["d"] / 100
+        P[lv, 0] += r["b"] / 100
+    # 목표 T 의 과도 상태 = 레벨 < T (목표 이상으로 가는 확률은 흡수)
+    mask = np.arange(n)[None, :] < np.arange(1, n + 1)[:, None]         # (T, 상태)
+    Q = P[None] * mask[:, :, None] * mask[:, None, :]                   # (T, 상태, 상태)
+    A = np.eye(n)[None] - Q
+    return Q, A, mask
+
+def _moments(per_try):
+    """시도당 값 c 의 누적합 — (I-Q)m1 = c, (I-Q)m2 = c² + 2c·(Q m1) → (평균, 표준편차)"""
+    np = _np
+    Q, A, mask = _chain
+    c = per_try[None, :] * mask
+    m1 = np.linalg.solve(A, c[..., None])[..., 0]
+    m2 = np.linalg.solve(A, (c * c + 2 * c * np.einsum("tij,tj->ti", Q, m1))[..., None])[..., 0]
+    return m1, np.sqrt(np.maximum(m2 - m1 * m1, 0.0))
+
+def _quantiles():
+    """(len(QUANTILES), T, 시작) 시도 수 분위수 — 생존 확률 e·Q^n·1 이 1-p 이하가 되는 최소 n"""
+    np = _np
+    Q, _, mask = _chain
+    powers = [Q]
+    for _ in range(MAX_BITS - 1):
+        powers.append(powers[-1] @ powers[-1])
+    start = np.broadcast_to(np.eye(MAX_LV), Q.shape) * mask[:, :, None]
+    out = np.full((len(QUANTILES),) + mask.shape, np.nan)
+    for i, p in enumerate(QUANTILES):
+        v, n = start.copy(), np.zeros(mask.shape)
+        for k in range(MAX_BITS - 1, -1, -1):
+            nv = v @ powers[k]
+            take = nv.sum(axis=-1) > 1.0 - p
+            v = np.where(take[..., None], nv, v)
+            n += take * float(2 ** k)
+        ok = mask & (n < 2 ** MAX_BITS - 1)
+        out[i][ok] = n[ok] + 1
+    return out
+
+def analyze(mult: float = 1.0) -> Optional[Analysis]:
+    """배율 mult 의 분석(캐시) / numpy 가 없으면 None"""
+    global _np, _chain, _base
+    mult = float(mult)
+    hit = _by_mult.get(mult)
+    if hit is not None:
+        return hit
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        _np = numpy
+    if _chain is None:
+        _chain = _build(_np)
+        att, att_sd = _moments(_np.ones(MAX_LV))
+        _base = (att, att_sd, _quantiles())
+    costs = _np.array([attempt_cost(lv, mult) for lv in range(MAX_LV)], dtype=_np.float64)
+    res = Analysis(mult, _base, _moments(costs))
+    if len(_by_mult) >= CACHE_MAX:
+        _by_mult.pop(next(iter(_by_mult)))
+    _by_mult[mult] = res
+    return res
+
+def approx(x: float) -> str:
+    """큰 수 축약 — 9,500 / 1.2만 / 3.4조"""
+    for unit, name in ((1e16, "경"), (1e12, "조"), (1e8, "억"), (1e4, "만")):
+        if x >= unit:
+            return f"{x / unit:,.1f}{name}"
+    return f"{x:,.0f}"
@@ -0,0 +1,69 @@
+# core/escrow.py
+"""
+에스크로(보류금) 2단계 정산
+- place_hold : 짧은 트랜잭션에서 잔액 → holds 로 베팅액을 옮긴다
+- 애니메이션은 트랜잭션 밖에서 진행(쓰기 락 미보유)
+- settle_hold: 짧은 트랜잭션에서 hold를 지우고 지급액을 잔액에 반영
+- recover_stale_holds: 재시작 시 남아 있는 hold(정산 전 종료)를 환불
+place_hold/settle_hold 는 호출자의 트랜잭션(write 블록) 안에서 사용한다.
+"""
+
+import time
+from typing import Optional
+
+from core.balance import adjust, credit, try_debit
+from core.db import write
+
+async def place_hold(db, gid: int, uid: int, amount: int, kind: str) -> Optional[tuple[int, int]]:
+    """잔액이 충분하면 amount를 차감해 hold로 옮긴다. (hold_id, 차감 후 잔액) / 부족하면 None"""
+    bal = await try_debit(db, gid, uid, amount)
+    if bal is None:
+        return None
+    cur = await db.execute(
+        "INSERT INTO holds(guild_id,user_id,kind,amount,created_at) VALUES(?,?,?,?,?)",
+        (gid, uid, kind, amount, int(time.time()))
+    )
+    return cur.lastrowid, bal
+
+async def settle_hold(db, hold_id: int, payout: int) -> Optional[tuple[int, int, int, int]]:
+    """
+    hold를 정산한다. payout = 잔액으로 돌려줄 금액(패배 0 / 무승부 amount / 승리 2*amount 등)
+    반환: (guild_id, user_id, hold 금액, 정산 후 잔액) / 이미 정산된 hold면 None
+    """
+    cur = await db.execute(
+        "DELETE FROM holds WHERE hold_id=? RETURNING guild_id, user_id, amount", (hold_id,)
+    )
+    row = await cur.fetchone()
+    if row is None:
+        return None
+    gid, uid, amount = row
+    return gid, uid, amount, await adjust(db, gid, uid, payout)
+
+async def _refund(db, hold_id: int, reason: str) -> Optional[int]:
+    cur = await db.execute(
+        "DELETE FROM holds WHERE hold_id=? RETURNING guild_id, user_id, amount", (hold_id,)
+    )
+    row = await cur.fetchone()
+    if row is None:
+        return None
+    gid, uid, amount = row
+    return await credit(db, gid, uid, amount, "hold_refund", {"hold_id": hold_id, "reason": reason})
+
+async def refund_hold(hold_id: int, reason: str) -> Optional[int]:
+    """예외 등으로 정산하지 못한 hold를 즉시 환불(단독 트랜잭션). 환불 후 잔액 / 이미 정산됐으면 None"""
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        bal = await _refund(db, hold_id, reason)
+        await db.commit()
+    return bal
+
+async def recover_stale_holds() -> int:
+    """시작 시 1회: 이전 프로세스가 남긴 hold를 모두 환불. 환불 건수 반환"""
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        cur = await db.execute("SELECT hold_id FROM holds ORDER BY hold_id")
+        ids = [r[0] for r in await cur.fetchall()]
+        for hold_id in ids:
+            await _refund(db, hold_id, "restart")
+        await db.commit()
+    return len(ids)
@@ -0,0 +1,92 @@
+# core/guild_settings.py
+"""
+길드 설정 캐시
+- guild_settings 행을 길드별로 1회 로드해 메모리에 보관(명령마다 재조회하지 않음)
+- 관리자 변경 경로(set_setting_field / set_force_settings)는 커밋 후 invalidate(gid)
+- 프로세스 외부 변경은 settings_version(트리거로 증가)을 CHECK_INTERVAL 마다 확인해 감지
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from core.db import read
+
+CHECK_INTERVAL = 5.0   # 외부 변경 감지 주기(초)
+
+@dataclass(frozen=True)
+class GuildSettings:
+    min_bet: int = 1000
+    win_min_bps: int = 3000
+    win_max_bps: int = 6000
+    mode_name: str = "일반 모드"
+    enh_cost_mult: float = 1.0
+    force_mode: str = "off"
+    force_uid: int = 0
+    anim_mode: str = "full"         # full / single / instant
+    tarot_mode: str = "ai"          # ai / fast
+    rate_limits: str = ""           # 명령 한도 덮어쓰기(core.ratelimit 형식)
+
+    def forced_for(self, uid: int) -> Optional[str]:
+        """uid에게 적용되는 강제 결과("success"/"fail") / 없으면 None"""
+        if self.force_mode in ("success", "fail") and self.force_uid in (0, uid):
+            return self.force_mode
+        return None
+
+DEFAULT = GuildSettings()
+
+_cache: dict[int, GuildSettings] = {}
+_generation = 0
+_version: Optional[int] = None
+_checked_at = 0.0
+
+def invalidate(gid: Optional[int] = None):
+    """gid=None이면 전체 무효화"""
+    global _generation
+    _generation += 1
+    if gid is None:
+        _cache.clear()
+    else:
+        _cache.pop(gid, None)
+
+async def _sync_version(db):
+    global _version, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < CHECK_INTERVAL:
+        return
+    _checked_at = now
+    cur = await db.execute("SELECT v FROM settings_version WHERE id=1")
+    row = await cur.fetchone()
+    v = row[0] if row else 0
+    if _version is not None and v != _version:
+        invalidate()
+    _version = v
+
+async def get(gid: int) -> GuildSettings:
+    cached = _cache.get(gid)
+    if cached is not None and time.monotonic() - _checked_at < CHECK_INTERVAL:
+        return cached
+
+    async with read() as db:
+        await _sync_version(db)
+        cached = _cache.get(gid)
+        if cached is not None:
+            return cached
+        gen = _generation
+        cur = await db.execute(
+            "SELECT min_bet, win_min_bps, win_max_bps, mode_name, "
+            "COALESCE(enh_cost_mult,1.0), COALESCE(force_mode,'off'), COALESCE(force_target_user_id,0), "
+            "COALESCE(anim_mode,'full'), COALESCE(tarot_mode,'ai'), COALESCE(rate_limits,'') "
+            "FROM guild_settings WHERE guild_id=?",
+            (gid,)
+        )
+        row = await cur.fetchone()
+
+    s = DEFAULT if row is None else GuildSettings(
+        min_bet=row[0], win_min_bps=row[1], win_max_bps=row[2], mode_name=row[3] or DEFAULT.mode_name,
+        enh_cost_mult=float(row[4]), force_mode=row[5], force_uid=int(row[6] or 0), anim_mode=row[7],
+        tarot_mode=row[8], rate_limits=row[9],
+    )
+    if gen == _generation:
+        _cache[gid] = s
+    return s
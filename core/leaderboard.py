@@ -0,0 +1,139 @@
+# core/leaderboard.py
+"""
+길드별 인메모리 순위표
+- (−잔액, user_id) 정렬 리스트 + 잔액/강화 레벨 dict → top(k)는 O(k), SQLite 미접촉
+- rank(잔액)은 이분 탐색 O(log n) — 정렬 리스트 자체가 순서 통계 구조
+- 첫 조회 때 길드 전체를 1회 적재(idx_users_rank 인덱스 순서 그대로 읽음) — snapshot() reader 에서 읽어 writer 를 막지 않음
+  적재 중 바뀐 사용자는 따로 모아 두었다가 설치 직후 _sync 훅으로 확정값 재반영
+- 잔액/강화 레벨을 바꾸는 코드는 mark(gid, uid) → write() 블록 종료 훅에서
+  writer 커넥션으로 확정값을 다시 읽어 반영(롤백된 변경은 반영되지 않음)
+"""
+
+import asyncio
+from bisect import bisect_left, insort
+from typing import Optional
+
+from core.db import add_write_hook, snapshot, write
+
+class Board:
+    def __init__(self):
+        self.bal: dict[int, int] = {}
+        self.lv: dict[int, int] = {}
+        self._keys: list[tuple[int, int]] = []   # (−balance, user_id) 오름차순
+
+    def put(self, uid: int, bal: int, lv: int):
+        self.lv[uid] = lv
+        old = self.bal.get(uid)
+        if old == bal:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, uid))]
+        self.bal[uid] = bal
+        insort(self._keys, (-bal, uid))
+
+    def remove(self, uid: int):
+        old = self.bal.pop(uid, None)
+        self.lv.pop(uid, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, uid))]
+
+    def top(self, k: int) -> list[tuple[int, int, int]]:
+        """[(user_id, balance, level)] 상위 k명"""
+        return [(uid, -nb, self.lv.get(uid, 0)) for nb, uid in self._keys[:k]]
+
+    def rank(self, bal: int) -> int:
+        """잔액 bal의 등수(동점 공동 등수) = bal보다 많은 인원 + 1"""
+        return bisect_left(self._keys, (-bal,)) + 1
+
+    def __len__(self):
+        return len(self._keys)
+
+_boards: dict[int, Board] = {}
+_dirty: set[tuple[int, int]] = set()
+_loading: dict[int, set[int]] = {}              # 적재 중인 길드 → 그동안 바뀐 사용자
+_load_locks: dict[int, asyncio.Lock] = {}
+
+def mark(gid: int, uid: int):
+    """잔액/레벨 변경 표시(적재된/적재 중인 길드만). write() 블록 종료 시 반영"""
+    if gid in _boards:
+        _dirty.add((gid, uid))
+    elif gid in _loading:
+        _loading[gid].add(uid)
+
+def invalidate(gid: Optional[int] = None):
+    """대량 변경 등으로 증분 반영이 어려울 때 — 다음 조회에서 재적재"""
+    if gid is None:
+        _boards.clear()
+        _loading.clear()
+    else:
+        _boards.pop(gid, None)
+        _loading.pop(gid, None)
+
+async def _load(db, gid: int) -> Board:
+    board = Board()
+    cur = await db.execute(
+        "SELECT u.user_id, u.balance, COALESCE(w.level,0) FROM users u "
+        "LEFT JOIN user_weapons w ON w.guild_id=u.guild_id AND w.user_id=u.user_id "
+        "WHERE u.guild_id=? ORDER BY u.balance DESC, u.user_id ASC",
+        (gid,)
+    )
+    for uid, bal, lv in await cur.fetchall():
+        board.bal[uid], board.lv[uid] = bal, lv
+        board._keys.append((-bal, uid))
+    return board
+
+async def _cold_load(gid: int) -> Board:
+    # 진행 중인 쓰기가 끝난 뒤 변경 수집 시작 → 스냅샷 이후 커밋되는 변경은 모두 _loading 에 남음
+    async with write():
+        _loading[gid] = set()
+    try:
+        async with snapshot() as db:
+            board = await _load(db, gid)
+    except BaseException:
+        _loading.pop(gid, None)
+        raise
+    changed = _loading.pop(gid, None)
+    if changed is None:         # 적재 중 invalidate → 설치하지 않음
+        return board
+    _boards[gid] = board
+    if changed:
+        _dirty.update((gid, uid) for uid in changed)
+        async with write():
+            pass                # 종료 훅(_sync)이 바뀐 행만 writer 에서 다시 읽음
+    return board
+
+async def get_board(gid: int) -> Board:
+    board = _boards.get(gid)
+    if board is None:
+        async with _load_locks.setdefault(gid, asyncio.Lock()):
+            board = _boards.get(gid)
+            if board is None:
+                board = await _cold_load(gid)
+    return board
+
+async def _sync(db):
+    if not _dirty:
+        return
+    pending = list(_dirty)
+    _dirty.clear()
+    for gid, uid in pending:
+        board = _boards.get(gid)
+        if board is None:
+            continue
+        try:
+            cur = await db.execute(
+                "SELECT u.balance, COALESCE(w.level,0) FROM users u "
+                "LEFT JOIN user_weapons w ON w.guild_id=u.guild_id AND w.user_id=u.user_id "
+                "WHERE u.guild_id=? AND u.user_id=?",
+                (gid, uid)
+            )
+            row = await cur.fetchone()
+        except Exception:
+            invalidate(gid)
+            raise
+        if row is None:
+            board.remove(uid)
+        else:
+            board.put(uid, row[0], row[1])
+
+add_write_hook(_sync)
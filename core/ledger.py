@@ -0,0 +1,131 @@
+# core/ledger.py
+"""
+원장(ledger) 기록 — 모든 코그가 공유
+- write_ledger : 호출자의 트랜잭션 안에서 즉시 INSERT (잔액 변동과 원자적이어야 하는 금전 기록용)
+- log_event    : 비금전 이벤트(enhance_result 등)를 그룹 커밋 큐에 적재
+  · FLUSH_INTERVAL 초 또는 FLUSH_SIZE 건마다 executemany + 1회 커밋
+  · 큐가 QUEUE_MAX 로 차면 put 에서 대기(배압)
+  · LEDGER_MODE=strict 이면 커밋될 때까지 대기, batched 면 적재 즉시 반환
+  · write() 블록 안에서 호출하지 말 것(플러시가 writer를 잡는다)
+- main.py 의 setup_hook 에서 start_ledger_writer(), 종료 시 stop_ledger_writer()로 잔여분 플러시
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+from core.db import write
+
+LEDGER_MODE = os.getenv("LEDGER_MODE", "batched").strip().lower()   # strict | batched
+FLUSH_INTERVAL = 0.5   # 초
+FLUSH_SIZE = 256
+QUEUE_MAX = 4096
+MAX_RETRY = 3
+
+_STOP = object()
+_INSERT = "INSERT INTO ledger(guild_id,user_id,kind,amount,balance_after,meta,ts) VALUES(?,?,?,?,?,?,?)"
+
+def _row(gid: int, uid: int, kind: str, amount: int, bal_after: int, meta: Optional[dict]) -> tuple:
+    return (gid, uid, kind, amount, bal_after, json.dumps(meta or {}), int(time.time()))
+
+async def write_ledger(db, gid: int, uid: int, kind: str, amount: int, bal_after: int, meta: Optional[dict] = None):
+    await db.execute(_INSERT, _row(gid, uid, kind, amount, bal_after, meta))
+
+# ───────── 그룹 커밋 writer ─────────
+class LedgerWriter:
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="ledger-writer")
+
+    async def submit(self, row: tuple):
+        fut = asyncio.get_running_loop().create_future() if self.strict else None
+        await self._queue.put((row, fut))
+        if fut is not None:
+            await fut
+
+    async def _collect(self) -> tuple[list, bool]:
+        """(배치, 종료 신호 수신 여부)"""
+        loop = asyncio.get_running_loop()
+        batch, item = [], await self._queue.get()
+        deadline = loop.time() + FLUSH_INTERVAL
+        while item is not _STOP:
+            batch.append(item)
+            if len(batch) >= FLUSH_SIZE:
+                return batch, False
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return batch, False
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return batch, False
+        return batch, True
+
+    async def _flush(self, batch: list):
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        err: Optional[BaseException] = None
+        for attempt in range(MAX_RETRY):
+            try:
+                async with write() as db:
+                    await db.execute("BEGIN IMMEDIATE")
+                    await db.executemany(_INSERT, rows)
+                    await db.commit()
+                err = None
+                break
+            except Exception as e:
+                err = e
+                await asyncio.sleep(0.1 * (attempt + 1))
+        if err is not None:
+            print(f"[ledger] flush failed, dropped {len(rows)} rows: {err!r}")
+        for _, fut in batch:
+            if fut is not None and not fut.done():
+                if err is None: fut.set_result(None)
+                else: fut.set_exception(err)
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            await self._flush(batch)
+
+    async def stop(self):
+        """종료 신호를 큐 끝에 넣고, 그 앞의 행이 모두 플러시될 때까지 대기"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+_WRITER: Optional[LedgerWriter] = None
+
+def start_ledger_writer() -> LedgerWriter:
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = LedgerWriter(strict=(LEDGER_MODE == "strict"))
+        _WRITER.start()
+    return _WRITER
+
+async def stop_ledger_writer():
+    global _WRITER
+    if _WRITER is not None:
+        w, _WRITER = _WRITER, None
+        await w.stop()
+
+async def log_event(gid: int, uid: int, kind: str, amount: int, bal_after: int, meta: Optional[dict] = None):
+    """비금전 이벤트 기록(그룹 커밋). writer가 없으면 단독 트랜잭션으로 즉시 기록"""
+    row = _row(gid, uid, kind, amount, bal_after, meta)
+    if _WRITER is not None:
+        return await _WRITER.submit(row)
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute(_INSERT, row)
+        await db.commit()
@@ -0,0 +1,257 @@
+# core/llm.py
+"""
+LLM 게이트웨이 — mz_gemini / mz_genie / mz_tarot 공용
+- 동기 SDK 호출은 전용 스레드 풀(WORKERS)에서 실행 → 이벤트 루프를 막지 않음
+- 전역 GLOBAL_CONCURRENCY / 길드별 GUILD_CONCURRENCY 동시 호출 제한
+  (전역 슬롯은 워커 스레드가 실제로 끝날 때 반납 — 타임아웃으로 포기한 호출도 끝날 때까지 풀을 차지하므로)
+- 호출마다 TIMEOUT 초 제한, 사용량 초과(429)는 지수 백오프 + 지터로 MAX_RETRY 회 재시도
+- 모델 클라이언트는 모델명별 1회 생성 후 재사용
+- stream(): 응답을 조각 단위로 흘려보냄(첫 조각 전 429만 재시도, 조각 사이 TIMEOUT 초 무응답이면 LLMTimeout)
+- LLM_BACKEND=fake 이면 네트워크 없이 동작하는 로컬 백엔드(개발/테스트용)
+필요 패키지(gemini 백엔드): pip install google-generativeai
+환경변수: GEMINI_API_KEY 또는 GOOGLE_API_KEY
+"""
+
+import asyncio
+import contextlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, Optional, Union
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+WORKERS = 4
+GLOBAL_CONCURRENCY = 4
+GUILD_CONCURRENCY = 2
+TIMEOUT = 30.0
+MAX_RETRY = 3
+BACKOFF_BASE = 1.0      # 초
+BACKOFF_CAP = 20.0
+
+Prompt = Union[str, list]
+
+# ───────── 예외 ─────────
+class LLMError(Exception):
+    """외부 서비스 오류(일반)"""
+
+class LLMUnavailable(LLMError):
+    """키/패키지 미설정"""
+
+class LLMRateLimited(LLMError):
+    """사용량 한도(429) — 재시도 후에도 실패"""
+    def __init__(self, msg: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+class LLMTimeout(LLMError):
+    """TIMEOUT 초 내 응답 없음"""
+
+# ───────── 백엔드 ─────────
+class GeminiBackend:
+    """google-generativeai(동기 SDK). generate()는 워커 스레드에서 호출된다."""
+    def __init__(self):
+        self._genai = None
+        self._errors = None
+        self._models: dict[str, Any] = {}
+
+    def unavailable_reason(self) -> Optional[str]:
+        if not (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")):
+            return "Gemini API 키가 설정되어 있지 않습니다.\n서버 환경변수 `GOOGLE_API_KEY`를 설정한 뒤 다시 시도해 주세요."
+        try:
+            self._load()
+        except ImportError:
+            return "google-generativeai 패키지가 설치되어 있지 않습니다."
+        return None
+
+    def _load(self):
+        if self._genai is None:
+            import google.generativeai as genai
+            from google.api_core import exceptions as errors
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or "")
+            self._genai, self._errors = genai, errors
+
+    def _model(self, name: str):
+        m = self._models.get(name)
+        if m is None:
+            m = self._models[name] = self._genai.GenerativeModel(name)
+        return m
+
+    @contextlib.contextmanager
+    def _call(self):
+        reason = self.unavailable_reason()
+        if reason:
+            raise LLMUnavailable(reason)
+        try:
+            yield
+        except self._errors.ResourceExhausted as e:
+            delay = getattr(getattr(e, "retry_delay", None), "seconds", None)
+            raise LLMRateLimited(str(e), float(delay) if delay else None) from e
+        except self._errors.GoogleAPIError as e:
+            raise LLMError(str(e)) from e
+
+    def generate(self, prompt: Prompt, model: str, config: Optional[dict]) -> str:
+        with self._call():
+            resp = self._model(model).generate_content(prompt, generation_config=config)
+            return (resp.text or "").strip()
+
+    def stream(self, prompt: Prompt, model: str, config: Optional[dict]) -> Iterator[str]:
+        with self._call():
+            for chunk in self._model(model).generate_content(prompt, generation_config=config, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:      # 안전 필터 등으로 텍스트가 없는 조각
+                    continue
+                if text:
+                    yield text
+
+class FakeBackend:
+    """네트워크 없이 결정적 응답. delay / fail_times 로 지연·429 재현"""
+    def __init__(self, delay: float = 0.0, fail_times: int = 0):
+        self.delay, self.fail_times = delay, fail_times
+        self.calls = 0
+
+    def unavailable_reason(self) -> Optional[str]:
+        return None
+
+    def generate(self, prompt: Prompt, model: str, config: Optional[dict]) -> str:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise LLMRateLimited("fake 429", 0.0)
+        text = prompt if isinstance(prompt, str) else "\n".join(map(str, prompt))
+        return f"[{model}] {text[-200:]}"
+
+    def stream(self, prompt: Prompt, model: str, config: Optional[dict]) -> Iterator[str]:
+        delay, self.delay = self.delay, 0.0
+        try:
+            words = self.generate(prompt, model, config).split(" ")
+        finally:
+            self.delay = delay
+        for i, w in enumerate(words):
+            if delay:
+                time.sleep(delay / len(words))
+            yield w if i == 0 else " " + w
+
+_backend: Any = FakeBackend() if os.getenv("LLM_BACKEND", "gemini").lower() == "fake" else GeminiBackend()
+
+def set_backend(backend: Any):
+    global _backend
+    _backend = backend
+
+def unavailable_reason() -> Optional[str]:
+    """사용 불가 사유(키/패키지 미설정) / 사용 가능하면 None"""
+    return _backend.unavailable_reason()
+
+# ───────── 실행/제한 ─────────
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="llm")
+_global_sem = asyncio.Semaphore(GLOBAL_CONCURRENCY)
+_guild_sems: dict[int, asyncio.Semaphore] = {}
+
+def _guild_sem(gid: Optional[int]) -> Optional[asyncio.Semaphore]:
+    if gid is None:
+        return None
+    sem = _guild_sems.get(gid)
+    if sem is None:
+        sem = _guild_sems[gid] = asyncio.Semaphore(GUILD_CONCURRENCY)
+    return sem
+
+def _release_slot(fut: asyncio.Future):
+    _global_sem.release()
+    if not fut.cancelled():
+        fut.exception()     # 기다림을 포기한 호출의 결과/예외는 버림(미회수 경고 방지)
+
+async def _submit(fn, *args) -> asyncio.Future:
+    """전역 슬롯을 잡고 워커 스레드에서 실행. 슬롯은 스레드가 끝날 때 반납"""
+    await _global_sem.acquire()
+    try:
+        fut = asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    except BaseException:
+        _global_sem.release()
+        raise
+    fut.add_done_callback(_release_slot)
+    return fut
+
+async def _attempt(prompt: Prompt, model: str, config: Optional[dict], timeout: float) -> str:
+    fut = await _submit(_backend.generate, prompt, model, config)
+    try:
+        # shield: 타임아웃/취소돼도 fut 는 스레드 종료까지 살아 있어야 슬롯이 그때 반납됨
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+    except asyncio.TimeoutError as e:
+        raise LLMTimeout(f"{model}: {timeout:g}s 내 응답 없음") from e
+
+async def generate(prompt: Prompt, *, model: str = DEFAULT_MODEL, gid: Optional[int] = None,
+                   config: Optional[dict] = None, timeout: float = TIMEOUT, max_retry: int = MAX_RETRY) -> str:
+    """프롬프트 → 응답 텍스트. 실패 시 LLMError 계열 예외(백오프 대기 중에는 슬롯을 반납)"""
+    gsem = _guild_sem(gid)
+    for attempt in range(max_retry + 1):
+        try:
+            if gsem is None:
+                return await _attempt(prompt, model, config, timeout)
+            async with gsem:
+                return await _attempt(prompt, model, config, timeout)
+        except LLMRateLimited as e:
+            if attempt >= max_retry:
+                raise
+            wait = e.retry_after if e.retry_after is not None else BACKOFF_BASE * (2 ** attempt)
+            await asyncio.sleep(min(wait, BACKOFF_CAP) + random.uniform(0, BACKOFF_BASE))
+    raise LLMRateLimited()
+
+async def _stream_attempt(prompt: Prompt, model: str, config: Optional[dict], timeout: float) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    q: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def pump():     # 워커 스레드: 동기 스트림 → 루프 큐
+        try:
+            for piece in _backend.stream(prompt, model, config):
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(q.put_nowait, (piece, None))
+        except BaseException as e:
+            loop.call_soon_threadsafe(q.put_nowait, (None, e))
+        else:
+            loop.call_soon_threadsafe(q.put_nowait, (None, None))
+
+    await _submit(pump)
+    try:
+        while True:
+            try:
+                piece, err = await asyncio.wait_for(q.get(), timeout)
+            except asyncio.TimeoutError as e:
+                raise LLMTimeout(f"{model}: {timeout:g}s 동안 응답 조각 없음") from e
+            if err is not None:
+                raise err
+            if piece is None:
+                return
+            yield piece
+    finally:
+        stop.set()      # 소비자가 중단하면 워커도 다음 조각에서 멈춤
+
+async def stream(prompt: Prompt, *, model: str = DEFAULT_MODEL, gid: Optional[int] = None,
+                 config: Optional[dict] = None, timeout: float = TIMEOUT,
+                 max_retry: int = MAX_RETRY) -> AsyncIterator[str]:
+    """프롬프트 → 응답 조각 스트림. 동시성 슬롯은 스트림이 끝날 때까지 점유"""
+    gsem = _guild_sem(gid)
+    for attempt in range(max_retry + 1):
+        started = False
+        try:
+            async with contextlib.AsyncExitStack() as stack:
+                if gsem is not None:
+                    await stack.enter_async_context(gsem)
+                pieces = await stack.enter_async_context(
+                    contextlib.aclosing(_stream_attempt(prompt, model, config, timeout)))
+                async for piece in pieces:
+                    started = True
+                    yield piece
+            return
+        except LLMRateLimited as e:
+            if started or attempt >= max_retry:
+                raise
+            wait = e.retry_after if e.retry_after is not None else BACKOFF_BASE * (2 ** attempt)
+            await asyncio.sleep(min(wait, BACKOFF_CAP) + random.uniform(0, BACKOFF_BASE))
+    raise LLMRateLimited()
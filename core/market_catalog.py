@@ -0,0 +1,109 @@
+# core/market_catalog.py
+"""
+마켓 카탈로그(market_items) 캐시 — mz_stock / mz_coin 의 종목 해석
+- 길드별로 활성(enabled=1) 항목만 1회 로드해 메모리에 보관 → 거래마다 DB 조회 없음
+- 관리자 편집/삭제/토글/복제/프리셋/Undo 경로에서 커밋 후 invalidate(gid)
+- 길드에 항목이 하나도 없으면 기본 종목(SEED_*)으로 채움
+- autocomplete(): 접두어 일치 우선, 그다음 부분 일치(공백/대소문자 무시), 최대 25개
+"""
+
+from typing import NamedTuple, Optional
+
+from core.db import read, write
+
+SEED_STOCKS = [
+    ("성현전자", -20.0,  20.0),
+    ("배달의 승기", -30.0, 30.0),
+    ("대이식스",  -10.0,  10.0),
+    ("재구식품",   -5.0,   5.0),
+]
+SEED_COINS = [
+    ("건영코인",  -60.0, 120.0),
+    ("면진코인", -120.0, 240.0),
+    ("승철코인", -200.0, 400.0),
+]
+TYPES = ("stock", "coin")
+MAX_CHOICES = 25    # Discord 자동완성 최대 개수
+
+class Item(NamedTuple):
+    name: str
+    lo: float
+    hi: float
+
+# gid → {type → {이름 → Item}} (활성 항목만, 이름순)
+_cache: dict[int, dict[str, dict[str, Item]]] = {}
+_generation = 0
+
+def _fold(s: str) -> str:
+    return "".join(s.split()).casefold()
+
+def generation() -> int:
+    """무효화될 때마다 증가(가격 엔진의 종목 재적재 신호)"""
+    return _generation
+
+def invalidate(gid: Optional[int] = None):
+    """gid=None이면 전체 무효화"""
+    global _generation
+    _generation += 1
+    if gid is None:
+        _cache.clear()
+    else:
+        _cache.pop(gid, None)
+
+async def ensure_seed(gid: int) -> bool:
+    """항목이 없으면 기본 종목 삽입. 삽입했으면 True"""
+    async with write() as db:
+        cur = await db.execute("SELECT COUNT(*) FROM market_items WHERE guild_id=?", (gid,))
+        if (await cur.fetchone())[0]:
+            return False
+        await db.executemany(
+            "INSERT OR IGNORE INTO market_items(guild_id,type,name,range_lo,range_hi,enabled) VALUES(?,?,?,?,?,1)",
+            [(gid, "stock", n, lo, hi) for (n, lo, hi) in SEED_STOCKS] +
+            [(gid, "coin", n, lo, hi) for (n, lo, hi) in SEED_COINS]
+        )
+        await db.commit()
+    invalidate(gid)
+    return True
+
+async def _load(gid: int) -> dict[str, dict[str, Item]]:
+    gen = _generation
+    async with read() as db:
+        cur = await db.execute(
+            "SELECT type, name, range_lo, range_hi, enabled FROM market_items WHERE guild_id=? ORDER BY type, name",
+            (gid,)
+        )
+        rows = await cur.fetchall()
+    if not rows and await ensure_seed(gid):
+        return await _load(gid)
+    cat: dict[str, dict[str, Item]] = {t: {} for t in TYPES}
+    for typ, name, lo, hi, en in rows:
+        if en and typ in cat:
+            cat[typ][name] = Item(name, float(lo), float(hi))
+    if gen == _generation:
+        _cache[gid] = cat
+    return cat
+
+async def items(gid: int, typ: str) -> dict[str, Item]:
+    cat = _cache.get(gid)
+    if cat is None:
+        cat = await _load(gid)
+    return cat.get(typ, {})
+
+async def lookup(gid: int, typ: str, symbol: str) -> Optional[Item]:
+    """정확한 이름 우선, 없으면 공백/대소문자 무시 일치(유일할 때만)"""
+    cat = await items(gid, typ)
+    hit = cat.get(symbol)
+    if hit is not None:
+        return hit
+    key = _fold(symbol or "")
+    found = [it for name, it in cat.items() if _fold(name) == key]
+    return found[0] if len(found) == 1 else None
+
+async def autocomplete(gid: int, typ: str, current: str) -> list[Item]:
+    cat = await items(gid, typ)
+    key = _fold(current or "")
+    if not key:
+        return list(cat.values())[:MAX_CHOICES]
+    prefix = [it for name, it in cat.items() if _fold(name).startswith(key)]
+    rest = [it for name, it in cat.items() if key in _fold(name) and not _fold(name).startswith(key)]
+    return (prefix + rest)[:MAX_CHOICES]
@@ -0,0 +1,19 @@
+# core/migrate.py
+"""
+기존 DB 보정 — models.sql 의 CREATE TABLE IF NOT EXISTS 로는 기존 테이블에 컬럼이 추가되지 않으므로
+init_db 에서 스키마 적용 직후 apply_migrations(db) 호출(없는 컬럼만 ALTER TABLE ADD COLUMN)
+"""
+
+# (테이블, 컬럼, 컬럼 정의)
+COLUMNS = (
+    ("guild_settings", "anim_mode", "TEXT NOT NULL DEFAULT 'full'"),
+    ("guild_settings", "tarot_mode", "TEXT NOT NULL DEFAULT 'ai'"),
+    ("guild_settings", "rate_limits", "TEXT NOT NULL DEFAULT ''"),
+)
+
+async def apply_migrations(db):
+    for table, column, ddl in COLUMNS:
+        cur = await db.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in await cur.fetchall()}:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    await db.commit()
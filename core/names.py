@@ -0,0 +1,134 @@
+# core/names.py
+"""
+표시 이름 해석 서비스(멤버 인텐트 없이 REST 호출 최소화)
+- 조회 순서: 길드 멤버 캐시 → LRU+TTL 메모리 캐시 → user_names 테이블 → query_members(게이트웨이, 최대 100명 일괄) → fetch_user(REST)
+- 상호작용마다 observe()로 호출자 이름을 갱신(변경분만 user_names 에 기록)
+- user_names 기록은 모아 두었다가 write() 블록 종료 훅에서 한 번에 UPSERT
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import discord
+
+from core.db import add_write_hook, read
+
+CACHE_MAX = 10_000
+TTL = 3600.0            # 이름 캐시 유효 시간(초)
+MISS_TTL = 300.0        # 해석 실패(placeholder) 캐시 유효 시간(초)
+QUERY_TIMEOUT = 3.0
+
+# 값 "" = 최근 해석 실패(MISS_TTL 동안 재조회하지 않음)
+_cache: "OrderedDict[tuple[int, int], tuple[str, float]]" = OrderedDict()
+_pending: dict[tuple[int, int], str] = {}
+
+def _get(gid: int, uid: int) -> Optional[str]:
+    hit = _cache.get((gid, uid))
+    if hit is None:
+        return None
+    name, exp = hit
+    if exp < time.monotonic():
+        return None     # 만료 항목은 remember() 의 변경 비교용으로 남겨 둠(LRU 로 정리)
+    _cache.move_to_end((gid, uid))
+    return name
+
+def _put(gid: int, uid: int, name: str, ttl: float = TTL):
+    _cache[(gid, uid)] = (name, time.monotonic() + ttl)
+    _cache.move_to_end((gid, uid))
+    while len(_cache) > CACHE_MAX:
+        _cache.popitem(last=False)
+
+def remember(gid: int, uid: int, name: str):
+    """확실한 이름(멤버/유저 객체에서 얻은 값) 기록 — 바뀐 경우만 DB 반영 대기열에 추가
+    (TTL 이 지난 항목도 이름 비교에는 사용 → 만료마다 같은 이름을 다시 기록하지 않음)"""
+    if not name:
+        return
+    hit = _cache.get((gid, uid))
+    if hit is None or hit[0] != name:
+        _pending[(gid, uid)] = name
+    _put(gid, uid, name)
+
+def observe(interaction: discord.Interaction):
+    """상호작용 호출자 이름 갱신(on_interaction 에서 호출)"""
+    if interaction.guild is None or interaction.user is None:
+        return
+    remember(interaction.guild.id, interaction.user.id, interaction.user.display_name)
+
+def peek(guild: discord.Guild, uid: int) -> Optional[str]:
+    """네트워크/DB 없이 알 수 있는 이름만(없으면 None)"""
+    m = guild.get_member(uid)
+    if m:
+        remember(guild.id, uid, m.display_name)
+        return m.display_name
+    return _get(guild.id, uid) or None
+
+async def resolve_many(guild: discord.Guild, client: Optional[discord.Client], uids: Iterable[int],
+                       default: str = "유저 {uid}") -> dict[int, str]:
+    gid = guild.id
+    out: dict[int, str] = {}
+    todo: list[int] = []
+    for uid in dict.fromkeys(uids):
+        name = peek(guild, uid)
+        if name is not None: out[uid] = name
+        elif _get(gid, uid) == "": out[uid] = default.format(uid=uid)
+        else: todo.append(uid)
+    if not todo:
+        return out
+
+    # user_names 테이블(일괄)
+    async with read() as db:
+        marks = ",".join("?" * len(todo))
+        cur = await db.execute(f"SELECT user_id, name FROM user_names WHERE guild_id=? AND user_id IN ({marks})", (gid, *todo))
+        for uid, name in await cur.fetchall():
+            out[uid] = name
+            _put(gid, uid, name)
+    todo = [u for u in todo if u not in out]
+
+    # 게이트웨이 일괄 조회(100명 단위)
+    for i in range(0, len(todo), 100):
+        chunk = todo[i:i + 100]
+        try:
+            members = await asyncio.wait_for(guild.query_members(user_ids=chunk, limit=len(chunk), cache=True), QUERY_TIMEOUT)
+        except Exception:
+            members = []
+        for m in members:
+            out[m.id] = m.display_name
+            remember(gid, m.id, m.display_name)
+    todo = [u for u in todo if u not in out]
+
+    # 길드를 떠난 사용자 등: REST
+    for uid in todo:
+        name = None
+        if client is not None:
+            try:
+                u = await client.fetch_user(uid)
+                name = getattr(u, "global_name", None) or u.name
+            except Exception:
+                name = None
+        if name:
+            remember(gid, uid, name)
+            out[uid] = name
+        else:
+            out[uid] = default.format(uid=uid)
+            _put(gid, uid, "", MISS_TTL)
+    return out
+
+async def resolve(guild: discord.Guild, client: Optional[discord.Client], uid: int,
+                  default: str = "유저 {uid}") -> str:
+    return (await resolve_many(guild, client, [uid], default))[uid]
+
+async def _flush(db):
+    if not _pending:
+        return
+    rows = [(gid, uid, name, int(time.time())) for (gid, uid), name in _pending.items()]
+    _pending.clear()
+    await db.executemany(
+        "INSERT INTO user_names(guild_id,user_id,name,updated_at) VALUES(?,?,?,?) "
+        "ON CONFLICT(guild_id,user_id) DO UPDATE SET name=excluded.name, updated_at=excluded.updated_at",
+        rows
+    )
+    await db.commit()
+
+add_write_hook(_flush, lambda: bool(_pending))
@@ -0,0 +1,132 @@
+# core/portfolio.py
+"""
+보유 포지션(positions) — 면진매수/면진매도/면진포트폴리오
+- 매수: 금액(₩)을 차감하고 현재가로 환산한 수량을 (길드, 사용자, 종목) 1행에 누적(원가 합도 함께)
+- 매도: 금액(₩, 0=전량)만큼 현재가로 팔아 잔액에 지급, 남은 수량/원가를 비례로 줄임
+- 현재가는 core.price_engine.prices() — 엔진이 꺼져 있으면 매수/매도 불가, 평가액은 None
+- 관리자가 삭제/비활성화한 종목은 delisted_price(): 마지막 기록 시세로, 기록도 없으면 남은 원가로 청산
+- 평가: 사용자 1명은 positions 1회 조회 + 가격 벡터 1회, 길드 전체는 1회 조회 + bincount 합산
+open_position/close_position 은 호출자의 트랜잭션(write 블록) 안에서 사용한다.
+"""
+
+import time
+from typing import NamedTuple, Optional
+
+from core import price_engine
+from core.balance import credit, debit_if_sufficient
+from core.db import read
+
+DELIST_LAST = "last"    # 마지막 기록 시세로 청산
+DELIST_COST = "cost"    # 기록 없음 → 남은 원가 환불
+DUST_QTY = 1e-9     # 이보다 적게 남으면 전량 매도로 처리
+
+class Holding(NamedTuple):
+    type: str
+    name: str
+    qty: float
+    cost: int                   # 남은 수량의 매수 원가(₩)
+    price: Optional[float]      # 현재 1주 가격 / 엔진 꺼짐·종목 삭제 시 None
+    value: Optional[int]        # 평가액(₩)
+
+# ───────── 매수/매도(호출자 트랜잭션) ─────────
+async def open_position(db, gid: int, uid: int, typ: str, name: str, amount: int, px: float) -> Optional[tuple[float, int]]:
+    """amount(₩)로 px 가격에 매수. (이번 매수 수량, 차감 후 잔액) / 잔액 부족이면 None"""
+    qty = amount / px
+    bal = await debit_if_sufficient(db, gid, uid, amount, "position_buy",
+                                    {"type": typ, "name": name, "qty": qty, "price": px})
+    if bal is None:
+        return None
+    now = int(time.time())
+    await db.execute(
+        "INSERT INTO positions(guild_id,user_id,type,name,qty,cost,opened_at,updated_at) VALUES(?,?,?,?,?,?,?,?) "
+        "ON CONFLICT(guild_id,user_id,type,name) DO UPDATE SET "
+        "qty=qty+excluded.qty, cost=cost+excluded.cost, updated_at=excluded.updated_at",
+        (gid, uid, typ, name, qty, amount, now, now)
+    )
+    return qty, bal
+
+async def close_position(db, gid: int, uid: int, typ: str, name: str, amount: int, px: float) -> Optional[tuple[float, int, int, int]]:
+    """amount(₩, 0=전량)만큼 px 가격에 매도. (매도 수량, 매도 대금, 실현 손익, 지급 후 잔액) / 보유 없으면 None"""
+    cur = await db.execute(
+        "SELECT qty, cost FROM positions WHERE guild_id=? AND user_id=? AND type=? AND name=?",
+        (gid, uid, typ, name)
+    )
+    row = await cur.fetchone()
+    if row is None:
+        return None
+    qty, cost = row
+    sell = qty if amount <= 0 else min(qty, amount / px)
+    if qty - sell < DUST_QTY:
+        sell = qty
+    proceeds = int(round(sell * px))
+    basis = cost if sell == qty else int(round(cost * sell / qty))
+    if sell == qty:
+        await db.execute(
+            "DELETE FROM positions WHERE guild_id=? AND user_id=? AND type=? AND name=?", (gid, uid, typ, name)
+        )
+    else:
+        await db.execute(
+            "UPDATE positions SET qty=?, cost=?, updated_at=? WHERE guild_id=? AND user_id=? AND type=? AND name=?",
+            (qty - sell, cost - basis, int(time.time()), gid, uid, typ, name)
+        )
+    pnl = proceeds - basis
+    bal = await credit(db, gid, uid, proceeds, "position_sell",
+                       {"type": typ, "name": name, "qty": sell, "price": px, "pnl": pnl})
+    return sell, proceeds, pnl, bal
+
+async def delisted_price(gid: int, uid: int, typ: str, name: str) -> Optional[tuple[float, str]]:
+    """엔진에 없는(삭제/비활성) 종목의 청산 가격 (1주 가격, DELIST_LAST|DELIST_COST) / 보유 없음이면 None"""
+    async with read() as db:
+        cur = await db.execute(
+            "SELECT qty, cost FROM positions WHERE guild_id=? AND user_id=? AND type=? AND name=?",
+            (gid, uid, typ, name)
+        )
+        row = await cur.fetchone()
+    if row is None:
+        return None
+    px = await price_engine.last_price(gid, typ, name)
+    if px is not None:
+        return px, DELIST_LAST
+    qty, cost = row
+    return cost / qty, DELIST_COST
+
+# ───────── 평가 ─────────
+async def holdings(gid: int, uid: int) -> list[Holding]:
+    """사용자 보유 목록(종류, 이름순) — positions 1회 조회, 가격은 한 번에 계산"""
+    async with read() as db:
+        cur = await db.execute(
+            "SELECT type, name, qty, cost FROM positions WHERE guild_id=? AND user_id=? ORDER BY type, name",
+            (gid, uid)
+        )
+        rows = await cur.fetchall()
+    cols = price_engine.columns([(gid, t, n) for t, n, _, _ in rows])
+    px = price_engine.prices(cols) if cols is not None else None
+    if px is None:
+        return [Holding(t, n, q, c, None, None) for t, n, q, c in rows]
+    out = []
+    for (t, n, q, c), p in zip(rows, px.tolist()):
+        if p != p:      # NaN — 엔진에 없는 종목(삭제/비활성)
+            out.append(Holding(t, n, q, c, None, None))
+        else:
+            out.append(Holding(t, n, q, c, p, int(round(q * p))))
+    return out
+
+async def guild_values(gid: int) -> Optional[dict[int, int]]:
+    """길드 전체 사용자별 평가액 합 {user_id: ₩} — 1회 조회 + 벡터 연산 / 엔진 꺼짐이면 None"""
+    if not price_engine.running():
+        return None
+    async with read() as db:
+        cur = await db.execute("SELECT user_id, type, name, qty FROM positions WHERE guild_id=?", (gid,))
+        rows = await cur.fetchall()
+    cols = price_engine.columns([(gid, t, n) for _, t, n, _ in rows])
+    px = price_engine.prices(cols) if cols is not None else None
+    if px is None:
+        return None
+    if not rows:
+        return {}
+    import numpy as np      # 엔진이 돌고 있으면 설치되어 있음
+    uids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    qty = np.fromiter((r[3] for r in rows), dtype=np.float64, count=len(rows))
+    users, inv = np.unique(uids, return_inverse=True)
+    totals = np.bincount(inv, weights=np.nan_to_num(qty * px))
+    return {int(u): int(v) for u, v in zip(users.tolist(), totals.tolist())}
@@ -0,0 +1,227 @@
+# core/price_engine.py
+"""
+마켓 가격 엔진 — 모든 길드의 market_items 종목 가격(지수)을 백그라운드에서 한 번에 갱신
+- 지수 L 은 %포인트 단위 평균 회귀(OU) 랜덤 워크: 틱마다 L = a·L + σ·Z  (a = 2^(-1/HALF_LIFE), NumPy 로 전 종목 동시 계산)
+  추세가 없어 범위가 비대칭이어도 지수가 한쪽으로 커지지 않음(정상 분포 표준편차 ≈ σ/√(1-a²))
+- 주문 등락 = μ·HORIZON + (L[t+HORIZON] - L[t]) — μ, σ 는 range_lo/range_hi 에서 유도,
+  평균 (lo+hi)/2, 표준편차 (hi-lo)/√12 (기존 uniform(lo, hi) 한 번 추첨과 같은 기댓값/분산)
+- 틱 번호 = 벽시계 기준 int(time / TICK) → 재시작해도 이어짐
+- 엔진은 현재 틱보다 LEAD 틱 앞서 계산해 둠 → 주문은 즉시 t..t+HORIZON 경로(quote)를 받아
+  연출은 실제 경로로, 정산은 위 등락을 [lo, hi] 로 잘라 확정(대기 없음)
+- 기록: CHUNK 틱마다 종목별 지수(실제 계산한 틱만)를 float64 BLOB 1행(market_ticks)으로 저장, KEEP_TICKS 이전은 삭제
+- 관리자 마켓 편집(market_catalog.invalidate) 시 다음 틱에 활성 종목/범위 재적재
+- 보유 포지션 평가용 가격: BASE_PRICE·exp(KAPPA·L/100) — 엔진에서 빠진(삭제/비활성) 종목은 last_price() 로 기록된 마지막 지수 기준
+  KAPPA 는 하루(DAY_TICKS) 로그 변동성이 주문 1건의 표준편차와 같아지도록 맞춤 → prices() 로 여러 종목을 한 번에 조회
+필요 패키지: pip install numpy (없으면 엔진 비활성 → 마켓은 기존 uniform 추첨)
+"""
+
+import asyncio
+import math
+import time
+from typing import NamedTuple, Optional
+
+from core import market_catalog
+from core.db import read, write
+
+TICK = 1.0              # 초
+HORIZON = 3             # 주문 1건이 걸치는 틱 수(= 연출 시간 / TICK)
+LEAD = HORIZON + 1      # 미리 계산해 두는 틱 수
+RING = 256              # 메모리에 보관하는 틱 수
+CHUNK = 60              # 기록 단위(틱)
+KEEP_TICKS = 24 * 3600  # 기록 보관 기간(틱)
+DAY_TICKS = int(24 * 3600 / TICK)
+BASE_PRICE = 10_000.0   # 지수 0 일 때 1주 가격(₩)
+KAPPA = (HORIZON / DAY_TICKS) ** 0.5
+HALF_LIFE = 3600        # 지수 평균 회귀 반감기(틱)
+REVERT = 2.0 ** (-1.0 / HALF_LIFE)
+
+class Quote(NamedTuple):
+    tick: int               # 진입 틱
+    path: tuple             # 진입 후 1..HORIZON 틱의 누적 변화(%p, 잘리기 전)
+    final: float            # 정산 등락률(%, [lo, hi] 로 자르고 소수 1자리)
+
+_np = None
+_keys: list[tuple[int, str, str]] = []          # 열 → (gid, type, name)
+_index: dict[tuple[int, str, str], int] = {}
+_lo = _hi = _mu = _sigma = None                 # 열별 파라미터(np.ndarray)
+_hist = None                                     # (RING, K) 지수 링 버퍼
+_computed = -1                                   # 계산 완료된 마지막 틱
+_first = -1                                      # 이번 실행(재시작 후)에서 처음 계산한 틱
+_catalog_gen = -1
+_task: Optional[asyncio.Task] = None
+_rng = None
+
+def _now_tick() -> int:
+    return int(time.time() // TICK)
+
+def running() -> bool:
+    return _task is not None and not _task.done() and _hist is not None
+
+# ───────── 종목 적재 ─────────
+async def _load_catalog():
+    """활성 market_items 전체 → 열 구성. 기존 열의 지수 기록은 유지, 새 종목은 마지막 기록 지수(없으면 0)부터"""
+    global _keys, _index, _lo, _hi, _mu, _sigma, _hist, _catalog_gen
+    np = _np
+    gen = market_catalog.generation()
+    async with read() as db:
+        cur = await db.execute(
+            "SELECT guild_id, type, name, range_lo, range_hi FROM market_items WHERE enabled=1 ORDER BY guild_id, type, name"
+        )
+        rows = await cur.fetchall()
+        # 이전 실행에서 기록된 마지막 지수(재시작 시 이어 붙이기)
+        cur = await db.execute(
+            "SELECT t.guild_id, t.type, t.name, t.levels FROM market_ticks t "
+            "JOIN (SELECT guild_id, type, name, MAX(start_tick) AS s FROM market_ticks GROUP BY guild_id, type, name) m "
+            "ON t.guild_id=m.guild_id AND t.type=m.type AND t.name=m.name AND t.start_tick=m.s"
+        )
+        last = {(g, ty, n): float(np.frombuffer(b, dtype=np.float64)[-1]) for g, ty, n, b in await cur.fetchall() if b}
+
+    keys = [(g, ty, n) for g, ty, n, _, _ in rows]
+    lo = np.array([r[3] for r in rows], dtype=np.float64)
+    hi = np.array([r[4] for r in rows], dtype=np.float64)
+    hist = np.zeros((RING, len(keys)), dtype=np.float64)
+    for j, k in enumerate(keys):
+        i = _index.get(k)
+        if i is not None and _hist is not None:
+            hist[:, j] = _hist[:, i]
+        else:
+            hist[:, j] = last.get(k, 0.0)
+
+    _keys, _index = keys, {k: j for j, k in enumerate(keys)}
+    _lo, _hi = lo, hi
+    _mu = (lo + hi) / 2.0 / HORIZON
+    _sigma = (hi - lo) / np.sqrt(12.0) / np.sqrt(HORIZON)
+    _hist = hist
+    _catalog_gen = gen
+
+# ───────── 틱 ─────────
+def advance(upto: int):
+    """_computed+1 .. upto 틱을 한 번에 계산(전 종목 벡터 연산)
+    OU 점화식 L_k = a^k·(L_0 + Σ_{j≤k} a^-j·z_j) 를 누적합 한 번으로"""
+    global _computed, _first
+    np = _np
+    n = upto - _computed
+    if n <= 0 or _hist is None:
+        return
+    if _computed < 0 or n > RING - LEAD:
+        # 처음이거나 너무 오래 멈춰 있었음 → 마지막 지수에서 다시 시작
+        base = _hist[_computed % RING if _computed >= 0 else 0].copy()
+        n = LEAD + 1
+        _computed = upto - n
+        _hist[_computed % RING] = base
+        _first = _computed + 1
+    z = _sigma * _rng.standard_normal((n, len(_keys)))
+    pw = (REVERT ** np.arange(1, n + 1))[:, None]
+    rows = (np.arange(_computed + 1, upto + 1)) % RING
+    _hist[rows] = pw * (_hist[_computed % RING] + np.cumsum(z / pw, axis=0))
+    _computed = upto
+
+def quote(gid: int, typ: str, name: str) -> Optional[Quote]:
+    """지금 들어가는 주문의 경로/정산값 / 엔진이 꺼져 있거나 모르는 종목이면 None"""
+    if not running():
+        return None
+    j = _index.get((gid, typ, name))
+    t = _now_tick()
+    if j is None or _computed < t + HORIZON:
+        return None
+    base = _hist[t % RING, j]
+    path = tuple(float(_mu[j] * i + _hist[(t + i) % RING, j] - base) for i in range(1, HORIZON + 1))
+    final = round(min(max(path[-1], float(_lo[j])), float(_hi[j])), 1)
+    return Quote(t, path, final)
+
+def columns(keys):
+    """(gid, type, name) 목록 → 엔진 열 번호 배열(모르는 종목 -1) / 엔진이 꺼져 있으면 None"""
+    if not running():
+        return None
+    return _np.fromiter((_index.get(k, -1) for k in keys), dtype=_np.int64, count=len(keys))
+
+def prices(cols):
+    """열 번호 배열 → 현재 틱 1주 가격(₩, float64) 배열, 모르는 종목(-1)은 NaN / 엔진이 꺼져 있으면 None"""
+    if not running() or _computed < _now_tick():
+        return None
+    np = _np
+    cols = np.asarray(cols, dtype=np.int64)
+    known = cols >= 0
+    out = np.full(cols.shape, np.nan)
+    out[known] = BASE_PRICE * np.exp(KAPPA * _hist[_now_tick() % RING, cols[known]] / 100.0)
+    return out
+
+def price(gid: int, typ: str, name: str) -> Optional[float]:
+    """한 종목의 현재 1주 가격 / 엔진이 꺼져 있거나 모르는 종목이면 None"""
+    cols = columns([(gid, typ, name)])
+    p = prices(cols) if cols is not None else None
+    if p is None or _np.isnan(p[0]):
+        return None
+    return float(p[0])
+
+async def last_price(gid: int, typ: str, name: str) -> Optional[float]:
+    """market_ticks 에 기록된 마지막 지수 기준 1주 가격 — 삭제/비활성 종목 청산용 / 엔진 꺼짐·기록 없음이면 None"""
+    if not running():
+        return None
+    async with read() as db:
+        cur = await db.execute(
+            "SELECT levels FROM market_ticks WHERE guild_id=? AND type=? AND name=? ORDER BY start_tick DESC LIMIT 1",
+            (gid, typ, name)
+        )
+        row = await cur.fetchone()
+    if not row or not row[0]:
+        return None
+    return BASE_PRICE * math.exp(KAPPA * float(_np.frombuffer(row[0], dtype=_np.float64)[-1]) / 100.0)
+
+# ───────── 기록 ─────────
+async def _persist(end_tick: int):
+    """end_tick 까지의 마지막 CHUNK 틱(이번 실행에서 계산한 틱만)을 종목별 1행으로 저장"""
+    start = max(end_tick - CHUNK + 1, _first)
+    if _first < 0 or start > end_tick:
+        return
+    rows = (_np.arange(start, end_tick + 1)) % RING
+    block = _hist[rows]     # (≤CHUNK, K)
+    data = [(g, ty, n, start, block[:, j].tobytes()) for j, (g, ty, n) in enumerate(_keys)]
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.executemany(
+            "INSERT OR REPLACE INTO market_ticks(guild_id,type,name,start_tick,levels) VALUES(?,?,?,?,?)", data
+        )
+        await db.execute("DELETE FROM market_ticks WHERE start_tick<?", (end_tick - KEEP_TICKS,))
+        await db.commit()
+
+async def _run():
+    last_saved = _now_tick() // CHUNK
+    while True:
+        now = _now_tick()
+        try:
+            if market_catalog.generation() != _catalog_gen:
+                await _load_catalog()
+            advance(now + LEAD)
+            chunk = now // CHUNK
+            if chunk != last_saved and _keys:
+                last_saved = chunk
+                await _persist(chunk * CHUNK - 1)
+        except Exception as e:
+            print(f"[price_engine] tick failed: {e!r}")
+        await asyncio.sleep((now + 1) * TICK - time.time())
+
+def start_price_engine() -> bool:
+    """numpy 가 없으면 False(마켓은 uniform 추첨으로 동작)"""
+    global _np, _rng, _task
+    if running():
+        return True
+    try:
+        import numpy
+    except ImportError:
+        print("[price_engine] numpy not installed — markets use per-order random draws")
+        return False
+    _np, _rng = numpy, numpy.random.default_rng()
+    _task = asyncio.create_task(_run())
+    return True
+
+async def stop_price_engine():
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,136 @@
+# core/ratelimit.py
+"""
+명령 레이트 리밋(메모리 토큰 버킷) — bot.tree 의 interaction_check 에서 DB/네트워크 작업 전에 검사
+- 버킷: (길드, 사용자, 명령 분류) + (길드, 명령 분류) 두 개를 모두 통과해야 실행
+- 분류(COMMAND_CLASSES): gamble / enhance / llm / default
+- main/mini 에서 commands.Bot(tree_cls=LimitedTree) 로 등록, 버튼 뷰는 interaction_check(…, cls) 를 직접 호출
+- 한도 "횟수/초" — 기본값 DEFAULTS, 길드 설정 rate_limits 로 덮어쓰기
+  예) "gamble=3/10, llm=2/30, gamble.guild=40/10"  (".guild" 가 붙으면 길드 전체 한도)
+"""
+
+import time
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+from core import guild_settings
+
+# 명령 이름 → 분류(없으면 default)
+COMMAND_CLASSES = {
+    "mz_bet": "gamble", "mz_bet_batch": "gamble", "mz_stock": "gamble", "mz_coin": "gamble", "mz_duel": "gamble",
+    "mz_tournament": "gamble",
+    "mz_buy": "gamble", "mz_sell": "gamble",
+    "mz_enhance": "enhance",
+    "mz_gemini": "llm", "mz_tarot": "llm", "mz_genie": "llm",
+}
+# 분류 → {"user": (횟수, 초), "guild": (횟수, 초)}
+DEFAULTS = {
+    "gamble":  {"user": (5, 10.0),  "guild": (60, 10.0)},
+    "enhance": {"user": (8, 10.0),  "guild": (80, 10.0)},
+    "llm":     {"user": (2, 20.0),  "guild": (10, 20.0)},
+    "default": {"user": (10, 10.0), "guild": (120, 10.0)},
+}
+_PRUNE_EVERY = 1024
+_IDLE_DROP = 600.0      # 이만큼 안 쓴 버킷은 정리(이미 가득 찬 상태와 같음)
+
+class _Bucket:
+    __slots__ = ("tokens", "stamp")
+    def __init__(self, burst: float, now: float):
+        self.tokens, self.stamp = burst, now
+
+# (gid, uid | None, 분류) → 버킷 / uid=None 은 길드 버킷
+_buckets: dict[tuple, _Bucket] = {}
+_parsed: dict[str, dict] = {}
+_calls = 0
+
+def parse(spec: str) -> dict:
+    """ "gamble=3/10, llm.guild=5/30" → {"gamble": {"user": (3, 10.0)}, "llm": {"guild": (5, 30.0)}} (형식 오류는 ValueError)"""
+    out: dict[str, dict] = {}
+    for part in (spec or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key, _, val = part.partition("=")
+        cls, _, scope = key.strip().lower().partition(".")
+        scope = scope or "user"
+        if cls not in DEFAULTS or scope not in ("user", "guild"):
+            raise ValueError(f"unknown rate limit key: {key.strip()}")
+        count, _, per = val.partition("/")
+        count, per = int(count), float(per or 1)
+        if count < 1 or per <= 0:
+            raise ValueError(f"invalid rate limit: {part}")
+        out.setdefault(cls, {})[scope] = (count, per)
+    return out
+
+def limits_for(spec: str, cls: str) -> dict:
+    ov = _parsed.get(spec)
+    if ov is None:
+        try:
+            ov = parse(spec)
+        except ValueError:
+            ov = {}
+        _parsed[spec] = ov
+    return {**DEFAULTS[cls], **ov.get(cls, {})}
+
+def _try_take(key: tuple, count: int, per: float, now: float) -> float:
+    """토큰 1개 차감 시도 — 성공 0.0 / 실패 시 다음 토큰까지 남은 초(차감 안 함)"""
+    b = _buckets.get(key)
+    rate = count / per
+    if b is None:
+        b = _buckets[key] = _Bucket(float(count), now)
+    else:
+        b.tokens = min(float(count), b.tokens + (now - b.stamp) * rate)
+        b.stamp = now
+    if b.tokens >= 1:
+        return 0.0
+    return (1 - b.tokens) / rate
+
+def _prune(now: float):
+    for k in [k for k, b in _buckets.items() if now - b.stamp > _IDLE_DROP]:
+        _buckets.pop(k, None)
+
+def command_class(name: Optional[str]) -> str:
+    return COMMAND_CLASSES.get(name or "", "default")
+
+def check(gid: int, uid: int, cls: str, spec: str = "") -> float:
+    """통과 시 0.0(두 버킷 모두 차감) / 거부 시 재시도까지 남은 초"""
+    global _calls
+    now = time.monotonic()
+    lim = limits_for(spec, cls)
+    ukey, gkey = (gid, uid, cls), (gid, None, cls)
+    wait = max(_try_take(ukey, *lim["user"], now), _try_take(gkey, *lim["guild"], now))
+    if wait == 0.0:
+        _buckets[ukey].tokens -= 1
+        _buckets[gkey].tokens -= 1
+    _calls += 1
+    if _calls % _PRUNE_EVERY == 0:
+        _prune(now)
+    return wait
+
+async def interaction_check(interaction: discord.Interaction, cls: Optional[str] = None) -> bool:
+    """거부 시 에페메랄 안내 후 False. cls 생략 시 명령 이름으로 분류"""
+    if interaction.guild_id is None or interaction.user is None:
+        return True
+    if interaction.type is discord.InteractionType.autocomplete:
+        return True     # 자동완성은 입력 중 연속 호출 — 한도에서 제외
+    cls = cls or command_class(getattr(interaction.command, "qualified_name", None))
+    s = await guild_settings.get(interaction.guild_id)    # 보통 캐시 적중, 첫 조회/버전 확인 때만 reader 1회
+    spec = s.rate_limits
+    wait = check(interaction.guild_id, interaction.user.id, cls, spec)
+    if wait == 0.0:
+        return True
+    msg = f"요청이 너무 잦습니다. {wait:.1f}초 후 다시 시도해 주세요."
+    try:
+        if interaction.response.is_done():
+            await interaction.followup.send(msg, ephemeral=True)
+        else:
+            await interaction.response.send_message(msg, ephemeral=True)
+    except Exception:
+        pass
+    return False
+
+class LimitedTree(app_commands.CommandTree):
+    """모든 슬래시 명령 앞단의 전역 한도 검사"""
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        return await interaction_check(interaction)
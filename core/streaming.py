@@ -0,0 +1,83 @@
+# core/streaming.py
+"""
+LLM 스트림 → Discord 메시지 점진 편집
+- 첫 조각은 즉시 전송(체감 지연 = 첫 토큰 도착 시각)
+- 이후 조각은 모아 두었다가 EDIT_INTERVAL 마다 한 번만 편집(메시지 편집 한도 보호)
+- 한 메시지가 PAGE_LIMIT 를 넘으면 줄바꿈 경계에서 잘라 새 메시지로 이어 씀
+- 진행 중에는 마지막 메시지 끝에 CURSOR 표시, 끝나면 제거
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+EDIT_INTERVAL = 1.0     # 같은 스트림 편집 최소 간격(초)
+PAGE_LIMIT = 1990       # Discord 2000자 - 커서 여유
+CURSOR = " ▌"
+
+def _append(pages: list[str], piece: str, limit: int = PAGE_LIMIT):
+    pages[-1] += piece
+    while len(pages[-1]) > limit:
+        text = pages[-1]
+        cut = text.rfind("\n", 0, limit)
+        if cut < limit // 2:        # 적당한 줄바꿈이 없으면 글자 수로 자름
+            cut = limit
+        pages[-1], rest = text[:cut], text[cut:].lstrip("\n")
+        pages.append(rest)
+
+async def relay(pieces: AsyncIterable[str], send: Callable[[str], Awaitable[Any]],
+                interval: float = EDIT_INTERVAL) -> str:
+    """
+    pieces 를 메시지로 흘려 보낸다. send(content) → 편집 가능한 메시지(.edit(content=...))
+    반환: 받은 조각을 그대로 이은 전체 텍스트(페이지 경계에서 버린 줄바꿈 포함)
+          조각이 하나도 없으면 "" — 이때는 아무것도 보내지 않음
+    스트림 예외는 지금까지 받은 내용을 확정 편집한 뒤 그대로 전파
+    """
+    pages = [""]
+    received: list[str] = []     # 원문 — pages 는 표시용(경계 줄바꿈 제거)
+    msgs: list[Any] = []
+    shown: list[str] = []
+    dirty = asyncio.Event()
+    done = False
+
+    async def pump():
+        nonlocal done
+        try:
+            async for piece in pieces:
+                if piece:
+                    received.append(piece)
+                    _append(pages, piece)
+                    dirty.set()
+        finally:
+            done = True
+            dirty.set()
+
+    async def sync(final: bool):
+        for i, text in enumerate(pages):
+            if not text.strip():    # 공백뿐인 페이지는 마지막 페이지뿐 → 내용이 생길 때까지 보류
+                break
+            content = text if final or i < len(pages) - 1 else text + CURSOR
+            if i >= len(msgs):
+                msgs.append(await send(content))
+                shown.append(content)
+            elif shown[i] != content:
+                await msgs[i].edit(content=content)
+                shown[i] = content
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            await dirty.wait()
+            dirty.clear()
+            final = done
+            await sync(final)
+            if final:
+                break
+            await asyncio.sleep(interval)
+    finally:
+        if not task.done():
+            task.cancel()
+        try:
+            await task     # 스트림 예외 전파
+        except asyncio.CancelledError:
+            pass
+    return "".join(received)
@@ -0,0 +1,234 @@
+# core/tarot_engine.py
+"""
+오프라인 타로 해석 엔진(네트워크 없음, 즉시 응답)
+- MEANINGS: 78장 × 정/역방향 의미표 — 모듈 로드 시 1회 구성
+  (메이저 22장은 개별 정의, 마이너 56장은 수트(영역) × 랭크(단계) 조합)
+- interpret(): 스프레드 위치(Advice / Past / Present / Future)별 문장 틀로 해석문 생성
+- mz_tarot 의 Gemini 폴백, 또는 길드 설정 tarot_mode=fast 일 때 기본 엔진
+"""
+
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+MODES = ("ai", "fast")  # 길드 설정 tarot_mode: ai=Gemini(실패 시 이 엔진) / fast=항상 이 엔진
+
+class Meaning(NamedTuple):
+    keywords: str   # 한 줄 키워드
+    text: str       # 의미(1~2문장)
+    advice: str     # 조언(명령형 한 문장)
+
+# ───────── 메이저 아르카나 ─────────
+# 카드: ((정방향 키워드, 의미, 조언), (역방향 키워드, 의미, 조언))
+_MAJOR = {
+    "The Fool": (
+        ("새 출발·가능성·자유", "익숙한 틀을 벗어나 새로운 길에 들어서는 시기입니다.", "완벽한 준비를 기다리기보다 작은 첫걸음을 떼 보세요."),
+        ("무모함·준비 부족", "의욕은 앞서지만 기본 점검이 빠져 있을 수 있습니다.", "출발 전에 위험 요소를 한 번 더 확인하세요."),
+    ),
+    "The Magician": (
+        ("실행력·재능·집중", "필요한 도구와 능력은 이미 손에 있습니다.", "가진 자원을 목록으로 정리하고 바로 실행에 옮기세요."),
+        ("산만함·과장·잠재력 낭비", "능력은 있지만 방향이 흩어져 결과로 이어지지 않습니다.", "한 가지 목표에만 힘을 모으세요."),
+    ),
+    "The High Priestess": (
+        ("직관·내면의 지혜·관찰", "드러난 정보보다 조용히 느껴지는 감각이 더 정확할 수 있습니다.", "결정을 서두르지 말고 스스로의 느낌을 기록해 보세요."),
+        ("혼란·감춰진 정보", "중요한 사실이 아직 드러나지 않았거나 직감을 외면하고 있습니다.", "확인되지 않은 말에 기대지 말고 사실부터 모으세요."),
+    ),
+    "The Empress": (
+        ("풍요·돌봄·성장", "노력한 만큼 결실이 자라나는 안정적인 흐름입니다.", "자신과 주변을 여유 있게 챙기며 꾸준히 가꾸세요."),
+        ("정체·과보호·의존", "지나친 배려나 안주가 성장을 막고 있을 수 있습니다.", "남을 돌보는 만큼 자신의 필요도 챙기세요."),
+    ),
+    "The Emperor": (
+        ("질서·책임·리더십", "구조와 원칙을 세우면 상황을 주도할 수 있습니다.", "규칙과 일정을 분명히 정하고 지키세요."),
+        ("경직·통제 과잉", "고집이나 지나친 통제가 갈등을 만들고 있습니다.", "방식을 강요하기보다 다른 의견을 한 번 들어 보세요."),
+    ),
+    "The Hierophant": (
+        ("전통·배움·조언자", "검증된 방법과 믿을 만한 조언이 도움이 됩니다.", "경험 많은 사람에게 구체적으로 물어보세요."),
+        ("관습 탈피·형식주의", "기존 방식이 더 이상 맞지 않거나 형식에 얽매여 있습니다.", "정해진 방식이 지금도 유효한지 다시 따져 보세요."),
+    ),
+    "The Lovers": (
+        ("선택·조화·관계", "마음이 가는 방향과 가치관이 맞닿는 선택의 순간입니다.", "무엇을 중요하게 여기는지 기준을 먼저 세우고 고르세요."),
+        ("갈등·불균형·망설임", "관계나 선택에서 서로의 기대가 어긋나 있습니다.", "숨기지 말고 원하는 것을 솔직하게 이야기하세요."),
+    ),
+    "The Chariot": (
+        ("추진력·의지·승리", "분명한 목표와 의지로 장애물을 돌파할 수 있습니다.", "방향을 정했다면 흔들리지 말고 밀고 나가세요."),
+        ("방향 상실·조급함", "힘은 있지만 통제가 되지 않아 이리저리 끌려다닙니다.", "속도를 늦추고 목표를 다시 한 문장으로 정리하세요."),
+    ),
+    "Strength": (
+        ("인내·부드러운 힘·자제", "힘으로 누르기보다 차분함과 인내가 상황을 바꿉니다.", "감정을 다독이며 꾸준함으로 버티세요."),
+        ("자신감 저하·감정 기복", "스스로를 의심하거나 감정에 휘둘리기 쉬운 때입니다.", "작은 성공을 쌓아 자신감을 회복하세요."),
+    ),
+    "The Hermit": (
+        ("성찰·탐구·혼자만의 시간", "한발 물러나 깊이 생각할 때 답이 보입니다.", "잠시 소음을 줄이고 혼자 정리할 시간을 확보하세요."),
+        ("고립·회피", "혼자 있는 시간이 길어져 필요한 도움까지 밀어내고 있습니다.", "믿을 만한 사람 한 명에게 현재 상황을 나눠 보세요."),
+    ),
+    "Wheel of Fortune": (
+        ("전환점·흐름·기회", "상황이 바뀌는 흐름에 올라탈 수 있는 시점입니다.", "변화를 두려워하지 말고 찾아온 기회를 잡으세요."),
+        ("불운·정체·통제 밖의 변화", "뜻대로 되지 않는 흐름이 이어지지만 영원하지는 않습니다.", "통제할 수 있는 것과 없는 것을 구분해 대응하세요."),
+    ),
+    "Justice": (
+        ("공정·균형·책임", "원인과 결과가 분명하게 드러나는 시기입니다.", "사실과 기준에 따라 공정하게 판단하세요."),
+        ("불균형·편향·책임 회피", "한쪽으로 치우친 판단이나 미뤄 둔 책임이 문제입니다.", "자신의 몫을 인정하고 균형을 되찾으세요."),
+    ),
+    "The Hanged Man": (
+        ("관점 전환·기다림·내려놓음", "잠시 멈추고 다른 각도에서 보면 새 답이 보입니다.", "억지로 움직이기보다 시선을 바꿔 보세요."),
+        ("지연·헛된 희생", "기다림이 길어지며 의미 없는 희생이 되고 있습니다.", "계속 버틸지 방향을 바꿀지 기한을 정하세요."),
+    ),
+    "Death": (
+        ("끝과 시작·정리·변화", "하나의 단계가 끝나고 새 단계가 열립니다.", "이미 끝난 것은 정리하고 다음을 준비하세요."),
+        ("변화 거부·미련", "끝난 일을 붙잡고 있어 새 흐름이 막혀 있습니다.", "놓아야 할 것 하나를 정해 정리해 보세요."),
+    ),
+    "Temperance": (
+        ("조율·절제·회복", "극단을 피하고 균형을 맞출 때 일이 순조롭습니다.", "속도와 양을 조절하며 꾸준히 섞어 가세요."),
+        ("불균형·과잉", "한쪽으로 지나치게 쏠려 리듬이 깨져 있습니다.", "무엇이 과한지 찾아 줄이는 것부터 시작하세요."),
+    ),
+    "The Devil": (
+        ("집착·유혹·속박", "습관이나 욕망에 묶여 선택의 폭이 좁아져 있습니다.", "나를 붙잡는 것이 무엇인지 정확히 이름 붙여 보세요."),
+        ("해방·집착에서 벗어남", "얽매였던 것에서 풀려날 계기가 생깁니다.", "벗어나기로 했다면 작은 행동으로 바로 끊어 내세요."),
+    ),
+    "The Tower": (
+        ("급변·붕괴·각성", "예상치 못한 변화로 기존 구조가 흔들립니다.", "무너진 자리를 기회 삼아 더 단단하게 다시 세우세요."),
+        ("위기 회피·미뤄진 변화", "필요한 변화를 미루며 불안을 키우고 있습니다.", "피할 수 없는 변화라면 먼저 준비하세요."),
+    ),
+    "The Star": (
+        ("희망·회복·영감", "어려움 뒤에 회복과 새로운 희망이 찾아옵니다.", "장기적인 목표를 떠올리며 천천히 회복하세요."),
+        ("낙담·의욕 저하", "기대가 꺾여 스스로를 믿기 어려운 때입니다.", "아주 작은 목표부터 다시 세워 보세요."),
+    ),
+    "The Moon": (
+        ("불확실·불안·상상", "상황이 흐릿해 오해와 불안이 커지기 쉽습니다.", "추측보다 확인된 정보에 기대어 판단하세요."),
+        ("혼란 해소·진실 드러남", "가려졌던 것이 드러나며 불안이 걷히기 시작합니다.", "드러난 사실을 차분히 받아들이고 정리하세요."),
+    ),
+    "The Sun": (
+        ("성공·활력·명확함", "밝고 분명한 흐름 속에서 좋은 결과가 기대됩니다.", "자신감을 갖고 적극적으로 드러내세요."),
+        ("일시적 흐림·과신", "좋은 흐름이지만 기대만큼 빛나지 않거나 과신이 문제입니다.", "기대치를 현실적으로 조정하세요."),
+    ),
+    "Judgement": (
+        ("재평가·부름·결단", "지난 일을 돌아보고 새로운 결단을 내릴 때입니다.", "과거의 교훈을 정리해 다음 선택에 반영하세요."),
+        ("자기 의심·결정 미루기", "스스로를 지나치게 평가하며 결단을 미루고 있습니다.", "완벽한 답 대신 충분히 좋은 답을 고르세요."),
+    ),
+    "The World": (
+        ("완성·성취·통합", "하나의 여정이 마무리되고 성과를 거둡니다.", "이룬 것을 인정하고 다음 목표로 넘어가세요."),
+        ("미완성·마무리 부족", "거의 다 왔지만 마지막 한 단계가 남아 있습니다.", "남은 일을 목록으로 만들어 끝까지 마무리하세요."),
+    ),
+}
+
+# ───────── 마이너 아르카나: 수트(영역) × 랭크(단계) ─────────
+# 수트: (영역, 정방향 성향, 역방향 성향)
+_SUITS = {
+    "Wands":     ("열정·일·도전", "의욕과 추진력", "조급함이나 소진"),
+    "Cups":      ("감정·관계", "마음의 교류", "감정의 막힘이나 서운함"),
+    "Swords":    ("생각·판단·갈등", "명료한 판단", "걱정과 날 선 말"),
+    "Pentacles": ("돈·현실·생활", "꾸준한 실속", "손실에 대한 불안이나 인색함"),
+}
+# 랭크: (정방향 키워드, 정방향 의미 틀, 역방향 키워드, 역방향 의미 틀, 정 조언, 역 조언) — {area}/{up}/{down} 치환
+_RANKS = {
+    "Ace":   ("시작·씨앗", "{area} 영역에서 새로운 기회가 싹틉니다. '{up}'의 기운이 살아나는 출발점입니다.",
+              "시작 지연", "{area} 영역의 새 기회가 아직 무르익지 않았습니다. '{down}' 탓에 출발이 늦어집니다.",
+              "작게라도 바로 시작해 보세요.", "조건이 갖춰질 때까지 준비에 집중하세요."),
+    "Two":   ("선택·균형", "{area} 영역에서 두 갈래 사이의 균형을 잡는 시기입니다.",
+              "결정 장애", "{area} 영역에서 선택을 미루며 제자리에 머물러 있습니다.",
+              "두 선택지의 장단점을 나란히 적어 보세요.", "기한을 정해 하나를 고르세요."),
+    "Three": ("협력·첫 성과", "{area} 영역에서 함께할 때 첫 결실이 보입니다.",
+              "엇박자", "{area} 영역에서 협력이 어긋나 성과가 늦어집니다.",
+              "도움을 구하고 역할을 나누세요.", "누가 무엇을 맡는지 다시 정리하세요."),
+    "Four":  ("안정·휴식", "{area} 영역이 안정되어 숨을 고를 수 있습니다.",
+              "정체·안주", "{area} 영역에서 안정이 지나쳐 흐름이 멈췄습니다. '{down}' 여부를 살펴보세요.",
+              "지금의 안정을 지키며 재정비하세요.", "편안함에서 한 걸음만 벗어나 보세요."),
+    "Five":  ("시련·갈등", "{area} 영역에서 부딪힘과 손실이 생기지만 배울 점이 있습니다.",
+              "회복의 시작", "{area} 영역의 어려움이 가라앉으며 회복이 시작됩니다.",
+              "감정적으로 대응하지 말고 잃은 것과 남은 것을 구분하세요.", "지난 갈등에서 교훈만 남기고 털어 내세요."),
+    "Six":   ("회복·나눔", "{area} 영역에서 주고받음이 원활해지며 회복됩니다. '{up}'의 기운이 돌아옵니다.",
+              "불균형한 주고받음", "{area} 영역에서 주고받음이 한쪽으로 치우쳐 있습니다.",
+              "받은 도움은 갚고 나눌 수 있는 것은 나누세요.", "기브앤테이크의 균형을 점검하세요."),
+    "Seven": ("점검·인내", "{area} 영역에서 지금까지의 과정을 점검하며 버텨야 합니다.",
+              "지침·혼선", "{area} 영역에서 '{down}' 때문에 방향을 잃기 쉽습니다.",
+              "장기적인 관점에서 우선순위를 다시 매기세요.", "할 일을 줄이고 핵심 하나에 집중하세요."),
+    "Eight": ("진전·몰입", "{area} 영역에서 일이 빠르게 진전되고 몰입이 쌓입니다.",
+              "지연·반복", "{area} 영역에서 같은 문제가 되풀이되며 속도가 떨어집니다.",
+              "흐름이 좋을 때 꾸준히 반복하세요.", "반복되는 원인을 찾아 방식을 바꾸세요."),
+    "Nine":  ("성숙·막바지", "{area} 영역에서 거의 원하는 자리에 도달했습니다.",
+              "불안·과부하", "{area} 영역에서 '{down}' 때문에 마음이 무겁습니다.",
+              "마지막까지 긴장을 놓지 마세요.", "걱정을 적어 보고 실제로 할 수 있는 것만 남기세요."),
+    "Ten":   ("완결·정점", "{area} 영역의 한 주기가 정점에 이르며 마무리됩니다.",
+              "과중·끝맺음 지연", "{area} 영역에서 짐이 너무 많아 끝을 맺지 못하고 있습니다.",
+              "성과를 정리하고 다음 주기를 준비하세요.", "내려놓을 짐을 골라 덜어 내세요."),
+    "Page":  ("소식·배움", "{area} 영역에서 새로운 소식이나 배움의 기회가 옵니다.",
+              "미숙함", "{area} 영역에서 경험 부족이 드러납니다.",
+              "호기심을 갖고 배우는 자세로 다가가세요.", "모르는 것은 인정하고 기초부터 다지세요."),
+    "Knight": ("행동·이동", "{area} 영역에서 빠르게 움직이며 일을 밀어붙입니다. '{up}'의 기운이 강해집니다.",
+               "성급함", "{area} 영역에서 서두르다 실수가 생기기 쉽습니다.",
+               "속도를 살리되 방향을 확인하며 나아가세요.", "행동 전에 한 번만 더 점검하세요."),
+    "Queen": ("성숙한 돌봄·통찰", "{area} 영역을 안정적으로 다루는 성숙함이 돋보입니다.",
+              "감정 소모", "{area} 영역에서 남을 챙기느라 자신이 지쳐 있습니다.",
+              "차분하게 주변을 살피며 중심을 지키세요.", "자신을 먼저 돌보는 시간을 확보하세요."),
+    "King":  ("주도·완숙", "{area} 영역을 책임지고 이끌 역량이 갖춰졌습니다.",
+              "독단·통제", "{area} 영역에서 통제하려는 마음이 지나쳐 반발을 부릅니다.",
+              "경험을 믿고 결정권을 행사하세요.", "권한을 나누고 다른 의견을 받아들이세요."),
+}
+
+def _compile() -> dict:
+    table: dict[Tuple[str, bool], Meaning] = {}
+    for card, (up, rev) in _MAJOR.items():
+        table[(card, False)] = Meaning(*up)
+        table[(card, True)] = Meaning(*rev)
+    for suit, (area, up, down) in _SUITS.items():
+        for rank, (kw, txt, rkw, rtxt, adv, radv) in _RANKS.items():
+            card = f"{rank} of {suit}"
+            fill = {"area": area, "up": up, "down": down}
+            table[(card, False)] = Meaning(f"{kw} · {area}", txt.format(**fill), adv)
+            table[(card, True)] = Meaning(f"{rkw} · {area}", rtxt.format(**fill), radv)
+    return table
+
+MEANINGS = _compile()   # (카드명, 역방향) → Meaning, 156항목
+
+# ───────── 위치별 문장 틀 ─────────
+_POSITION = {
+    "Advice":  "지금 필요한 조언은 '{kw}'입니다.",
+    "Past":    "과거에는 '{kw}'의 흐름이 지금 상황의 바탕이 되었습니다.",
+    "Present": "현재는 '{kw}'의 기운이 중심에 있습니다.",
+    "Future":  "앞으로는 '{kw}' 쪽으로 흘러갈 가능성이 큽니다.",
+}
+_POSITION_KO = {"Advice": "조언", "Past": "과거", "Present": "현재", "Future": "미래"}
+_FLOW = {
+    (False, False): "과거의 흐름이 미래까지 순조롭게 이어지는 구조입니다.",
+    (False, True):  "좋았던 흐름이 앞으로 막힐 수 있으니 지금 점검이 필요합니다.",
+    (True, False):  "지난 어려움이 정리되며 앞으로는 나아지는 흐름입니다.",
+    (True, True):   "막힌 흐름이 이어지고 있어 방식을 바꾸는 결단이 필요합니다.",
+}
+_COMMON_ADVICE = (
+    "결정은 하루 정도 묵힌 뒤 다시 확인하세요.",
+    "오늘 할 수 있는 가장 작은 행동 하나를 정해 실행하세요.",
+    "믿을 만한 사람의 의견을 한 번 들어 보세요.",
+)
+
+def _label(card: str, reversed_: bool) -> str:
+    return f"{card}{' (역방향)' if reversed_ else ''}"
+
+def interpret(picks: Sequence[Tuple[str, bool]], positions: Sequence[str], question: Optional[str] = None) -> str:
+    """picks: draw_cards() 결과, positions: ["Advice"] 또는 ["Past","Present","Future"]"""
+    topic = question or "일반 운세"
+    ms = [MEANINGS[p] for p in picks]
+    lines: list[str] = []
+
+    if len(picks) == 1:
+        (card, rev), m = picks[0], ms[0]
+        lines.append(f"**1) 카드 의미 — {_label(card, rev)}**")
+        lines.append(f"{_POSITION[positions[0]].format(kw=m.keywords)} {m.text} "
+                     f"'{topic}'에 대해서는 이 카드의 메시지를 행동의 기준으로 삼아 보세요.")
+        advice = [m.advice, *_COMMON_ADVICE[:2]]
+        summary = f"{m.keywords.split('·')[0].strip()}에 집중할 때입니다."
+        lines.append("\n**2) 핵심 조언**")
+    else:
+        lines.append("**1) 각 카드 의미**")
+        for (card, rev), m, pos in zip(picks, ms, positions):
+            lines.append(f"- {_POSITION_KO.get(pos, pos)} · {_label(card, rev)}: "
+                         f"{_POSITION.get(pos, '{kw}').format(kw=m.keywords)} {m.text}")
+        flow = _FLOW[(picks[0][1], picks[-1][1])]
+        lines.append("\n**2) 종합 해석**")
+        lines.append(f"'{topic}'은(는) 과거 '{ms[0].keywords}' → 현재 '{ms[1].keywords}' → "
+                     f"미래 '{ms[2].keywords}'의 흐름입니다. {flow}")
+        advice = [ms[1].advice, ms[2].advice, _COMMON_ADVICE[0]]
+        summary = f"지금은 '{ms[1].keywords.split('·')[0].strip()}', 다음은 '{ms[2].keywords.split('·')[0].strip()}' — 흐름에 맞춰 준비하세요."
+        lines.append("\n**3) 실행 가능한 조언**")
+
+    lines.extend(f"- {a}" for a in dict.fromkeys(advice))
+    lines.append(f"\n**{'3' if len(picks) == 1 else '4'}) 한 줄 요약**")
+    lines.append(summary)
+    return "\n".join(lines)
@@ -4,7 +4,14 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
-import aiosqlite
+
+from core.db import open_pool, close_pool, write
+from core.duel_stats import backfill_from_ledger
+from core import names, ratelimit
+from core.escrow import recover_stale_holds
+from core.ledger import start_ledger_writer, stop_ledger_writer
+from core.migrate import apply_migrations
+from core.price_engine import start_price_engine, stop_price_engine
 
 DB_PATH = "economy.db"
 
@@ -29,6 +36,7 @@ class MZTranslator(app_commands.Translator):
                     "mz_attend":       "면진출첵",
                     "mz_rank":         "면진순위",
                     "mz_bet":          "면진도박",
+                    "mz_bet_batch":    "면진연속도박",
                     "mz_balance_show": "면진잔액",
                     "mz_transfer":     "면진송금",
                     "mz_admin":        "면진관리자",
@@ -37,9 +45,13 @@ class MZTranslator(app_commands.Translator):
                     "mz_genie":        "면진지니",
                     "mz_stock":        "면진주식",
                     "mz_coin":         "면진코인",
+                    "mz_buy":          "면진매수",
+                    "mz_sell":         "면진매도",
+                    "mz_portfolio":    "면진포트폴리오",
                     "mz_bankruptcy":   "면진파산",
                     "mz_enhance":      "면진강화",
                     "mz_duel":         "면진맞짱",
+                    "mz_tournament":   "면진토너먼트",
                     "mz_help":         "면진도움말",
                     "mz_ping":         "면진핑",
                     "mz_profile":      "면진프로필",
@@ -53,6 +65,7 @@ class MZTranslator(app_commands.Translator):
                     "mz_attend":       "자정(00:00 KST)마다 초기화되는 출석 보상",
                     "mz_rank":         "서버 순위(닉네임·강화 표시)",
                     "mz_bet":          "승률 30~60% 랜덤, 결과는 ±베팅액 (최소 1,000₩)",
+                    "mz_bet_batch":    "같은 금액으로 여러 판을 한 번에(손절/익절 설정)",
                     "mz_balance_show": "현재 잔액 확인(대상 선택 가능)",
                     "mz_transfer":     "서버 멤버에게 코인을 송금합니다",
                     "mz_admin":        "관리자 메뉴 열기(관리자 전용)",
@@ -61,9 +74,13 @@ class MZTranslator(app_commands.Translator):
                     "mz_genie":        "면진지니: Gemini로 짧은 답변 생성",
                     "mz_stock":        "가상 주식 투자(3초 후 결과 공개, 0=전액)",
                     "mz_coin":         "가상 코인 러시(3초 후 결과 공개, 0=전액)",
+                    "mz_buy":          "주식/코인을 현재가로 매수해 보유",
+                    "mz_sell":         "보유 종목을 현재가로 매도(0=전량)",
+                    "mz_portfolio":    "보유 종목 평가액/손익(대상 선택 가능)",
                     "mz_bankruptcy":   "잔액이 음수일 때 10분마다 부채 복구 시도",
                     "mz_enhance":      "무기 강화(+30). +10까지는 쉽게, 이후 난이도 상승",
                     "mz_duel":         "맞짱: 무기 등급+랜덤으로 승부, 동일 금액 베팅(0=전액)",
+                    "mz_tournament":   "맞짱 토너먼트: 참가자 모집 후 대진표로 한 번에 진행",
                     "mz_help":         "면진이 명령어 도움말",
                     "mz_ping":         "봇의 핑(ms) 확인",
                     "mz_profile":      "보유 금액, 등수, 무기, 맞짱 전적 등 프로필",
@@ -87,24 +104,49 @@ DEV_GUILD_ID = os.getenv("DEV_GUILD_ID", "").strip()
 
 INTENTS = discord.Intents.default()
 INTENTS.message_content = False
-bot = commands.Bot(command_prefix=commands.when_mentioned_or("!"), intents=INTENTS)
+# 슬래시 명령 전역 한도 검사(core/ratelimit.py)
+bot = commands.Bot(command_prefix=commands.when_mentioned_or("!"), intents=INTENTS, tree_cls=ratelimit.LimitedTree)
 
 # ───────── DB 초기화 ─────────
 async def init_db():
     if not os.path.exists("models.sql"):
         return
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         with open("models.sql", "r", encoding="utf-8") as f:
             await db.executescript(f.read())
         await db.commit()
+        await apply_migrations(db)
 
 @bot.event
 async def on_ready():
     print(f"✅ {bot.user} 로그인")
 
+@bot.listen("on_interaction")
+async def _observe_names(interaction: discord.Interaction):
+    # 호출자 표시 이름 캐시 갱신(멤버 인텐트 없이 이름 해석용)
+    names.observe(interaction)
+
 async def setup_hook():
+    # 공용 커넥션 풀(writer 1 + reader N) → 스키마 적용
+    await open_pool(DB_PATH)
     await init_db()
 
+    # 이전 프로세스가 정산하지 못한 보류금(hold) 환불
+    refunded = await recover_stale_holds()
+    if refunded:
+        print(f"[escrow] refunded {refunded} stale holds")
+
+    # duel_stats 최초 도입 시 기존 원장으로 1회 집계
+    backfilled = await backfill_from_ledger()
+    if backfilled:
+        print(f"[duel_stats] backfilled from {backfilled} ledger rows")
+
+    # 비금전 원장 기록용 그룹 커밋 writer
+    start_ledger_writer()
+
+    # 마켓 가격 엔진(백그라운드 틱)
+    start_price_engine()
+
     # 코그 로드
     await bot.load_extension("cogs.economy")
     try:
@@ -119,6 +161,7 @@ async def setup_hook():
     else:
         print("[load] cogs.genie not found — skipping")
     await bot.load_extension("cogs.markets")
+    await bot.load_extension("cogs.portfolio")
     await bot.load_extension("cogs.enhance")
     await bot.load_extension("cogs.duel")
     await bot.load_extension("cogs.help")
@@ -146,4 +189,13 @@ async def setup_hook():
 
 bot.setup_hook = setup_hook
 
+_bot_close = bot.close
+async def close():
+    await _bot_close()
+    await stop_price_engine()
+    await stop_ledger_writer()
+    await close_pool()
+
+bot.close = close
+
 bot.run(TOKEN)
@@ -4,7 +4,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
-import aiosqlite
+
+from core.db import open_pool, close_pool, write
+from core import names, ratelimit
+from core.escrow import recover_stale_holds
+from core.ledger import start_ledger_writer, stop_ledger_writer
+from core.migrate import apply_migrations
 
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = str(BASE_DIR / "economy.db")
@@ -14,10 +19,11 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 DEV_GUILD_ID = os.getenv("DEV_GUILD_ID")
 
 async def init_db():
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with write() as db:
         with open(BASE_DIR / "models.sql", "r", encoding="utf-8") as f:
             await db.executescript(f.read())
         await db.commit()
+        await apply_migrations(db)
 
 class MZTranslator(app_commands.Translator):
     async def translate(self, string: app_commands.locale_str, locale: discord.Locale,
@@ -35,6 +41,7 @@ class MZTranslator(app_commands.Translator):
                     "mz_attend":       "면진출첵",
                     "mz_rank":         "면진순위",
                     "mz_bet":          "면진도박",
+                    "mz_bet_batch":    "면진연속도박",
                     "mz_balance_show": "면진잔액",
                     "mz_admin":        "면진관리자",
                     "mz_ask":          "면진질문",   # ← 신규
@@ -49,6 +56,7 @@ class MZTranslator(app_commands.Translator):
                     "mz_attend":       "자정(00:00 KST)마다 초기화되는 출석 보상",
                     "mz_rank":         "서버 잔액 순위 TOP 10(닉네임만 표시)",
                     "mz_bet":          "승률 30~60% 랜덤, 결과는 ±베팅액 (최소 1,000₩)",
+                    "mz_bet_batch":    "같은 금액으로 여러 판을 한 번에(손절/익절 설정)",
                     "mz_balance_show": "현재 잔액 확인(대상 선택 가능)",
                     "mz_admin":        "관리자 메뉴 열기(관리자 전용)",
                     "mz_ask":          "질문을 보내면 랜덤으로 대답합니다",  # ← 신규
@@ -72,15 +80,22 @@ class MZTranslator(app_commands.Translator):
 
 INTENTS = discord.Intents.default()
 INTENTS.members = True
-bot = commands.Bot(command_prefix=None, intents=INTENTS)
+bot = commands.Bot(command_prefix=None, intents=INTENTS, tree_cls=ratelimit.LimitedTree)
 
 @bot.event
 async def on_ready():
     await bot.change_presence(activity=discord.Game(name="/면진도박 · /면진돈줘"))
     print(f"✅ {bot.user} 로그인")
 
+@bot.listen("on_interaction")
+async def _observe_names(interaction: discord.Interaction):
+    names.observe(interaction)
+
 async def setup_hook():
+    await open_pool(DB_PATH)
     await init_db()
+    await recover_stale_holds()
+    start_ledger_writer()
     await bot.tree.set_translator(MZTranslator())
 
     # 코그 로드
@@ -96,5 +111,13 @@ async def setup_hook():
 
 bot.setup_hook = setup_hook
 
+_bot_close = bot.close
+async def close():
+    await _bot_close()
+    await stop_ledger_writer()
+    await close_pool()
+
+bot.close = close
+
 if __name__ == "__main__":
     bot.run(TOKEN)
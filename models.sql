@@ -10,6 +10,8 @@ CREATE TABLE IF NOT EXISTS users (
   last_daily_at  INTEGER,
   PRIMARY KEY (guild_id, user_id)
 );
+-- 순위 조회용 커버링 인덱스(잔액 내림차순 → user_id)
+CREATE INDEX IF NOT EXISTS idx_users_rank ON users(guild_id, balance DESC, user_id);
 
 -- 원장(이력)
 CREATE TABLE IF NOT EXISTS ledger (
@@ -33,9 +35,25 @@ CREATE TABLE IF NOT EXISTS guild_settings (
   mode_name            TEXT    NOT NULL DEFAULT '일반 모드',
   enh_cost_mult        REAL    NOT NULL DEFAULT 1.0,  -- 강화 비용 배율
   force_mode           TEXT    NOT NULL DEFAULT 'off',-- off/success/fail
-  force_target_user_id INTEGER NOT NULL DEFAULT 0     -- 0=전체, 그 외=user_id
+  force_target_user_id INTEGER NOT NULL DEFAULT 0,    -- 0=전체, 그 외=user_id
+  anim_mode            TEXT    NOT NULL DEFAULT 'full', -- full/single/instant (결과 연출)
+  tarot_mode           TEXT    NOT NULL DEFAULT 'ai',   -- ai/fast (타로 해석 엔진)
+  rate_limits          TEXT    NOT NULL DEFAULT ''      -- 명령 한도 덮어쓰기(core/ratelimit.py 형식)
 );
 
+-- 길드 설정 변경 카운터(프로세스 내 설정 캐시 무효화용, 트리거로 자동 증가)
+CREATE TABLE IF NOT EXISTS settings_version (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  v  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO settings_version(id, v) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS trg_guild_settings_ins AFTER INSERT ON guild_settings
+BEGIN UPDATE settings_version SET v = v + 1 WHERE id = 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_guild_settings_upd AFTER UPDATE ON guild_settings
+BEGIN UPDATE settings_version SET v = v + 1 WHERE id = 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_guild_settings_del AFTER DELETE ON guild_settings
+BEGIN UPDATE settings_version SET v = v + 1 WHERE id = 1; END;
+
 -- 마켓 아이템(주식/코인)
 CREATE TABLE IF NOT EXISTS market_items (
   guild_id  INTEGER NOT NULL,
@@ -55,3 +73,71 @@ CREATE TABLE IF NOT EXISTS user_weapons (
   updated_at INTEGER NOT NULL,
   PRIMARY KEY (guild_id, user_id)
 );
+
+-- 에스크로(진행 중 베팅 보류금) — 정산 전까지 잔액에서 빠져 있는 금액
+CREATE TABLE IF NOT EXISTS holds (
+  hold_id    INTEGER PRIMARY KEY AUTOINCREMENT,
+  guild_id   INTEGER NOT NULL,
+  user_id    INTEGER NOT NULL,
+  kind       TEXT    NOT NULL,
+  amount     INTEGER NOT NULL,
+  created_at INTEGER NOT NULL
+);
+
+-- 맞짱 전적(정산 트랜잭션에서 함께 갱신) — streak: +연승 / -연패
+CREATE TABLE IF NOT EXISTS duel_stats (
+  guild_id     INTEGER NOT NULL,
+  user_id      INTEGER NOT NULL,
+  wins         INTEGER NOT NULL DEFAULT 0,
+  losses       INTEGER NOT NULL DEFAULT 0,
+  papa         INTEGER NOT NULL DEFAULT 0,
+  total_staked INTEGER NOT NULL DEFAULT 0,
+  streak       INTEGER NOT NULL DEFAULT 0,
+  best_streak  INTEGER NOT NULL DEFAULT 0,
+  updated_at   INTEGER NOT NULL,
+  PRIMARY KEY (guild_id, user_id)
+);
+
+-- 표시 이름 캐시(상호작용/멤버 조회 때 갱신) — 멤버 캐시에 없는 사용자의 이름 해석용
+CREATE TABLE IF NOT EXISTS user_names (
+  guild_id   INTEGER NOT NULL,
+  user_id    INTEGER NOT NULL,
+  name       TEXT    NOT NULL,
+  updated_at INTEGER NOT NULL,
+  PRIMARY KEY (guild_id, user_id)
+);
+
+-- LLM 응답 캐시(정규화 질문 해시 → 응답, TTL은 core/answer_cache.py)
+CREATE TABLE IF NOT EXISTS answer_cache (
+  key        TEXT    PRIMARY KEY,
+  namespace  TEXT    NOT NULL,
+  question   TEXT    NOT NULL,
+  answer     TEXT    NOT NULL,
+  created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answer_cache_created ON answer_cache(created_at);
+
+-- 마켓 가격 엔진 지수 기록(종목별 CHUNK 틱을 float64 BLOB 1행으로, core/price_engine.py)
+CREATE TABLE IF NOT EXISTS market_ticks (
+  guild_id   INTEGER NOT NULL,
+  type       TEXT    NOT NULL,
+  name       TEXT    NOT NULL,
+  start_tick INTEGER NOT NULL,    -- int(unix_time / TICK)
+  levels     BLOB    NOT NULL,
+  PRIMARY KEY (guild_id, type, name, start_tick)
+);
+CREATE INDEX IF NOT EXISTS idx_market_ticks_start ON market_ticks(start_tick);
+
+-- 보유 포지션(면진매수/면진매도, core/portfolio.py) — 평가액은 가격 엔진 현재가 기준
+CREATE TABLE IF NOT EXISTS positions (
+  guild_id   INTEGER NOT NULL,
+  user_id    INTEGER NOT NULL,
+  type       TEXT    NOT NULL,    -- 'stock' | 'coin'
+  name       TEXT    NOT NULL,
+  qty        REAL    NOT NULL,    -- 보유 수량(주, 소수 허용)
+  cost       INTEGER NOT NULL,    -- 남은 수량의 매수 원가 합(₩)
+  opened_at  INTEGER NOT NULL,
+  updated_at INTEGER NOT NULL,
+  PRIMARY KEY (guild_id, user_id, type, name)
+);
+CREATE INDEX IF NOT EXISTS idx_positions_guild ON positions(guild_id);
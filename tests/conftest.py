@@ -0,0 +1,31 @@
+# tests/conftest.py
+# 테스트 공용: 저장소 루트를 import 경로에 추가, 임시 DB(models.sql 적용)에서 코루틴 실행
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from core import db as coredb, leaderboard  # noqa: E402
+
+@pytest.fixture
+def run_db(tmp_path):
+    """run_db(fn) — 임시 DB 풀을 열고 async fn() 을 실행한 뒤 닫는다. fn 의 반환값을 돌려줌"""
+    def run(fn):
+        async def main():
+            await coredb.open_pool(str(tmp_path / "test.db"))
+            try:
+                async with coredb.write() as db:
+                    with open(os.path.join(ROOT, "models.sql"), encoding="utf-8") as f:
+                        await db.executescript(f.read())
+                    await db.commit()
+                return await fn()
+            finally:
+                await coredb.close_pool()
+                leaderboard.invalidate()
+        return asyncio.run(main())
+    return run
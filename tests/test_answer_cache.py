@@ -0,0 +1,76 @@
+# tests/test_answer_cache.py — 질문 정규화, 메모리/DB 적중, TTL 만료, singleflight
+import asyncio
+import time
+
+import pytest
+
+from core import answer_cache
+from core.db import write
+
+@pytest.fixture(autouse=True)
+def _clean():
+    answer_cache._mem.clear()
+    answer_cache._stats.update(dict.fromkeys(answer_cache._stats, 0))
+    yield
+    answer_cache._mem.clear()
+
+def _counter(answer: str = "답"):
+    calls = []
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return answer
+    return compute, calls
+
+def test_normalize_folds_case_width_space_and_punctuation():
+    assert answer_cache.normalize("  Hello,   WORLD!! ") == "hello world"
+    assert answer_cache.normalize("ＡＢＣ？") == "abc"                 # NFKC 전각
+    assert answer_cache.normalize("오늘 점심은…「뭐」먹지?") == "오늘 점심은 뭐 먹지"
+    assert answer_cache.normalize(None) == ""
+    assert answer_cache.make_key("genie", "뭐 먹지?") == answer_cache.make_key("genie", "뭐  먹지")
+    assert answer_cache.make_key("genie", "뭐 먹지") != answer_cache.make_key("tarot", "뭐 먹지")
+
+def test_memory_then_db_hit(run_db):
+    async def main():
+        compute, calls = _counter()
+        assert await answer_cache.get_or_compute("genie", "점심 뭐 먹지?", compute) == ("답", "miss")
+        assert await answer_cache.get_or_compute("genie", "점심 뭐먹지", compute) == ("답", "miss")
+        assert await answer_cache.get_or_compute("genie", "점심, 뭐 먹지", compute) == ("답", "memory")
+        answer_cache._mem.clear()
+        assert await answer_cache.get_or_compute("genie", "점심 뭐 먹지", compute) == ("답", "db")
+        assert len(calls) == 2
+    run_db(main)
+
+def test_expired_entries_are_recomputed(run_db):
+    async def main():
+        compute, calls = _counter("새 답")
+        key = answer_cache.make_key("genie", "질문")
+        old = time.time() - answer_cache.TTL - 1
+        answer_cache._mem_put(key, "옛 답", old)
+        async with write() as db:
+            await db.execute(
+                "INSERT INTO answer_cache(key,namespace,question,answer,created_at) VALUES(?,?,?,?,?)",
+                (key, "genie", "질문", "옛 답", int(old))
+            )
+            await db.commit()
+        assert await answer_cache.get_or_compute("genie", "질문", compute) == ("새 답", "miss")
+        assert await answer_cache.get_or_compute("genie", "질문", compute) == ("새 답", "memory")
+        assert len(calls) == 1
+    run_db(main)
+
+def test_empty_answer_not_cached(run_db):
+    async def main():
+        compute, calls = _counter("")
+        await answer_cache.get_or_compute("genie", "질문", compute)
+        await answer_cache.get_or_compute("genie", "질문", compute)
+        assert len(calls) == 2
+    run_db(main)
+
+def test_concurrent_requests_share_one_call(run_db):
+    async def main():
+        compute, calls = _counter()
+        res = await asyncio.gather(*(answer_cache.get_or_compute("genie", "같은 질문", compute) for _ in range(5)))
+        assert [a for a, _ in res] == ["답"] * 5
+        assert sorted(s for _, s in res) == ["miss"] + ["shared"] * 4
+        assert len(calls) == 1
+    run_db(main)
@@ -0,0 +1,68 @@
+# tests/test_balance.py — try_debit / transfer
+from core.balance import get_balance, transfer, try_debit
+from core.db import read, write
+
+async def _seed(**balances: int):
+    async with write() as db:
+        await db.executemany(
+            "INSERT INTO users(guild_id,user_id,balance) VALUES(1,?,?)",
+            [(int(uid[1:]), bal) for uid, bal in balances.items()]
+        )
+        await db.commit()
+
+async def _balance(uid: int) -> int:
+    async with read() as db:
+        return await get_balance(db, 1, uid)
+
+async def _ledger():
+    async with read() as db:
+        cur = await db.execute("SELECT user_id, kind, amount, balance_after FROM ledger ORDER BY rowid")
+        return await cur.fetchall()
+
+def test_try_debit_exact_balance(run_db):
+    async def main():
+        await _seed(u1=5_000)
+        async with write() as db:
+            assert await try_debit(db, 1, 1, 5_000) == 0
+            await db.commit()
+        assert await _balance(1) == 0
+    run_db(main)
+
+def test_try_debit_insufficient_or_missing_user(run_db):
+    async def main():
+        await _seed(u1=5_000)
+        async with write() as db:
+            assert await try_debit(db, 1, 1, 5_001) is None
+            assert await try_debit(db, 1, 2, 1) is None
+            await db.commit()
+        assert await _balance(1) == 5_000
+    run_db(main)
+
+def test_transfer_with_fee(run_db):
+    async def main():
+        await _seed(u1=10_000, u2=1_000)
+        async with write() as db:
+            assert await transfer(db, 1, 1, 2, 4_000, fee=400) == (6_000, 4_600)
+            await db.commit()
+        assert (await _balance(1), await _balance(2)) == (6_000, 4_600)
+        assert await _ledger() == [(1, "transfer_out", -4_000, 6_000), (2, "transfer_in", 3_600, 4_600)]
+    run_db(main)
+
+def test_transfer_creates_recipient(run_db):
+    async def main():
+        await _seed(u1=10_000)
+        async with write() as db:
+            assert await transfer(db, 1, 1, 3, 2_500) == (7_500, 2_500)
+            await db.commit()
+        assert await _balance(3) == 2_500
+    run_db(main)
+
+def test_transfer_insufficient_changes_nothing(run_db):
+    async def main():
+        await _seed(u1=1_000, u2=0)
+        async with write() as db:
+            assert await transfer(db, 1, 1, 2, 1_001) is None
+            await db.commit()
+        assert (await _balance(1), await _balance(2)) == (1_000, 0)
+        assert await _ledger() == []
+    run_db(main)
@@ -0,0 +1,48 @@
+# tests/test_enhance_odds.py — 흡수 마르코프 체인 기대값을 손으로 푼 작은 구간과 비교
+import math
+
+import pytest
+
+from core import enhance_odds
+from core.enhance_odds import ENH_TABLE, analyze, attempt_cost
+
+pytest.importorskip("numpy")
+
+def test_certain_first_step():
+    r = analyze(1.0).reach(0, 1)       # 0 → 1 성공 100%
+    assert r.attempts == pytest.approx(1.0)
+    assert r.attempts_sd == pytest.approx(0.0, abs=1e-9)
+    assert r.cost == pytest.approx(ENH_TABLE[1]["cost"])
+    assert r.quantiles == (1, 1, 1)
+
+def test_success_or_stay_is_geometric():
+    # 0 → 3: 1회 + Geom(0.98) + Geom(0.96)
+    p1, p2 = 0.98, 0.96
+    r = analyze(1.0).reach(0, 3)
+    assert r.attempts == pytest.approx(1 + 1 / p1 + 1 / p2)
+    assert r.attempts_sd == pytest.approx(math.sqrt((1 - p1) / p1 ** 2 + (1 - p2) / p2 ** 2))
+    assert r.cost == pytest.approx(ENH_TABLE[1]["cost"] + ENH_TABLE[2]["cost"] / p1 + ENH_TABLE[3]["cost"] / p2)
+
+def test_drop_chain_by_hand():
+    # 10 → 11: 성공 .65 / 유지 .25 / 하락 .10(→9), 9 에서는 성공 .73 / 유지 .27
+    #   E10 = 1 + .25·E10 + .10·E9,  E9 = 1 + .27·E9 + .73·E10
+    #   → E10 = (1 + .10/.73) / .65
+    e10 = (1 + 0.10 / 0.73) / 0.65
+    e9 = (1 + 0.73 * e10) / 0.73
+    a = analyze(1.0)
+    assert a.reach(10, 11).attempts == pytest.approx(e10)
+    assert a.reach(9, 11).attempts == pytest.approx(e9)
+    # 비용: C10 = c10 + .25·C10 + .10·C9,  C9 = c9 + .27·C9 + .73·C10
+    c9, c10 = ENH_TABLE[10]["cost"], ENH_TABLE[11]["cost"]
+    cost10 = (c10 + 0.10 * c9 / 0.73) / 0.65
+    assert a.reach(10, 11).cost == pytest.approx(cost10)
+
+def test_cost_scales_with_multiplier():
+    base, double = analyze(1.0).reach(5, 12), analyze(2.0).reach(5, 12)
+    assert double.attempts == pytest.approx(base.attempts)
+    assert double.cost == pytest.approx(2 * base.cost)
+    assert attempt_cost(4, 1.5) == round(ENH_TABLE[5]["cost"] * 1.5)
+
+@pytest.mark.parametrize("start,target", [(3, 3), (5, 2), (-1, 4), (0, enhance_odds.MAX_LV + 1)])
+def test_invalid_range(start, target):
+    assert analyze(1.0).reach(start, target) is None
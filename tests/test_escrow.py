@@ -0,0 +1,80 @@
+# tests/test_escrow.py — place_hold / settle_hold / refund_hold
+from core.db import read, write
+from core.escrow import place_hold, recover_stale_holds, refund_hold, settle_hold
+
+async def _seed(balance: int):
+    async with write() as db:
+        await db.execute("INSERT INTO users(guild_id,user_id,balance) VALUES(1,1,?)", (balance,))
+        await db.commit()
+
+async def _state():
+    async with read() as db:
+        cur = await db.execute("SELECT balance FROM users WHERE guild_id=1 AND user_id=1")
+        bal = (await cur.fetchone())[0]
+        cur = await db.execute("SELECT COUNT(*) FROM holds")
+        return bal, (await cur.fetchone())[0]
+
+async def _place(amount: int):
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        held = await place_hold(db, 1, 1, amount, "bet")
+        await db.commit()
+    return held
+
+async def _settle(hold_id: int, payout: int):
+    async with write() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        res = await settle_hold(db, hold_id, payout)
+        await db.commit()
+    return res
+
+def test_place_moves_stake_into_hold(run_db):
+    async def main():
+        await _seed(10_000)
+        hold_id, bal = await _place(3_000)
+        assert bal == 7_000
+        assert await _state() == (7_000, 1)
+    run_db(main)
+
+def test_place_insufficient_returns_none(run_db):
+    async def main():
+        await _seed(1_000)
+        assert await _place(3_000) is None
+        assert await _state() == (1_000, 0)
+    run_db(main)
+
+def test_settle_pays_out_and_removes_hold(run_db):
+    async def main():
+        await _seed(10_000)
+        hold_id, _ = await _place(3_000)
+        assert await _settle(hold_id, 6_000) == (1, 1, 3_000, 13_000)
+        assert await _state() == (13_000, 0)
+    run_db(main)
+
+def test_double_settle_returns_none(run_db):
+    async def main():
+        await _seed(10_000)
+        hold_id, _ = await _place(3_000)
+        await _settle(hold_id, 0)
+        assert await _settle(hold_id, 6_000) is None
+        assert await _state() == (7_000, 0)
+    run_db(main)
+
+def test_refund_restores_stake_once(run_db):
+    async def main():
+        await _seed(10_000)
+        hold_id, _ = await _place(3_000)
+        assert await refund_hold(hold_id, "test") == 10_000
+        assert await refund_hold(hold_id, "test") is None
+        assert await _settle(hold_id, 6_000) is None
+        assert await _state() == (10_000, 0)
+    run_db(main)
+
+def test_recover_stale_holds(run_db):
+    async def main():
+        await _seed(10_000)
+        await _place(1_000)
+        await _place(2_000)
+        assert await recover_stale_holds() == 2
+        assert await _state() == (10_000, 0)
+    run_db(main)
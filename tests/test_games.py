@@ -0,0 +1,33 @@
+# tests/test_games.py — 연속 도박 play_rounds 중단 조건, draw_wins(numpy 없을 때 random 대체)
+import sys
+
+import pytest
+
+from cogs.games import draw_wins, play_rounds
+
+W, L = True, False
+
+def test_runs_all_rounds():
+    assert play_rounds([W, L, W], 1_000, 10_000, 0, 0) == ([1_000, 0, 1_000], "done")
+
+def test_stop_loss_stops_on_reaching_limit():
+    assert play_rounds([L, L, L, W], 1_000, 10_000, 2_000, 0) == ([-1_000, -2_000], "stop_loss")
+
+def test_take_profit_stops_on_reaching_limit():
+    assert play_rounds([W, L, W, W, W], 1_000, 10_000, 0, 2_000) == ([1_000, 0, 1_000, 2_000], "take_profit")
+
+def test_balance_stops_when_next_bet_unaffordable():
+    assert play_rounds([L] * 5, 1_000, 2_500, 0, 0) == ([-1_000, -2_000], "balance")
+    # 마지막 판이면 잔액 부족이 아니라 완료
+    assert play_rounds([L, L], 1_000, 2_000, 0, 0) == ([-1_000, -2_000], "done")
+
+def test_limits_take_precedence_over_balance():
+    assert play_rounds([L, L, L], 1_000, 2_000, 2_000, 0) == ([-1_000, -2_000], "stop_loss")
+
+@pytest.mark.parametrize("numpy_missing", [False, True])
+def test_draw_wins_bounds(monkeypatch, numpy_missing):
+    if numpy_missing:
+        monkeypatch.setitem(sys.modules, "numpy", None)     # import numpy → ImportError
+    assert draw_wins(100, 10_000, 10_000) == [True] * 100
+    assert draw_wins(100, 0, 0) == [False] * 100
+    assert len(draw_wins(7, 3_000, 6_000)) == 7
@@ -0,0 +1,62 @@
+# tests/test_leaderboard.py — 증분 반영 후 순위/등수
+from core import leaderboard
+from core.balance import adjust, credit
+from core.db import write
+
+async def _seed(rows):
+    async with write() as db:
+        await db.executemany("INSERT INTO users(guild_id,user_id,balance) VALUES(1,?,?)", rows)
+        await db.commit()
+
+def test_board_put_remove_rank():
+    board = leaderboard.Board()
+    for uid, bal in ((1, 500), (2, 900), (3, 500), (4, 100)):
+        board.put(uid, bal, 0)
+    assert [u for u, _, _ in board.top(4)] == [2, 1, 3, 4]
+    assert (board.rank(900), board.rank(500), board.rank(100)) == (1, 2, 4)
+    board.put(4, 1_000, 3)
+    assert board.top(1) == [(4, 1_000, 3)]
+    board.remove(2)
+    assert len(board) == 3 and board.rank(500) == 2
+
+def test_rank_follows_committed_updates(run_db):
+    async def main():
+        await _seed([(1, 1_000), (2, 2_000), (3, 3_000)])
+        board = await leaderboard.get_board(1)
+        assert board.rank(board.bal[1]) == 3
+        async with write() as db:
+            await credit(db, 1, 1, 5_000, "test")
+            await adjust(db, 1, 4, 2_500)      # 새 사용자
+            await db.commit()
+        assert [u for u, _, _ in board.top(4)] == [1, 3, 4, 2]
+        assert board.rank(board.bal[1]) == 1
+        assert board.rank(board.bal[2]) == 4
+    run_db(main)
+
+def test_rolled_back_update_not_applied(run_db):
+    async def main():
+        await _seed([(1, 1_000), (2, 2_000)])
+        board = await leaderboard.get_board(1)
+        async with write() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            await credit(db, 1, 1, 5_000, "test")
+            await db.execute("ROLLBACK")
+        assert board.bal[1] == 1_000 and board.rank(1_000) == 2
+    run_db(main)
+
+def test_changes_during_cold_load_are_replayed(run_db, monkeypatch):
+    async def main():
+        await _seed([(1, 1_000), (2, 2_000)])
+        load = leaderboard._load
+
+        async def load_then_write(db, gid):
+            board = await load(db, gid)         # 스냅샷 시점 고정 후
+            async with write() as w:            # 다른 쓰기가 커밋됨
+                await credit(w, 1, 1, 5_000, "test")
+                await w.commit()
+            return board
+
+        monkeypatch.setattr(leaderboard, "_load", load_then_write)
+        board = await leaderboard.get_board(1)
+        assert board.bal[1] == 6_000 and board.rank(6_000) == 1
+    run_db(main)
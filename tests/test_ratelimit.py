@@ -0,0 +1,32 @@
+# tests/test_ratelimit.py — 길드 설정 rate_limits 문자열 해석
+import pytest
+
+from core import ratelimit
+
+def test_parse_empty():
+    assert ratelimit.parse("") == {}
+    assert ratelimit.parse(" , ;") == {}
+
+def test_parse_user_and_guild_scopes():
+    assert ratelimit.parse("gamble=3/10, llm.guild=5/30; Enhance.User=4") == {
+        "gamble": {"user": (3, 10.0)},
+        "llm": {"guild": (5, 30.0)},
+        "enhance": {"user": (4, 1.0)},
+    }
+
+@pytest.mark.parametrize("spec", [
+    "poker=3/10",           # 없는 분류
+    "gamble.room=3/10",     # 없는 범위
+    "gamble",               # 값 없음
+    "gamble=x/10",
+    "gamble=0/10",
+    "gamble=3/0",
+])
+def test_parse_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        ratelimit.parse(spec)
+
+def test_limits_for_merges_defaults_and_ignores_bad_spec():
+    lim = ratelimit.limits_for("gamble=3/10", "gamble")
+    assert lim == {"user": (3, 10.0), "guild": ratelimit.DEFAULTS["gamble"]["guild"]}
+    assert ratelimit.limits_for("gamble=oops", "gamble") == ratelimit.DEFAULTS["gamble"]